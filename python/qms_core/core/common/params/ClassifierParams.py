@@ -41,6 +41,7 @@ class ClassifierParamsSchema(BaseModel):
     debug: bool = Field(False, description="是否启用调试模式")
     default_service_level_if_replaced: float = Field(0.85, description="被替代件的默认服务水平")
     seasonal_decompose_period: int = Field(4, description="季节性分解的周期长度")
+    enable_decomposition_metrics: bool = Field(False, description="是否计算 TrendSlope / SeasonalStrength 并判定趋势型 / 季节型")
     burst_tail_window: int = Field(4, description="爆发型判断的尾部窗口")
     burst_mean_window: int = Field(12, description="爆发型判断的均值窗口")
     recent_weeks_window: int = Field(12, description="活跃度判断的近期窗口长度")
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class DRPParamsSchema(BaseModel):
+    same_country_only: bool = Field(default=True, description="是否只在同一国家（IWM.COUNTRYCODE）的仓库间建立调拨 lane")
+    internal_lead_days: Optional[int] = Field(default=None, ge=0, description="无统计数据时的调拨交期（天），默认取 TransportMode.INTERNAL 的默认交期")
+    max_lane_days: Optional[int] = Field(default=None, ge=0, description="调拨交期上限（天），超过的 lane 不参与调拨")
+    min_transfer_qty: int = Field(default=1, ge=1, description="单笔调拨建议的最小数量")
+    use_dynamic_mrp: bool = Field(default=False, description="是否基于动态 MRP（智能交期）计算各仓净需求")
+
+    model_config = {
+        "extra": "forbid"
+    }
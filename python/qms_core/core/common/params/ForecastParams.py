@@ -11,6 +11,7 @@ class ForecastParamsSchema(BaseModel):
     # SteadyForecaster
     steady_n_samples: int = Field(default=1000, description="bootstrap 采样数")
     steady_quantile: float = Field(default=0.6, description="预测分位数")
+    steady_quantile_method: str = Field(default="exact", description="分位数算法：exact 精确加权分位数 / bootstrap 蒙特卡洛采样")
 
     # SeasonalForecaster
     seasonal_baseline_window_weeks: int = Field(default=12, description="季节性基准窗口")
@@ -26,6 +27,7 @@ class ForecastParamsSchema(BaseModel):
             DemandType.STEADY: {
                 "n_samples": self.steady_n_samples,
                 "quantile": self.steady_quantile,
+                "quantile_method": self.steady_quantile_method,
             },
             DemandType.SEASONAL: {
                 "baseline_window_weeks": self.seasonal_baseline_window_weeks,
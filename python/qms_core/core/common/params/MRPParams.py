@@ -7,6 +7,7 @@ class MRPParamsSchema(BaseModel):
     round_up_to_wlots: bool = Field(default=False, description="是否向上补齐为 WLOTS 整数倍")
     use_wlot: bool = Field(default=False, description="是否启用补货批量对齐（WLOTS）")
     include_zero_qty: bool = Field(default=False, description="是否保留推荐补货量为 0 的物料（默认不保留）")
+    horizon_weeks: int = Field(default=52, ge=1, description="分周 MRP 的计划展望期（周）")
 
     model_config = {
         "extra": "forbid"
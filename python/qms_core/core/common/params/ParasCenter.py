@@ -2,6 +2,8 @@ from qms_core.core.common.params.ClassifierParams import ClassifierParamsSchema
 from qms_core.core.common.params.ForecastParams import ForecastParamsSchema
 from qms_core.core.common.params.SafetyStockParams import SafetyStockParamsSchema,ServiceLevelParamsSchema
 from qms_core.core.common.params.MRPParams import MRPParamsSchema
+from qms_core.core.common.params.DRPParams import DRPParamsSchema
+from qms_core.core.common.params.SimulationParams import SimulationParamsSchema
 import yaml
 from typing import Optional
 
@@ -14,6 +16,8 @@ class ParasCenter:
         self.safety_params = SafetyStockParamsSchema(**config.get("SafetyStockParams", {}))
         self.service_level_params = ServiceLevelParamsSchema(**config.get("ServiceLevelParams", {}))
         self.mrp_params = MRPParamsSchema(**config.get("MRPParams", {}))
+        self.drp_params = DRPParamsSchema(**config.get("DRPParams", {}))
+        self.simulation_params = SimulationParamsSchema(**config.get("SimulationParams", {}))
         # self.supplier_params = SupplierParamsSchema(**config.get("SupplierParams", {}))
 
     @classmethod
@@ -29,5 +33,7 @@ class ParasCenter:
             "SafetyStockParams": self.safety_params.model_dump(),
             "ServiceLevelParams": self.service_level_params.model_dump(),
             "MRPParams": self.mrp_params.model_dump(),
+            "DRPParams": self.drp_params.model_dump(),
+            "SimulationParams": self.simulation_params.model_dump(),
             # "SupplierParams": self.supplier_params.model_dump(),
         }
\ No newline at end of file
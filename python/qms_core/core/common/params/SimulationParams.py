@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class SimulationParamsSchema(BaseModel):
+    n_paths: int = Field(default=500, ge=1, description="每个物料的 Monte Carlo 路径数")
+    horizon_weeks: int = Field(default=52, ge=1, description="模拟期（周）")
+    history_weeks: Optional[int] = Field(default=104, ge=1, description="抽样需求所用的最近历史周数，None 表示全部历史")
+    seed: int = Field(default=42, description="随机种子（相同种子与 chunk_cells 下结果可复现）")
+    chunk_cells: int = Field(default=5_000_000, ge=1, description="单块 items × paths × weeks 的最大格数，用于限制内存")
+    use_dynamic_leadtime: bool = Field(default=True, description="是否按 SmartLeadtime 分布抽样交期（否则使用主数据交期）")
+
+    model_config = {
+        "extra": "forbid"
+    }
@@ -2,6 +2,8 @@ from .enums import TransportMode, VendorType
 from .ForecastParams import ForecastParamsSchema
 from .SafetyStockParams import SafetyStockParamsSchema
 from .MRPParams import MRPParamsSchema
+from .DRPParams import DRPParamsSchema
+from .SimulationParams import SimulationParamsSchema
 from .loader_params import LoaderParams
 
 __all__ = [
@@ -10,5 +12,7 @@ __all__ = [
     "ForecastParamsSchema",
     "SafetyStockParamsSchema",
     "MRPParamsSchema",
+    "DRPParamsSchema",
+    "SimulationParamsSchema",
     "LoaderParams"
 ]
@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+
+
+class WeekCalendar:
+    """
+    ISO 周维表：预计算 [start_year, end_year] 内每个 ISO 周的
+    WeekStart（周一）/ WeekEnd（周日）/ YearWeek（202524）/ YearWeekStr（'2025-24W'）/ Ordinal（连续周序号）。
+    日期 ↔ 年周、年周加减、年周区间均转为对维表的数组查找；超出范围时维表自动扩展，无法识别的值返回 NaN / None
+    """
+
+    EPOCH = np.datetime64("1970-01-05", "D")  # Ordinal 0（ISO 1970-02W 周一）
+
+    def __init__(self, start_year: int = 1990, end_year: int = 2100):
+        self._build(start_year, end_year)
+
+    def _build(self, start_year: int, end_year: int):
+        self.start_year = start_year
+        self.end_year = end_year
+
+        first = pd.Timestamp.fromisocalendar(start_year, 1, 1)
+        last = pd.Timestamp.fromisocalendar(end_year + 1, 1, 1)
+        mondays = pd.date_range(first, last, freq="W-MON", inclusive="left")
+        iso = mondays.isocalendar()
+
+        self.week_start = mondays.values.astype("datetime64[D]")
+        self.yearweek = (iso["year"].to_numpy(dtype=np.int64) * 100 + iso["week"].to_numpy(dtype=np.int64))
+        self.yearweek_str = np.array(
+            [f"{y}-{w:02d}W" for y, w in zip(iso["year"], iso["week"])] + [None], dtype=object
+        )
+        self._first_ordinal = int((self.week_start[0] - self.EPOCH).astype(np.int64) // 7)
+
+    def extend(self, start_year: int, end_year: int):
+        """
+        按需扩展周维表覆盖的年份（Ordinal 以 EPOCH 为基准，扩展前后保持不变）
+        """
+        if start_year < self.start_year or end_year > self.end_year:
+            self._build(min(start_year, self.start_year), max(end_year, self.end_year))
+
+    def __len__(self) -> int:
+        return len(self.yearweek)
+
+    @property
+    def table(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "YearWeek": self.yearweek,
+            "YearWeekStr": self.yearweek_str[:-1],
+            "WeekStart": self.week_start.astype("datetime64[ns]"),
+            "WeekEnd": (self.week_start + 6).astype("datetime64[ns]"),
+            "Ordinal": np.arange(len(self), dtype=np.int64) + self._first_ordinal,
+        })
+
+    # ---------- 序号 ----------
+    def dates_to_ordinal(self, dates) -> np.ndarray:
+        """
+        日期 → Ordinal（自 1970-01-05 起的周数），缺失为 NaN
+        """
+        days, valid = _to_days(dates)
+        ordinal = np.full(len(days), np.nan)
+        ordinal[valid] = (days[valid] - self.EPOCH.astype(np.int64)) // 7
+        if valid.any():
+            years = np.array([days[valid].min(), days[valid].max()]).astype("datetime64[D]").astype("datetime64[Y]")
+            years = years.astype(np.int64) + 1970
+            self.extend(int(years[0]) - 1, int(years[1]) + 1)
+        return ordinal
+
+    def yearweek_to_ordinal(self, yearweek) -> np.ndarray:
+        """
+        YearWeek（整数或 'YYYY-XXW' 字符串）→ Ordinal；不存在的周（如 202553）为 NaN
+        """
+        yearweek = parse_yearweek(yearweek)
+        ordinal = np.full(len(yearweek), np.nan)
+        valid = ~np.isnan(yearweek)
+        if valid.any():
+            self.extend(int(np.nanmin(yearweek) // 100), int(np.nanmax(yearweek) // 100))
+        idx = np.searchsorted(self.yearweek, yearweek[valid])
+        found = idx < len(self)
+        found[found] = self.yearweek[idx[found]] == yearweek[valid][found]
+        ordinal[np.flatnonzero(valid)[found]] = idx[found] + self._first_ordinal
+        return ordinal
+
+    def ordinal_to_yearweek(self, ordinal) -> np.ndarray:
+        idx = self._index(ordinal)
+        out = np.full(len(idx), np.nan)
+        valid = idx >= 0
+        out[valid] = self.yearweek[idx[valid]]
+        return out
+
+    def _index(self, ordinal) -> np.ndarray:
+        """
+        Ordinal → 维表行号，缺失为 -1（按需扩展维表）
+        """
+        ordinal = np.atleast_1d(np.asarray(ordinal, dtype=np.float64))
+        valid = ~np.isnan(ordinal)
+        if valid.any():
+            lo, hi = np.nanmin(ordinal), np.nanmax(ordinal)
+            if lo < self._first_ordinal or hi >= self._first_ordinal + len(self):
+                years = (self.EPOCH + 7 * np.array([lo, hi], dtype=np.int64)).astype("datetime64[Y]").astype(np.int64) + 1970
+                self.extend(int(years[0]) - 1, int(years[1]) + 1)
+        return np.where(valid, np.nan_to_num(ordinal) - self._first_ordinal, -1).astype(np.int64)
+
+    # ---------- 转换 ----------
+    def dates_to_yearweek(self, dates) -> np.ndarray:
+        """
+        日期 → 整数 YearWeek（float 数组，缺失为 NaN），等价于逐个 to_yearweek_int
+        """
+        return self.ordinal_to_yearweek(self.dates_to_ordinal(dates))
+
+    def dates_to_yearweek_str(self, dates) -> np.ndarray:
+        """
+        日期 → 'YYYY-XXW'（object 数组，缺失为 None），等价于逐个 to_yearweek
+        """
+        return self._str_lookup(self.dates_to_ordinal(dates))
+
+    def yearweek_to_str(self, yearweek) -> np.ndarray:
+        return self._str_lookup(self.yearweek_to_ordinal(yearweek))
+
+    def yearweek_to_date(self, yearweek) -> np.ndarray:
+        """
+        YearWeek → 该周周一（datetime64[D]，缺失为 NaT）
+        """
+        idx = self._index(self.yearweek_to_ordinal(yearweek))
+        out = np.full(len(idx), np.datetime64("NaT"), dtype="datetime64[D]")
+        valid = idx >= 0
+        out[valid] = self.week_start[idx[valid]]
+        return out
+
+    def _str_lookup(self, ordinal: np.ndarray) -> np.ndarray:
+        return self.yearweek_str[self._index(ordinal)]
+
+    # ---------- 运算 ----------
+    def yearweek_add(self, yearweek, weeks) -> np.ndarray:
+        """
+        YearWeek + weeks（可为标量或等长数组，可为负），跨年按 ISO 周计
+        """
+        return self.ordinal_to_yearweek(self.yearweek_to_ordinal(yearweek) + np.asarray(weeks, dtype=np.float64))
+
+    def yearweek_diff(self, end, start) -> np.ndarray:
+        """
+        两个 YearWeek 之间相差的周数（end − start）
+        """
+        return self.yearweek_to_ordinal(end) - self.yearweek_to_ordinal(start)
+
+    def yearweek_range(self, start, periods: int) -> np.ndarray:
+        """
+        自 start（YearWeek 或日期）起连续 periods 周的整数 YearWeek
+        """
+        if isinstance(start, (int, np.integer, str)):
+            ordinal = self.yearweek_to_ordinal(start)[0]
+        else:
+            ordinal = self.dates_to_ordinal(start)[0]
+        if np.isnan(ordinal):
+            raise ValueError(f"无法识别的起始周：{start}")
+        return self.ordinal_to_yearweek(ordinal + np.arange(periods)).astype(np.int64)
+
+
+@lru_cache(maxsize=None)
+def get_week_calendar(start_year: int = 1990, end_year: int = 2100) -> WeekCalendar:
+    """
+    进程内缓存的周维表
+    """
+    return WeekCalendar(start_year, end_year)
+
+
+def _to_days(dates) -> tuple[np.ndarray, np.ndarray]:
+    if np.ndim(dates) == 0:
+        dates = [dates]
+    index = pd.DatetimeIndex(pd.to_datetime(dates))
+    valid = ~index.isna()
+    days = index.values.astype("datetime64[D]").astype(np.int64)
+    return days, np.asarray(valid)
+
+
+def parse_yearweek(values) -> np.ndarray:
+    """
+    YearWeek 统一为 float 数组（202524），兼容整数与 'YYYY-XXW' 字符串，无法解析的为 NaN；
+    字符串只解析去重后的取值
+    """
+    if np.ndim(values) == 0:
+        values = [values]
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    numeric = pd.to_numeric(uniques.where(uniques.map(type).isin([int, float, np.int64, np.float64])), errors="coerce")
+    parts = uniques.astype(str).str.extract(r"^\s*(\d+)-(\d+)W?\s*$")
+    parsed = (pd.to_numeric(parts[0], errors="coerce") * 100 + pd.to_numeric(parts[1], errors="coerce"))
+    parsed = parsed.fillna(numeric)
+    return np.r_[parsed.to_numpy(dtype=np.float64, na_value=np.nan), np.nan][codes]
+
+
+def dates_to_yearweek(dates) -> np.ndarray:
+    return get_week_calendar().dates_to_yearweek(dates)
+
+
+def dates_to_yearweek_str(dates) -> np.ndarray:
+    return get_week_calendar().dates_to_yearweek_str(dates)
+
+
+def yearweek_to_str(yearweek) -> np.ndarray:
+    return get_week_calendar().yearweek_to_str(yearweek)
+
+
+def yearweek_to_ordinal(yearweek) -> np.ndarray:
+    return get_week_calendar().yearweek_to_ordinal(yearweek)
+
+
+def yearweek_add(yearweek, weeks) -> np.ndarray:
+    return get_week_calendar().yearweek_add(yearweek, weeks)
+
+
+def yearweek_range(start, periods: int) -> np.ndarray:
+    return get_week_calendar().yearweek_range(start, periods)
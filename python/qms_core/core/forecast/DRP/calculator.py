@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Optional
+from qms_core.core.common.params.ParasCenter import ParasCenter, MRPParamsSchema
+from qms_core.core.common.params.DRPParams import DRPParamsSchema
+from qms_core.core.common.params.enums import TransportMode
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.MRP.MRP_calculator import MRPCalculator
+from qms_core.core.forecast.MRP.dynamic_MRP_calculator import DynamicMRPCalculator
+from qms_core.core.forecast.DRP.network import WarehouseNetwork
+
+
+class DRPCalculator:
+    """
+    多仓 DRP：在各仓 MRP 净需求之上，先用同一物料其他仓的富余库存经调拨 lane 冲抵缺口，再对剩余缺口生成供应商订单
+    - 缺口 = 净需求（向上取整），富余 = min(−净需求, 可用库存)（向下取整），即调出后仍保有自身前置期需求 + 安全库存
+    - 候选 (物料, 调出仓, 调入仓) 仅包含同时存在富余与缺口的物料，按交期升序、富余降序排序；
+      第 k 轮同时处理每个物料的第 k 个候选，同一轮内各物料涉及的行互不相交，因此整轮可向量化分配
+    - 调拨量计入调入仓 IntransitStock、从调出仓 AvailableStock 扣除后，沿用 MRPCalculator 的净需求 / MOQ / WLOTS 规则
+    """
+    TRANSFER_COLUMNS = [
+        "ITEMNUM", "FromWarehouse", "ToWarehouse", "TransferQty", "TransportMode", "LeadTimeDays",
+        "SourceSurplus", "DestinationShortage", "Algorithm", "CalcDate"
+    ]
+
+    def __init__(
+        self,
+        data_container: MRPDataContainer,
+        network: WarehouseNetwork,
+        params: Optional[DRPParamsSchema] = None,
+        mrp_params: Optional[MRPParamsSchema] = None,
+    ):
+        self.params = params or ParasCenter().drp_params
+        self.data_container = data_container
+        self.network = network
+
+        mrp_cls = DynamicMRPCalculator if self.params.use_dynamic_mrp else MRPCalculator
+        self.mrp_calculator = mrp_cls(data_container=data_container, params=mrp_params)
+        self.algorithm = "DRP-Dynamic" if self.params.use_dynamic_mrp else "DRP"
+
+    def run(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        返回 (调拨建议, 冲抵调拨后的供应商订单)；订单格式与 MRPOrder 一致，Algorithm 为 DRP / DRP-Dynamic
+        """
+        positions = self.mrp_calculator.prepare_batch()
+        if positions.empty:
+            return pd.DataFrame(columns=self.TRANSFER_COLUMNS), pd.DataFrame()
+
+        net = (positions["Forecast_within_LT"] + positions["FinalSafetyStock"]
+               - positions["AvailableStock"] - positions["IntransitStock"]).to_numpy(dtype=np.float64)
+        available = positions["AvailableStock"].to_numpy(dtype=np.float64)
+        shortage = np.ceil(np.clip(net, 0, None) - 1e-9)
+        surplus = np.floor(np.minimum(np.clip(-net, 0, None), np.clip(available, 0, None)) + 1e-9)
+
+        pairs = self._candidate_pairs(positions, shortage, surplus)
+        qty = self._allocate(pairs, shortage, surplus)
+        transfers = self._to_transfers(positions, pairs, qty, shortage, surplus)
+
+        orders = self._adjusted_orders(positions, pairs, qty)
+        return transfers, orders
+
+    def _candidate_pairs(self, positions: pd.DataFrame, shortage: np.ndarray, surplus: np.ndarray) -> pd.DataFrame:
+        """
+        稀疏候选：富余行 ⋈ lane ⋈ 同物料缺口行；返回行号 src / dst 与 lane 交期
+        """
+        rows = pd.DataFrame({
+            "ITEMNUM": positions["ITEMNUM"].to_numpy(),
+            "Warehouse": positions["Warehouse"].astype(str).to_numpy(),
+            "row": np.arange(len(positions)),
+        })
+        src = rows[surplus > 0].rename(columns={"Warehouse": "FromWarehouse", "row": "src"})
+        dst = rows[shortage > 0].rename(columns={"Warehouse": "ToWarehouse", "row": "dst"})
+        src = src[src["ITEMNUM"].isin(dst["ITEMNUM"])]
+        if src.empty or not len(self.network):
+            return pd.DataFrame(columns=["ITEMNUM", "FromWarehouse", "ToWarehouse", "src", "dst", "LeadTimeDays"])
+
+        pairs = src.merge(self.network.lanes, on="FromWarehouse").merge(dst, on=["ITEMNUM", "ToWarehouse"])
+        pairs["_surplus"] = surplus[pairs["src"].to_numpy()]
+        pairs = pairs.sort_values(["ITEMNUM", "LeadTimeDays", "_surplus", "FromWarehouse", "ToWarehouse"],
+                                  ascending=[True, True, False, True, True], kind="stable")
+        return pairs.drop(columns="_surplus").reset_index(drop=True)
+
+    def _allocate(self, pairs: pd.DataFrame, shortage: np.ndarray, surplus: np.ndarray) -> np.ndarray:
+        """
+        按物料内序号分轮分配：每轮每个物料只处理一个候选，整轮一次数组运算
+        """
+        qty = np.zeros(len(pairs))
+        if pairs.empty:
+            return qty
+
+        remaining_short = shortage.copy()
+        remaining_surplus = surplus.copy()
+        src = pairs["src"].to_numpy()
+        dst = pairs["dst"].to_numpy()
+
+        rank = pairs.groupby("ITEMNUM", sort=False).cumcount().to_numpy()
+        order = np.argsort(rank, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(rank))])
+        for k in range(len(bounds) - 1):
+            sel = order[bounds[k]:bounds[k + 1]]
+            move = np.minimum(remaining_surplus[src[sel]], remaining_short[dst[sel]])
+            move = np.where(move >= self.params.min_transfer_qty, move, 0.0)
+            qty[sel] = move
+            remaining_surplus[src[sel]] -= move
+            remaining_short[dst[sel]] -= move
+        return qty
+
+    def _to_transfers(self, positions, pairs, qty, shortage, surplus) -> pd.DataFrame:
+        moved = qty > 0
+        if not moved.any():
+            return pd.DataFrame(columns=self.TRANSFER_COLUMNS)
+        transfers = pairs.loc[moved, ["ITEMNUM", "FromWarehouse", "ToWarehouse", "LeadTimeDays"]].copy()
+        transfers["TransferQty"] = qty[moved]
+        transfers["SourceSurplus"] = surplus[pairs["src"].to_numpy()[moved]]
+        transfers["DestinationShortage"] = shortage[pairs["dst"].to_numpy()[moved]]
+        transfers["TransportMode"] = TransportMode.INTERNAL.value
+        transfers["Algorithm"] = self.algorithm
+        transfers["CalcDate"] = datetime.now()
+        return transfers[self.TRANSFER_COLUMNS].reset_index(drop=True)
+
+    def _adjusted_orders(self, positions: pd.DataFrame, pairs: pd.DataFrame, qty: np.ndarray) -> pd.DataFrame:
+        adjusted = positions.copy()
+        if len(pairs):
+            n = len(adjusted)
+            inbound = np.bincount(pairs["dst"].to_numpy(dtype=np.int64), weights=qty, minlength=n)
+            outbound = np.bincount(pairs["src"].to_numpy(dtype=np.int64), weights=qty, minlength=n)
+            adjusted["IntransitStock"] = adjusted["IntransitStock"].astype(float) + inbound
+            adjusted["AvailableStock"] = adjusted["AvailableStock"].astype(float) - outbound
+
+        orders = self.mrp_calculator._postprocess_dataframe(adjusted)
+        orders["Algorithm"] = self.algorithm
+        return orders
@@ -0,0 +1,35 @@
+from qms_core.infrastructure.db.models import IWM, VendorTransportStats
+from qms_core.infrastructure.db.reader import fetch_orm_data
+from qms_core.core.common.base_extractor import BaseExtractor
+from qms_core.core.common.params.enums import TransportMode
+import pandas as pd
+
+class DRPExtractor(BaseExtractor):
+    def __init__(self, config):
+        self.config = config
+
+    def fetch_warehouses(self) -> pd.DataFrame:
+        return fetch_orm_data(self.config, IWM, columns=["Warehouse", "COUNTRYCODE", "WMFAC", "STATUSCODE"])
+
+    def fetch_internal_lane_stats(self) -> pd.DataFrame:
+        """
+        仓间调拨的运输交期统计（TransportMode = INTERNAL，VendorCode 为调出仓，Warehouse 为调入仓）
+        """
+        return fetch_orm_data(
+            self.config, VendorTransportStats,
+            filters=[VendorTransportStats.TransportMode == TransportMode.INTERNAL.value],
+            columns=["VendorCode", "Warehouse", "SmoothedTransportLeadTime", "Q60TransportLeadTime"]
+        )
+
+    def fetch(self) -> dict[str, pd.DataFrame]:
+        """
+        返回格式:
+        {
+            "warehouses": IWM 仓库列表,
+            "lane_stats": INTERNAL 运输交期统计
+        }
+        """
+        return {
+            "warehouses": self.fetch_warehouses(),
+            "lane_stats": self.fetch_internal_lane_stats(),
+        }
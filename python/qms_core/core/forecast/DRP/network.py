@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+from qms_core.core.common.params.enums import TransportMode
+from qms_core.core.common.params.DRPParams import DRPParamsSchema
+
+
+class WarehouseNetwork:
+    """
+    仓库网络：IWM 中的仓库 + 有向调拨 lane（FromWarehouse → ToWarehouse）
+    - LeadTimeDays：优先取 INTERNAL 运输统计（平滑值 → Q60），否则为 TransportMode.INTERNAL 默认交期
+    """
+    LANE_COLUMNS = ["FromWarehouse", "ToWarehouse", "LeadTimeDays"]
+
+    def __init__(self, lanes: pd.DataFrame):
+        self.lanes = lanes[self.LANE_COLUMNS].reset_index(drop=True)
+
+    @property
+    def warehouses(self) -> list[str]:
+        return sorted(set(self.lanes["FromWarehouse"]) | set(self.lanes["ToWarehouse"]))
+
+    def __len__(self) -> int:
+        return len(self.lanes)
+
+    @classmethod
+    def from_frames(
+        cls,
+        warehouse_df: pd.DataFrame,
+        lane_stats_df: Optional[pd.DataFrame] = None,
+        params: Optional[DRPParamsSchema] = None,
+    ) -> "WarehouseNetwork":
+        params = params or DRPParamsSchema()
+        warehouses = warehouse_df.drop_duplicates("Warehouse")[["Warehouse", "COUNTRYCODE"]].astype(str)
+
+        lanes = warehouses.merge(warehouses, how="cross", suffixes=("_from", "_to"))
+        lanes = lanes[lanes["Warehouse_from"] != lanes["Warehouse_to"]]
+        if params.same_country_only:
+            lanes = lanes[lanes["COUNTRYCODE_from"] == lanes["COUNTRYCODE_to"]]
+        lanes = lanes.rename(columns={"Warehouse_from": "FromWarehouse", "Warehouse_to": "ToWarehouse"})
+
+        default_days = params.internal_lead_days
+        if default_days is None:
+            default_days = TransportMode.INTERNAL.default_leadtime
+
+        lanes["LeadTimeDays"] = np.nan
+        if lane_stats_df is not None and not lane_stats_df.empty:
+            stats = lane_stats_df.rename(columns={"VendorCode": "FromWarehouse", "Warehouse": "ToWarehouse"})
+            stats = stats.astype({"FromWarehouse": str, "ToWarehouse": str})
+            stats["StatDays"] = stats["SmoothedTransportLeadTime"].fillna(stats["Q60TransportLeadTime"])
+            stats = stats.groupby(["FromWarehouse", "ToWarehouse"], as_index=False)["StatDays"].min()
+            lanes = lanes.drop(columns="LeadTimeDays").merge(stats, on=["FromWarehouse", "ToWarehouse"], how="left")
+            lanes = lanes.rename(columns={"StatDays": "LeadTimeDays"})
+
+        lanes["LeadTimeDays"] = np.ceil(lanes["LeadTimeDays"].fillna(default_days)).astype(int)
+        if params.max_lane_days is not None:
+            lanes = lanes[lanes["LeadTimeDays"] <= params.max_lane_days]
+        return cls(lanes)
+
+    @classmethod
+    def from_extractor(cls, extractor, params: Optional[DRPParamsSchema] = None) -> "WarehouseNetwork":
+        data = extractor.fetch()
+        return cls.from_frames(data["warehouses"], data["lane_stats"], params)
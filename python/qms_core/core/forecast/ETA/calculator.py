@@ -4,8 +4,10 @@ from datetime import timedelta
 from qms_core.core.common.base_transformer import BaseTransformer
 from qms_core.core.analysis.common.shipmode_assigner import TransportModePredictor
 from qms_core.core.forecast.common.forecast_utils import to_yearweek
+from qms_core.core.common.week_calendar import dates_to_yearweek_str
 from qms_core.core.common.params.enums import TransportMode
 from qms_core.core.utils.po_utils import generate_virtual_po_sublines
+from qms_core.core.forecast.ETA.transport_lookup import TransportLeadTimeIndex
 from typing import Optional
 
 class ETATransformer(BaseTransformer):
@@ -34,6 +36,7 @@ class ETATransformer(BaseTransformer):
     def __init__(self, lead_metric: str = "Q60",predictor: Optional[TransportModePredictor] = None):
         self.lead_metric = lead_metric
         self.predictor = predictor
+        self._transport_index = None
 
     def prepare_and_route_intransit(self, data: dict[str, pd.DataFrame]) -> tuple[pd.DataFrame, dict, dict]:
         df_intransit = data["intransit"]
@@ -195,7 +198,7 @@ class ETATransformer(BaseTransformer):
 
         df = df_confirmed.copy()
         df["ETA_Date"] = pd.to_datetime(df["InvoiceDate"])
-        df["ETA_Week"] = df["ETA_Date"].apply(to_yearweek)
+        df["ETA_Week"] = dates_to_yearweek_str(df["ETA_Date"])
         df["ETA_Flag"] = "ConfirmedDate"
         df["InTransitQty"] = df["RemainingQty"]
 
@@ -217,7 +220,7 @@ class ETATransformer(BaseTransformer):
         lead_metric: str = "Q60"
     ) -> int:
         vendor = row["VendorCode"]
-        mode = row.get("TransportMode") or TransportMode.DEFAULT
+        mode = row.get("TransportMode") or TransportMode.DEFAULT.value  # 用字符串值比较，str 列与枚举成员在 pandas 3 下不相等
         wh = row["Warehouse"]
         lead_col = lead_metric + "TransportLeadTime"  # e.g. Q60TransportLeadTime
 
@@ -245,6 +248,33 @@ class ETATransformer(BaseTransformer):
         except Exception:
             return 14
         
+    def build_transport_index(self,
+        df_vendor_lt: pd.DataFrame,
+        df_vendor_master: pd.DataFrame,
+        lead_metric: Optional[str] = None
+    ) -> TransportLeadTimeIndex:
+        """
+        同一批交期表只构建一次查找索引
+        """
+        lead_metric = lead_metric or self.lead_metric
+        cached = self._transport_index
+        if cached is not None and cached[0] is df_vendor_lt and cached[1] is df_vendor_master and cached[2].lead_metric == lead_metric:
+            return cached[2]
+        index = TransportLeadTimeIndex(df_vendor_lt, df_vendor_master, lead_metric)
+        self._transport_index = (df_vendor_lt, df_vendor_master, index)
+        return index
+
+    def estimate_transport_days_batch(self,
+        df: pd.DataFrame,
+        df_vendor_lt: pd.DataFrame,
+        df_vendor_master: pd.DataFrame,
+        lead_metric: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        estimate_transport_days 的整批版本：所有 PO 行一次分级查找，返回与 df 行顺序一致的天数数组
+        """
+        return self.build_transport_index(df_vendor_lt, df_vendor_master, lead_metric).lookup(df)
+
     def transform_shipped(
         self,
         df_shipped: pd.DataFrame,
@@ -307,7 +337,7 @@ class ETATransformer(BaseTransformer):
 
         # 📆 Step 5: 计算 ETA 日期与周
         df_filled["ETA_Date"] = df_filled["InvoiceDate"] + df_filled[lead_col].apply(lambda x: timedelta(days=int(x)))
-        df_filled["ETA_Week"] = df_filled["ETA_Date"].apply(to_yearweek)
+        df_filled["ETA_Week"] = dates_to_yearweek_str(df_filled["ETA_Date"])
         df_filled["ETA_Flag"] = "TransportEstimatedDate"
 
         # 📤 Step 6: 输出标准字段
@@ -343,8 +373,9 @@ class ETATransformer(BaseTransformer):
             how="left"
         )
         df_full = df_full if df_full is not None else df_tail
+        transport_days_all = self.estimate_transport_days_batch(df_tail, df_vendor_lt, df_vendor_master)
 
-        for _, row in df_tail.iterrows():
+        for (_, row), transport_days in zip(df_tail.iterrows(), transport_days_all):
             try:
                 ponum = row["PONUM"]
                 poline = row["POLINE"]
@@ -408,14 +439,8 @@ class ETATransformer(BaseTransformer):
                     # ✅ 模拟发货日
                     ship_date = last_date + pd.Timedelta(days=interval_days * (i + 1))
 
-                    # ✅ 加上运输交期
-                    transport_days = self.estimate_transport_days(
-                        row=row,
-                        df_vendor_lt=df_vendor_lt,
-                        df_vendor_master=df_vendor_master,
-                        lead_metric=self.lead_metric  # e.g. "Q60"
-                    )
-                    eta_date = ship_date + pd.Timedelta(days=transport_days)
+                    # ✅ 加上运输交期（已整批查找）
+                    eta_date = ship_date + pd.Timedelta(days=int(transport_days))
 
                     # ✅ 子行编号
                     poline_sub = f"{poline}-{i+1}"
@@ -465,7 +490,7 @@ class ETATransformer(BaseTransformer):
 
         df["LeadTimeUsed"] = df[lead_col]
         df["ETA_Date"] = pd.to_datetime(df["POEntryDate"]) + df["LeadTimeUsed"].apply(lambda x: timedelta(days=int(x)))
-        df["ETA_Week"] = df["ETA_Date"].apply(to_yearweek)
+        df["ETA_Week"] = dates_to_yearweek_str(df["ETA_Date"])
 
         if "Fallback_TotalLeadUsed" in df.columns:
             df["ETA_Flag"] = df["Fallback_TotalLeadUsed"].map({"Y": "StaticWLEAD", "N": "SimulatedSingle"})
@@ -489,8 +514,9 @@ class ETATransformer(BaseTransformer):
                            df_vendor_lt: pd.DataFrame,
                             df_vendor_master: pd.DataFrame,) -> pd.DataFrame:
         results = []
+        transport_days_all = self.estimate_transport_days_batch(df, df_vendor_lt, df_vendor_master)
 
-        for _, row in df.iterrows():
+        for (_, row), transport_days in zip(df.iterrows(), transport_days_all):
             try:
                 po_date = pd.to_datetime(row["POEntryDate"])
                 total_qty = float(row.get("RemainingQty") or 0.0)
@@ -501,13 +527,8 @@ class ETATransformer(BaseTransformer):
                 if batch_count < 1 or total_qty <= 0:
                     continue
 
-                # 🚚 获取运输交期
-                transport_days = self.estimate_transport_days(
-                    row=row,
-                    df_vendor_lt=df_vendor_lt,
-                    df_vendor_master=df_vendor_master,
-                    lead_metric=self.lead_metric  # 默认 Q60
-                )
+                # 🚚 运输交期（已整批查找）
+                transport_days = int(transport_days)
 
                 # ⏱️ 计算首发日（可以灵活配置：po_date + prepare_time）
                 ship_start = po_date + timedelta(days=int(row.get("PrepareLeadTime", 0)))  # 可注入字段控制准备期
@@ -620,4 +641,245 @@ class ETATransformer(BaseTransformer):
         df["Fallback_TotalLeadUsed"] = "N"
         df.loc[missing_idx, "Fallback_TotalLeadUsed"] = "Y"
         # print(df)
-        return df.drop(columns=["WLEAD"], errors="ignore")
\ No newline at end of file
+        return df.drop(columns=["WLEAD"], errors="ignore")
+
+class ColumnarETATransformer(ETATransformer):
+    """
+    ETATransformer 的列式实现，尾批 / 分批 ETA 不再逐行 iterrows，输出与之完全一致：
+    - 尾批：上次发货日期整列查字典；无行为统计的行把 df_full 中同 PO 的候选行一次 merge 进来，
+      按 (行, InvoiceDate) 排序后组内 shift 取前两次发货间隔（自举），不再逐行扫描 df_full
+    - 分批：各行批次数 np.repeat 展开，批次序号由组内位置得到，ETA / 数量整列计算
+    - 运输交期整批查找（TransportLeadTimeIndex）
+    逐行实现中会抛异常而被跳过的行（字段为空值 / 非法）同样被剔除
+    """
+    BEHAVIOR_KEYS = ["ITEMNUM", "Warehouse", "VendorCode", "TransportMode"]
+
+    def build_last_delivery_lookup(self, df_delivery: pd.DataFrame) -> dict[tuple[str, str], pd.Timestamp]:
+        df_valid = df_delivery[df_delivery["InvoiceDate"].notna()].copy()
+        df_valid["BasePOLINE"] = df_valid["POLINE"].astype(str).str.split("-").str[0]
+        grouped = df_valid.groupby(["PONUM", "BasePOLINE"])["InvoiceDate"].max().reset_index()
+        return dict(zip(
+            zip(grouped["PONUM"].tolist(), grouped["BasePOLINE"].tolist()),
+            grouped["InvoiceDate"].tolist()
+        ))
+
+    @staticmethod
+    def _value_or(df: pd.DataFrame, col: str, default: float) -> np.ndarray:
+        """
+        逐元素等价于 row.get(col) or default：列缺失 / None / 0 / 空串取 default；
+        NaN 与无法转换的值保留为 NaN（逐行实现中 int() 会失败）
+        """
+        if col not in df.columns:
+            return np.full(len(df), float(default))
+        raw = df[col].to_numpy(dtype=object)
+        values = pd.to_numeric(pd.Series(raw, dtype=object), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        empty = np.array([v is None or (isinstance(v, str) and v == "") for v in raw], dtype=bool) | (values == 0)
+        return np.where(empty, float(default), values)
+
+    @staticmethod
+    def _column(df: pd.DataFrame, col: str) -> np.ndarray:
+        """
+        row.get(col)：列缺失时为 None
+        """
+        return df[col].to_numpy(dtype=object) if col in df.columns else np.full(len(df), None, dtype=object)
+
+    @staticmethod
+    def _to_datetime(values) -> np.ndarray:
+        return pd.to_datetime(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+    @staticmethod
+    def _days(values: np.ndarray) -> np.ndarray:
+        return np.trunc(np.nan_to_num(values)).astype(np.int64).astype("timedelta64[D]")
+
+    @staticmethod
+    def _report_skipped(label: str, df: pd.DataFrame, skipped: np.ndarray):
+        if skipped.any():
+            sample = ", ".join(f"{p}-{l}" for p, l in zip(df["PONUM"][skipped][:5], df["POLINE"][skipped][:5]))
+            print(f"⚠️ {label} ETA 模拟失败 {int(skipped.sum())} 行（字段为空或非法），如 {sample}")
+
+    def _self_boot_intervals(self, df_full: pd.DataFrame, rows: np.ndarray, ponum: np.ndarray,
+                             base_poline: np.ndarray, poline: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        自举：同 PO、POLINE 以基础行号开头（不含自身）且已发货的行中，最早两次 InvoiceDate 的间隔天数。
+        返回 (行号, 间隔)，只含候选不少于 2 条的行
+        """
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        cand = df_full.loc[df_full["InvoiceDate"].notna() & df_full["PONUM"].notna(), ["PONUM", "POLINE", "InvoiceDate"]]
+        query = pd.DataFrame({"__row": rows, "PONUM": ponum, "__base": base_poline, "__self": poline})
+        query = query[query["PONUM"].notna()]
+        if cand.empty or query.empty:
+            return empty
+
+        pairs = query.merge(cand, on="PONUM", how="inner")
+        keep = np.array([isinstance(p, str) and p.startswith(b) for p, b in zip(pairs["POLINE"], pairs["__base"])], dtype=bool)
+        pairs = pairs[keep & (pairs["POLINE"] != pairs["__self"]).to_numpy()]
+        if pairs.empty:
+            return empty
+
+        pairs = pairs.assign(InvoiceDate=self._to_datetime(pairs["InvoiceDate"].to_numpy(dtype=object)))
+        pairs = pairs.sort_values(["__row", "InvoiceDate"], kind="stable")
+        pairs["__prev"] = pairs.groupby("__row")["InvoiceDate"].shift()
+        second = pairs[pairs.groupby("__row").cumcount().to_numpy() == 1]
+        interval = (second["InvoiceDate"] - second["__prev"]).dt.days.to_numpy(dtype=np.int64)
+        return second["__row"].to_numpy(dtype=np.int64), interval
+
+    def simulate_tail_eta(
+        self,
+        df_tail: pd.DataFrame,
+        last_delivery_dict: dict[tuple[str, str], pd.Timestamp],
+        df_behavior: pd.DataFrame,
+        df_vendor_lt: pd.DataFrame,
+        df_vendor_master: pd.DataFrame,
+        df_full: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        df = df_tail.merge(df_behavior, on=self.BEHAVIOR_KEYS, how="left").reset_index(drop=True)
+        df_full = df_full if df_full is not None else df
+        n = len(df)
+        if n == 0:
+            return pd.DataFrame()
+        transport_days = self.estimate_transport_days_batch(df, df_vendor_lt, df_vendor_master)
+
+        ponum = df["PONUM"].to_numpy(dtype=object)
+        poline = df["POLINE"].to_numpy(dtype=object)
+        valid = np.array([isinstance(p, str) for p in poline], dtype=bool)
+        base_poline = np.array([p.split("-")[0] if ok else None for p, ok in zip(poline, valid)], dtype=object)
+
+        remaining = pd.to_numeric(df["RemainingQty"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        valid &= np.isfinite(remaining)
+        total = np.rint(np.nan_to_num(remaining)).astype(np.int64)
+
+        # 上次发货日期；无记录时 = POEntryDate + 总交期（缺失取 14 天）
+        last_raw = [last_delivery_dict.get(key) for key in zip(ponum, base_poline)]
+        last_date = self._to_datetime(last_raw)
+        no_last = np.array([pd.isna(v) for v in last_raw], dtype=bool)
+        if no_last.any():
+            if "POEntryDate" in df.columns:
+                entry_raw = df["POEntryDate"].to_numpy(dtype=object)
+                entry = self._to_datetime(entry_raw)
+                valid &= ~(no_last & np.array([v is None for v in entry_raw], dtype=bool))
+            else:
+                entry = np.full(n, pd.Timestamp.today().to_datetime64(), dtype="datetime64[ns]")
+            lead_days = self._value_or(df, self.lead_metric + "LeadTime", 14)
+            valid &= ~(no_last & ~np.isfinite(lead_days))
+            last_date = np.where(no_last, entry + self._days(lead_days), last_date)
+
+        # 行为统计参数；无行为记录时自举 / 默认参数
+        has_behavior = ~pd.isna(self._column(df, "PredictedBatchCount")) & (self._column(df, "Fallback_TotalLeadUsed") != "Y")
+        batch_count = self._value_or(df, "PredictedBatchCount", 1)
+        interval = self._value_or(df, "PredictedBatchIntervalDays", 7)
+        min_batch = self._value_or(df, "MaxSingleBatchQty", 0)
+        valid &= ~(has_behavior & ~(np.isfinite(batch_count) & np.isfinite(interval) & np.isfinite(min_batch)))
+
+        batch_count = np.where(has_behavior, np.trunc(np.nan_to_num(batch_count)), 1).astype(np.int64)
+        interval = np.where(has_behavior, np.trunc(np.nan_to_num(interval)), 7).astype(np.int64)
+        min_batch = np.where(has_behavior, np.trunc(np.nan_to_num(min_batch)), 10).astype(np.int64)
+        eta_flag = np.where(has_behavior, "TailBatchSimulated", "TailBatchSimulated_FB_Default").astype(object)
+
+        boot = np.flatnonzero(~has_behavior & valid)
+        boot_rows, boot_interval = self._self_boot_intervals(df_full, boot, ponum[boot], base_poline[boot], poline[boot])
+        interval[boot_rows] = boot_interval
+        eta_flag[boot_rows] = "TailBatchSimulated_FB_SelfBoot"
+
+        self._report_skipped("尾批", df, ~valid)
+
+        # 分批整数分配（前 N-1 批均分，最后一批补差），剔除 ≤ 0 的批次
+        split = ~(total <= min_batch) & (batch_count > 1)
+        n_batches = np.where(split, batch_count, 1) * valid
+        row = np.repeat(np.arange(n), n_batches)
+        k = np.arange(len(row)) - np.repeat(np.cumsum(n_batches) - n_batches, n_batches)
+        base_qty = total // np.maximum(batch_count, 1)
+        last_qty = base_qty + total - base_qty * batch_count
+        qty = np.where(split[row], np.where(k == n_batches[row] - 1, last_qty[row], base_qty[row]), total[row])
+
+        positive = qty > 0
+        row, qty = row[positive], qty[positive]
+        if len(row) == 0:
+            return pd.DataFrame()
+        starts = np.r_[0, np.flatnonzero(row[1:] != row[:-1]) + 1]
+        counts = np.diff(np.r_[starts, len(row)])
+        batch_index = np.arange(len(row)) - np.repeat(starts, counts) + 1
+
+        ship_date = last_date[row] + (interval[row] * batch_index).astype("timedelta64[D]")
+        eta_date = ship_date + transport_days[row].astype("timedelta64[D]")
+        return pd.DataFrame({
+            "ITEMNUM": df["ITEMNUM"].to_numpy(dtype=object)[row],
+            "Warehouse": df["Warehouse"].to_numpy(dtype=object)[row],
+            "PONUM": ponum[row],
+            "POLINE": [f"{p}-{i}" for p, i in zip(poline[row], batch_index)],
+            "VendorCode": df["VendorCode"].to_numpy(dtype=object)[row],
+            "TransportMode": self._column(df, "TransportMode")[row],
+            "ETA_Date": eta_date,
+            "ETA_Week": dates_to_yearweek_str(eta_date),
+            "InTransitQty": qty,
+            "ETA_Flag": eta_flag[row],
+            "BatchIndex": batch_index,
+            "IsFinalBatch": np.where(batch_index == np.repeat(counts, counts), "Y", "N").astype(object),
+        })
+
+    def simulate_batch_eta(self, df: pd.DataFrame,
+                           df_vendor_lt: pd.DataFrame,
+                           df_vendor_master: pd.DataFrame,) -> pd.DataFrame:
+        n = len(df)
+        if n == 0:
+            return pd.DataFrame()
+        df = df.reset_index(drop=True)
+        transport_days = self.estimate_transport_days_batch(df, df_vendor_lt, df_vendor_master)
+
+        po_raw = df["POEntryDate"].to_numpy(dtype=object)
+        po_date = self._to_datetime(po_raw)
+        total = self._value_or(df, "RemainingQty", 0.0)
+        batch_count = self._value_or(df, "PredictedBatchCount", 1)
+        interval = self._value_or(df, "PredictedBatchIntervalDays", 7)
+        tail_rate = self._value_or(df, "PredictedTailQtyRate", 0.0)
+        if "PrepareLeadTime" in df.columns:
+            prepare = pd.to_numeric(df["PrepareLeadTime"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            prepare = np.zeros(n)
+
+        valid = np.isfinite(batch_count) & np.isfinite(interval)
+        batch_count = np.trunc(np.nan_to_num(batch_count)).astype(np.int64)
+        # 批次数 < 1 或数量 ≤ 0 的行直接跳过，其余行中的空值 / 非法值在逐行实现中会抛异常
+        active = valid & ~((batch_count < 1) | (total <= 0))
+        use_tail = (tail_rate > 0) & (batch_count >= 2)
+        bad = ~np.isfinite(total) | (use_tail & ~np.isfinite(tail_rate)) | ~np.isfinite(prepare) \
+            | np.array([v is None for v in po_raw], dtype=bool)
+        self._report_skipped("分批", df, (~valid | (active & bad)))
+        active &= ~bad
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tail_qty = np.rint(total * np.where(use_tail, tail_rate, 0))
+            each_tail = (total - tail_qty) / np.maximum(batch_count - 1, 1)
+            each_even = total / np.maximum(batch_count, 1)
+
+        n_batches = np.where(active, batch_count, 0)
+        row = np.repeat(np.arange(n), n_batches)
+        if len(row) == 0:
+            return pd.DataFrame()
+        i = np.arange(len(row)) - np.repeat(np.cumsum(n_batches) - n_batches, n_batches)
+        is_last = i == batch_count[row] - 1
+        qty = np.where(use_tail[row], np.where(is_last, tail_qty[row], each_tail[row]), each_even[row])
+
+        ship_start = po_date + self._days(prepare)
+        ship_date = ship_start[row] + (np.trunc(np.nan_to_num(interval[row])).astype(np.int64) * i).astype("timedelta64[D]")
+        eta_date = ship_date + transport_days[row].astype("timedelta64[D]")
+        df_batches = pd.DataFrame({
+            "ITEMNUM": df["ITEMNUM"].to_numpy(dtype=object)[row],
+            "Warehouse": df["Warehouse"].to_numpy(dtype=object)[row],
+            "PONUM": df["PONUM"].to_numpy(dtype=object)[row],
+            "POLINE": df["POLINE"].to_numpy(dtype=object)[row],
+            "VendorCode": self._column(df, "VendorCode")[row],
+            "TransportMode": self._column(df, "TransportMode")[row],
+            "InTransitQty": np.rint(qty).astype(np.int64),
+            "ETA_Date": eta_date,
+            "ETA_Week": dates_to_yearweek_str(eta_date),
+            "ETA_Flag": "TailBatchSimulated",
+            "BatchIndex": i + 1,
+            "IsFinalBatch": np.where(is_last, "Y", "N").astype(object),
+        })
+        return generate_virtual_po_sublines(
+            df_batches,
+            po_col="PONUM",
+            line_col="POLINE",
+            sort_cols=["ETA_Date"],
+            new_col="POLINE"
+        )
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from qms_core.core.common.params.enums import TransportMode
+
+
+class TransportLeadTimeIndex:
+    """
+    运输交期分级查找索引（每次运行构建一次），结果与 ETATransformer.estimate_transport_days 逐行计算完全一致：
+    1. VendorTransportStats：(VendorCode, TransportMode, Warehouse) 首条匹配记录的 {lead_metric}TransportLeadTime
+    2. VendorMaster：(VendorCode, TransportMode) 首条匹配记录的 TransportLeadTimeDays
+    3. TransportMode(mode).lt_range[1]，无法取整（未知方式 / 无上限）时为 14 天
+    前两级为去重后的 MultiIndex，查询时整列 get_indexer；首条匹配记录为空值时直接落到下一级
+    """
+    STAT_KEYS = ["VendorCode", "TransportMode", "Warehouse"]
+    MASTER_KEYS = ["VendorCode", "TransportMode"]
+    FALLBACK_DAYS = 14
+
+    def __init__(self, df_vendor_lt: pd.DataFrame, df_vendor_master: pd.DataFrame, lead_metric: str = "Q60"):
+        self.lead_metric = lead_metric
+        self.stats = self._build_tier(df_vendor_lt, self.STAT_KEYS, lead_metric + "TransportLeadTime")
+        self.master = self._build_tier(df_vendor_master, self.MASTER_KEYS, "TransportLeadTimeDays")
+        self._mode_defaults = {}
+
+    @staticmethod
+    def _build_tier(df: pd.DataFrame, keys: list, value_col: str) -> tuple[pd.MultiIndex, np.ndarray]:
+        """
+        key 不含空值的记录按首次出现去重（对应逐行查找时的 match.iloc[0]）
+        """
+        if df is None or df.empty or not set(keys).issubset(df.columns):
+            return pd.MultiIndex.from_arrays([[] for _ in keys], names=keys), np.empty(0)
+
+        df = df[df[keys].notna().all(axis=1)].drop_duplicates(keys, keep="first")
+        if value_col in df.columns:
+            values = pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = np.full(len(df), np.nan)
+        return pd.MultiIndex.from_frame(df[keys]), values
+
+    @staticmethod
+    def _probe(tier: tuple[pd.MultiIndex, np.ndarray], arrays: list) -> np.ndarray:
+        index, values = tier
+        out = np.full(len(arrays[0]), np.nan)
+        if len(index) == 0 or len(out) == 0:
+            return out
+        valid = ~np.logical_or.reduce([pd.isna(a) for a in arrays])
+        pos = index.get_indexer(pd.MultiIndex.from_arrays([a[valid] for a in arrays]))
+        hit = pos >= 0
+        out[np.flatnonzero(valid)[hit]] = values[pos[hit]]
+        return out
+
+    def mode_default(self, mode) -> int:
+        if mode not in self._mode_defaults:
+            try:
+                self._mode_defaults[mode] = int(TransportMode(mode).lt_range[1])
+            except Exception:
+                self._mode_defaults[mode] = self.FALLBACK_DAYS
+        return self._mode_defaults[mode]
+
+    def lookup(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        整批 PO 行的运输天数（int64 数组，与 df 行顺序一致）
+        """
+        n = len(df)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        vendor = df["VendorCode"].to_numpy(dtype=object)
+        warehouse = df["Warehouse"].to_numpy(dtype=object)
+        raw_mode = df["TransportMode"].to_numpy(dtype=object) if "TransportMode" in df.columns else np.full(n, None, dtype=object)
+        # 与 row.get("TransportMode") or TransportMode.DEFAULT.value 一致：空串 / None 视为 DEFAULT，NaN 保留
+        mode = np.array([m if (m is pd.NA or m) else TransportMode.DEFAULT.value for m in raw_mode], dtype=object)
+
+        days = self._probe(self.stats, [vendor, mode, warehouse])
+        missing = np.isnan(days)
+        if missing.any():
+            days[missing] = self._probe(self.master, [vendor[missing], mode[missing]])
+            missing = np.isnan(days)
+
+        out = np.empty(n, dtype=np.int64)
+        out[~missing] = np.trunc(days[~missing])
+        if missing.any():
+            codes, uniques = pd.factorize(mode[missing], use_na_sentinel=True)
+            defaults = np.array([self.mode_default(m) for m in uniques] + [self.FALLBACK_DAYS], dtype=np.int64)
+            out[missing] = defaults[codes]
+        return out
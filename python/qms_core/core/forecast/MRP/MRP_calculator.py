@@ -4,6 +4,7 @@ from datetime import datetime
 from qms_core.core.common.params.enums import OrderReason,TransportMode
 from qms_core.core.common.params.ParasCenter import ParasCenter,MRPParamsSchema
 from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.common.forecast_matrix import ForecastMatrix
 from typing import Optional
 from qms_core.core.item.item import Item
 
@@ -117,57 +118,91 @@ class MRPCalculator:
         }
 
     def run_batch(self):
-        rows = [self._build_row(item) for item in self.items]
-        rows = [r for r in rows if r]
-        if not rows:
+        """
+        向量化批量计算：各 dict 一次收集为列 → 预测矩阵（前向填充至最大前置期）
+        → 累计和 gather 得到 Forecast_within_LT → _postprocess_dataframe
+        """
+        df = self.prepare_batch()
+        if df.empty:
             return pd.DataFrame()
-        df = pd.DataFrame(rows)
-
         return self._postprocess_dataframe(df)
 
-    def _build_row(self, item:Item):
-        key = (item.itemnum, item.warehouse)
-        fc = self.data_container.forecast_dict.get(key, {})
-        inv = self.data_container.inventory_dict.get(key, {})
-        master = self.data_container.master_dict.get(key, {})
-        dt = self.data_container.demand_type_dict.get(key, {})
-        ss = self.data_container.safety_stock_dict.get(key, {})
-
-        fc_series = fc.get("ForecastSeries")
-        if fc_series is None or fc_series.empty or not ss:
-            return None
-
-        lead_days = master.get("lead_time") or 0
-        lead_weeks = self._get_lead_weeks(item)
-        fc_series = fc_series.copy()
-        if len(fc_series) < lead_weeks:
-            last_val = fc_series.iloc[-1] if not fc_series.empty else 0.0
-            pad = pd.Series([last_val] * (lead_weeks - len(fc_series)), index=range(len(fc_series), lead_weeks))
-            fc_series = pd.concat([fc_series, pad])
-        forecast = fc_series.head(lead_weeks).sum()
-        transport_mode = TransportMode.DEFAULT.value
-
-        return {
-            "ITEMNUM": item.itemnum,
-            "Warehouse": item.warehouse,
-            "Forecast_within_LT": forecast,
-            "AvailableStock": inv.get("AvailableStock", 0.0),
-            "IntransitStock": inv.get("IntransitStock", 0.0),
-            "WLEAD": lead_days,
-            "LotSize": master.get("lot_size") or 1,
-            "MOQ": master.get("moq") or 1,
-            "TransportMode": transport_mode,
-            "ManualSafetyStock": master.get("safety_stock", 0.0),
-            "DynamicSafetyStock": ss.get("DynamicSafetyStock", 0.0),
-            "FinalSafetyStock": ss.get("FinalSafetyStock", max(ss.get("DynamicSafetyStock", 0.0), master.get("safety_stock", 0.0))),
-            "RecommendedServiceLevel": ss.get("RecommendedServiceLevel"),
-            "DemandType": dt.get("DemandType"),
-            "ActivityLevel": dt.get("ActivityLevel"),
-            "CXPPLC": master.get("plc"),
-            "ITEMDESC": master.get("idesc"),
-            "IVEND": master.get("vendor_code"),
-            "VNDNAM": master.get("vendor_name"),
-        }
+    def prepare_batch(self) -> pd.DataFrame:
+        """
+        批量输入列 + Forecast_within_LT（净需求 / 批量取整之前），供 run_batch 与 DRP 复用
+        """
+        df, items, fc_series = self._collect_inputs(self.items)
+        if df.empty:
+            return df
+
+        mask, lead_weeks = self._lead_weeks_batch(df, items)
+        df = df[mask].reset_index(drop=True)
+        lead_weeks = lead_weeks[mask]
+        if df.empty:
+            return df
+
+        fc_matrix = ForecastMatrix.from_series(list(zip(df["ITEMNUM"], df["Warehouse"])),
+                                               [fc_series[i] for i in np.flatnonzero(mask)],
+                                               width=int(lead_weeks.max()))
+        df["Forecast_within_LT"] = fc_matrix.window_sum(lead_weeks)
+        return df
+
+    def _collect_inputs(self, items: list[Item]) -> tuple[pd.DataFrame, list[Item], list[pd.Series]]:
+        """
+        从 data_container 各 dict 收集批量输入列；无预测序列或无安全库存结果的 item 不参与计算
+        """
+        columns = {name: [] for name in (
+            "ITEMNUM", "Warehouse", "AvailableStock", "IntransitStock", "WLEAD", "LotSize", "MOQ",
+            "ManualSafetyStock", "DynamicSafetyStock", "FinalSafetyStock", "RecommendedServiceLevel",
+            "DemandType", "ActivityLevel", "CXPPLC", "ITEMDESC", "IVEND", "VNDNAM",
+        )}
+        kept, fc_series = [], []
+        container = self.data_container
+        for item in items:
+            key = (item.itemnum, item.warehouse)
+            fc = container.forecast_dict.get(key, {}).get("ForecastSeries")
+            ss = container.safety_stock_dict.get(key, {})
+            if fc is None or fc.empty or not ss:
+                continue
+            inv = container.inventory_dict.get(key, {})
+            master = container.master_dict.get(key, {})
+            dt = container.demand_type_dict.get(key, {})
+            manual_ss = master.get("safety_stock", 0.0)
+
+            kept.append(item)
+            fc_series.append(fc)
+            columns["ITEMNUM"].append(item.itemnum)
+            columns["Warehouse"].append(item.warehouse)
+            columns["AvailableStock"].append(inv.get("AvailableStock", 0.0))
+            columns["IntransitStock"].append(inv.get("IntransitStock", 0.0))
+            columns["WLEAD"].append(master.get("lead_time") or 0)
+            columns["LotSize"].append(master.get("lot_size") or 1)
+            columns["MOQ"].append(master.get("moq") or 1)
+            columns["ManualSafetyStock"].append(manual_ss)
+            columns["DynamicSafetyStock"].append(ss.get("DynamicSafetyStock", 0.0))
+            columns["FinalSafetyStock"].append(
+                ss["FinalSafetyStock"] if "FinalSafetyStock" in ss
+                else max(ss.get("DynamicSafetyStock", 0.0), manual_ss or 0.0)
+            )
+            columns["RecommendedServiceLevel"].append(ss.get("RecommendedServiceLevel"))
+            columns["DemandType"].append(dt.get("DemandType"))
+            columns["ActivityLevel"].append(dt.get("ActivityLevel"))
+            columns["CXPPLC"].append(master.get("plc"))
+            columns["ITEMDESC"].append(master.get("idesc"))
+            columns["IVEND"].append(master.get("vendor_code"))
+            columns["VNDNAM"].append(master.get("vendor_name"))
+
+        df = pd.DataFrame(columns)
+        df["TransportMode"] = TransportMode.DEFAULT.value
+        return df, kept, fc_series
+
+    def _lead_weeks_batch(self, df: pd.DataFrame, items: list[Item]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        返回 (参与计算的行掩码, 前置期周数)；静态算法按主数据交期四舍五入到周，至少 1 周
+        """
+        lead_days = pd.to_numeric(df["WLEAD"], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        lead_weeks = np.maximum(np.round(lead_days / 7), 1).astype(np.int64)
+        return np.ones(len(df), dtype=bool), lead_weeks
 
     def _postprocess_dataframe(self, df):
         df["NetRequirement"] = df["Forecast_within_LT"] + df["FinalSafetyStock"] - df["AvailableStock"] - df["IntransitStock"]
@@ -1,5 +1,6 @@
 from qms_core.core.forecast.MRP.MRP_calculator import MRPCalculator
 import pandas as pd
+import numpy as np
 from qms_core.core.common.params.enums import TransportMode
 from qms_core.core.common.params.MRPParams import MRPParamsSchema
 from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
@@ -51,25 +52,22 @@ class DynamicMRPCalculator(MRPCalculator):
             return max(int(lead_days) // 7, 1)
         return super()._get_lead_weeks(item)
 
-    def _build_row(self, item:Item):
-        lead_days = self._get_smart_leadtime_days(item)
-        if lead_days is None:
-            return None
-
-        # 直接沿用父类计算逻辑
-        row = super()._build_row(item)
-        if row is None:
-            return None
+    def _lead_weeks_batch(self, df: pd.DataFrame, items: list[Item]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        智能交期（天）→ 周数（向下取整，至少 1 周）；无智能交期的 item 不参与动态计算。
+        WLEAD / TransportMode 同步改为智能交期结果
+        """
+        lead_days = [self._get_smart_leadtime_days(item) for item in items]
+        mask = np.array([days is not None for days in lead_days], dtype=bool)
+        days = np.array([days or 0 for days in lead_days], dtype=np.int64)
 
-        row["WLEAD"] = lead_days
-
-        # TransportMode 仍然可以从 smart_leadtime 里补充
-        key = (item.itemnum, item.warehouse)
-        slt_dict = self.data_container.smart_lead_time_dict.get(key, {})
-        # print(slt_dict)
-        transport_mode = slt_dict.get("TransportMode", TransportMode.DEFAULT)
-        row["TransportMode"] = transport_mode
-        return row
+        slt_dict = self.data_container.smart_lead_time_dict
+        df["WLEAD"] = days
+        df["TransportMode"] = [
+            slt_dict.get((item.itemnum, item.warehouse), {}).get("TransportMode", TransportMode.DEFAULT)
+            for item in items
+        ]
+        return mask, np.maximum(days // 7, 1)
 
     def _postprocess_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         df = super()._postprocess_dataframe(df)
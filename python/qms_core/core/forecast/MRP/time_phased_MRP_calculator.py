@@ -0,0 +1,208 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from typing import Optional
+from qms_core.core.common.params.ParasCenter import ParasCenter, MRPParamsSchema
+from qms_core.core.common.week_calendar import yearweek_range, yearweek_to_str, parse_yearweek
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.common.forecast_matrix import ForecastMatrix
+
+
+class TimePhasedMRPCalculator:
+    """
+    分周（time-phased）MRP：在 item × week 数组上对整个物料组合向量化计算
+    - 毛需求：周预测（ForecastMatrix，第 0 列为本周，前向填充至展望期）
+    - 计划接收：PO_ETA_Recommendation 在途批次按 ETA 周入账（逾期批次计入第 0 周，超出展望期的忽略）
+    - 其他流水：VirtualStockTransaction 中除 ETAInbound / ForecastDemand 之外的变动
+      （这两类与上面两项同源，跳过以免重复计算）
+    - 预计可用量 PAB = 期初可用库存 + 累计(接收 + 流水 − 毛需求 + 计划接收)；
+      PAB 低于安全库存时按 MOQ / WLOTS 批量生成计划接收，并按前置期倒推计划下达周
+    """
+    SKIP_FLOW_TYPES = ("ETAInbound", "ForecastDemand")
+    OUTPUT_COLUMNS = [
+        "ITEMNUM", "Warehouse", "YearWeek", "WeekIndex", "GrossRequirement", "ScheduledReceipt", "OtherFlow",
+        "SafetyStock", "NetRequirement", "PlannedReceipt", "PlannedRelease", "PastDueRelease",
+        "ProjectedAvailable", "LeadWeeks", "Algorithm", "CalcDate"
+    ]
+
+    def __init__(
+        self,
+        data_container: MRPDataContainer,
+        params: Optional[MRPParamsSchema] = None,
+        horizon_weeks: Optional[int] = None,
+        use_smart_leadtime: bool = False,
+        start_date: Optional[pd.Timestamp] = None,
+    ):
+        self.params = params or ParasCenter().mrp_params
+        self.data_container = data_container
+        self.items = data_container.items
+        self.horizon_weeks = horizon_weeks or self.params.horizon_weeks
+        self.use_smart_leadtime = use_smart_leadtime
+
+        today = pd.Timestamp(start_date or pd.Timestamp.today()).normalize()
+        self.yearweeks = yearweek_range(today, self.horizon_weeks)
+
+    @property
+    def algorithm(self) -> str:
+        return "Dynamic" if self.use_smart_leadtime else "Static"
+
+    def run(self, eta_df: Optional[pd.DataFrame] = None, flow_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        eta_df: VirtualTransactionExtractor.fetch_ETA 的结果（含整数 YearWeek、InTransitQty）
+        flow_df: VirtualStockTransaction（YearWeek 为 '2025-24W' 格式）
+        """
+        keys = [(item.itemnum, item.warehouse) for item in self.items]
+        if not keys:
+            return pd.DataFrame(columns=self.OUTPUT_COLUMNS)
+
+        gross = self._gross_requirements(keys)
+        receipts = self._bucket(keys, eta_df, "YearWeek", "InTransitQty")
+        flows = self._bucket(keys, self._other_flows(flow_df), "YearWeek", "QtyChange")
+        on_hand, safety_stock, moq, wlot, lead_weeks = self._item_vectors(keys)
+
+        net, planned = self._net(on_hand, safety_stock, receipts + flows - gross, moq, wlot)
+        release, past_due = self._offset_releases(planned, lead_weeks)
+        pab = on_hand[:, None] + np.cumsum(receipts + flows - gross + planned, axis=1)
+
+        return self._to_frame(keys, gross, receipts, flows, safety_stock, net, planned, release, past_due, pab, lead_weeks)
+
+    # === 输入数组 ===
+
+    def _gross_requirements(self, keys: list) -> np.ndarray:
+        forecast_dict = self.data_container.forecast_dict
+        series = []
+        for key in keys:
+            fc = forecast_dict.get(key, {}).get("ForecastSeries")
+            series.append(fc if fc is not None else ())
+        matrix = ForecastMatrix.from_series(keys, series, width=self.horizon_weeks)
+        return np.nan_to_num(matrix.values[:, :self.horizon_weeks])
+
+    def _bucket(self, keys: list, df: Optional[pd.DataFrame], week_col: str, qty_col: str) -> np.ndarray:
+        """
+        长表 (ITEMNUM, Warehouse, YearWeek, qty) 累加到 item × week 数组；早于本周的记入第 0 周
+        """
+        out = np.zeros((len(keys), self.horizon_weeks))
+        if df is None or df.empty:
+            return out
+
+        rows = pd.MultiIndex.from_tuples(keys).get_indexer(pd.MultiIndex.from_arrays([df["ITEMNUM"], df["Warehouse"]]))
+        yearweek = parse_yearweek(df[week_col])
+        cols = np.minimum(np.searchsorted(self.yearweeks, yearweek), self.horizon_weeks - 1)
+        overdue = yearweek < self.yearweeks[0]
+        keep = (rows >= 0) & (overdue | (self.yearweeks[cols] == yearweek))
+        cols = np.where(overdue, 0, cols)
+
+        qty = pd.to_numeric(df[qty_col], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        np.add.at(out, (rows[keep], cols[keep]), qty[keep])
+        return out
+
+    def _other_flows(self, flow_df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        if flow_df is None or flow_df.empty:
+            return flow_df
+        return flow_df[~flow_df["StockChangeType"].isin(self.SKIP_FLOW_TYPES)]
+
+    def _item_vectors(self, keys: list) -> tuple[np.ndarray, ...]:
+        container = self.data_container
+        columns = {name: [] for name in ("stock", "ss", "moq", "wlot", "lead_days", "smart_days")}
+        for key in keys:
+            master = container.master_dict.get(key, {})
+            columns["stock"].append(container.inventory_dict.get(key, {}).get("AvailableStock"))
+            columns["ss"].append(container.safety_stock_dict.get(key, {}).get("FinalSafetyStock"))
+            columns["moq"].append(master.get("moq"))
+            columns["wlot"].append(master.get("lot_size"))
+            columns["lead_days"].append(master.get("lead_time"))
+            columns["smart_days"].append(container.smart_lead_time_dict.get(key, {}).get("Q60LeadTime"))
+
+        def _array(values, fill=0.0):
+            arr = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+            return np.where(np.isnan(arr), fill, arr)
+
+        on_hand = _array(columns["stock"])
+        safety_stock = _array(columns["ss"])
+        moq = np.maximum(_array(columns["moq"], 1), 1)
+        wlot = np.maximum(_array(columns["wlot"], 1), 1)
+
+        # 前置期（周）：静态按主数据交期四舍五入；动态优先智能交期（向下取整），均至少 1 周
+        lead_weeks = np.maximum(np.round(_array(columns["lead_days"]) / 7), 1).astype(np.int64)
+        if self.use_smart_leadtime:
+            smart_days = _array(columns["smart_days"])
+            lead_weeks = np.where(smart_days > 0, np.maximum(smart_days // 7, 1), lead_weeks).astype(np.int64)
+        return on_hand, safety_stock, moq, wlot, lead_weeks
+
+    # === 净需求与批量 ===
+
+    def _net(self, on_hand, safety_stock, net_flow, moq, wlot) -> tuple[np.ndarray, np.ndarray]:
+        """
+        不含计划订单的 PAB 由一次 cumsum 得到；逐周仅对全体 item 的向量做缺口判断与批量取整
+        """
+        base_pab = on_hand[:, None] + np.cumsum(net_flow, axis=1)
+        net = np.zeros_like(base_pab)
+        planned = np.zeros_like(base_pab)
+        cum_planned = np.zeros(len(on_hand))
+
+        for t in range(base_pab.shape[1]):
+            shortage = safety_stock - (base_pab[:, t] + cum_planned)
+            need = shortage > 1e-9
+            if not need.any():
+                continue
+            net[need, t] = shortage[need]
+            qty = self._lot_size(shortage[need], moq[need], wlot[need])
+            planned[need, t] = qty
+            cum_planned[need] += qty
+        return net, planned
+
+    def _lot_size(self, qty: np.ndarray, moq: np.ndarray, wlot: np.ndarray) -> np.ndarray:
+        """
+        与 MRPCalculator 一致的批量规则：MOQ 下限 → WLOTS 整数倍（向上或四舍五入）
+        """
+        if self.params.use_moq:
+            qty = np.maximum(qty, np.maximum(moq, self.params.min_moq))
+        if self.params.use_wlot:
+            qty = (np.ceil(qty / wlot) if self.params.round_up_to_wlots else np.round(qty / wlot)) * wlot
+        return qty
+
+    @staticmethod
+    def _offset_releases(planned: np.ndarray, lead_weeks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        计划下达 = 计划接收周 − 前置期；早于本周的下达记入第 0 周并单独标记为逾期下达
+        """
+        release = np.zeros_like(planned)
+        past_due = np.zeros_like(planned)
+        rows, cols = np.nonzero(planned)
+        release_cols = cols - lead_weeks[rows]
+        late = release_cols < 0
+        np.add.at(release, (rows, np.maximum(release_cols, 0)), planned[rows, cols])
+        np.add.at(past_due, (rows[late], np.zeros(late.sum(), dtype=np.int64)), planned[rows[late], cols[late]])
+        return release, past_due
+
+    # === 输出 ===
+
+    def _to_frame(self, keys, gross, receipts, flows, safety_stock, net, planned, release, past_due, pab, lead_weeks) -> pd.DataFrame:
+        """
+        只输出有变动（毛需求 / 接收 / 流水 / 计划订单）的 item × 周
+        """
+        active = (gross != 0) | (receipts != 0) | (flows != 0) | (planned != 0) | (release != 0)
+        rows, cols = np.nonzero(active)
+        itemnums = np.array([k[0] for k in keys], dtype=object)
+        warehouses = np.array([k[1] for k in keys], dtype=object)
+        yearweek_str = yearweek_to_str(self.yearweeks)
+
+        df = pd.DataFrame({
+            "ITEMNUM": itemnums[rows],
+            "Warehouse": warehouses[rows],
+            "YearWeek": yearweek_str[cols],
+            "WeekIndex": cols,
+            "GrossRequirement": gross[rows, cols],
+            "ScheduledReceipt": receipts[rows, cols],
+            "OtherFlow": flows[rows, cols],
+            "SafetyStock": safety_stock[rows],
+            "NetRequirement": net[rows, cols],
+            "PlannedReceipt": planned[rows, cols],
+            "PlannedRelease": release[rows, cols],
+            "PastDueRelease": past_due[rows, cols],
+            "ProjectedAvailable": pab[rows, cols],
+            "LeadWeeks": lead_weeks[rows],
+        })
+        df["Algorithm"] = self.algorithm
+        df["CalcDate"] = datetime.now()
+        return df[self.OUTPUT_COLUMNS]
@@ -0,0 +1,84 @@
+import numpy as np
+import warnings
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _ma_filter(period: int) -> np.ndarray:
+    """
+    与 statsmodels.seasonal_decompose 相同的居中移动平均权重：
+    偶数周期首尾各 0.5 权重（2×MA），奇数周期为等权
+    """
+    if period % 2 == 0:
+        return np.array([0.5] + [1.0] * (period - 1) + [0.5]) / period
+    return np.repeat(1.0 / period, period)
+
+
+def additive_decompose_batch(X: np.ndarray, period: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    批量加法分解（等长序列）：X 为 (n_series × n_obs)
+    - trend: 居中移动平均，两端各 len(filt)//2 个 NaN
+    - seasonal: 去趋势后按相位取均值并中心化，再平铺到整个序列
+    结果与 statsmodels.tsa.seasonal.seasonal_decompose(model="additive", period=period) 一致
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[None, :]
+    n_series, n_obs = X.shape
+    if n_obs < 2 * period:
+        raise ValueError(f"x must have 2 complete cycles requires {2 * period} observations. x only has {n_obs} observation(s)")
+
+    filt = _ma_filter(period)
+    half = len(filt) // 2
+    trend = np.full((n_series, n_obs), np.nan)
+    trend[:, half:n_obs - len(filt) + 1 + half] = sliding_window_view(X, len(filt), axis=1) @ filt[::-1]
+
+    detrended = X - trend
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        period_averages = np.stack([np.nanmean(detrended[:, i::period], axis=1) for i in range(period)], axis=1)
+    period_averages -= period_averages.mean(axis=1, keepdims=True)
+    seasonal = np.tile(period_averages, n_obs // period + 1)[:, :n_obs]
+
+    return trend, seasonal
+
+
+def decomposition_metrics_batch(X: np.ndarray, period: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    等长序列的 TrendSlope / SeasonalStrength：
+    - TrendSlope: 有效趋势的一阶差分均值（trend.dropna().diff().mean()）
+    - SeasonalStrength: 季节项绝对值均值（seasonal.abs().mean()）
+    序列不足两个完整周期时返回 NaN
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[None, :]
+    n_series, n_obs = X.shape
+    if n_obs < 2 * period or not np.all(np.isfinite(X)):
+        nan = np.full(n_series, np.nan)
+        return nan, nan.copy()
+
+    trend, seasonal = additive_decompose_batch(X, period)
+    half = len(_ma_filter(period)) // 2
+    valid_trend = trend[:, half:n_obs - half]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        trend_slope = np.diff(valid_trend, axis=1).mean(axis=1) if valid_trend.shape[1] > 1 \
+            else np.full(n_series, np.nan)
+    seasonal_strength = np.abs(seasonal).mean(axis=1)
+    return trend_slope, seasonal_strength
+
+
+def decomposition_metrics_ragged(X: np.ndarray, start_idx: np.ndarray, period: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    右对齐、起点不同的序列矩阵（如 DemandMatrix，每行从 start_idx 开始有效）：
+    按有效长度分组后分别做等长批量分解
+    """
+    n_series, n_obs = X.shape
+    trend_slope = np.full(n_series, np.nan)
+    seasonal_strength = np.full(n_series, np.nan)
+    for start in np.unique(start_idx):
+        rows = np.flatnonzero(start_idx == start)
+        ts, ss = decomposition_metrics_batch(X[rows, start:], period)
+        trend_slope[rows] = ts
+        seasonal_strength[rows] = ss
+    return trend_slope, seasonal_strength
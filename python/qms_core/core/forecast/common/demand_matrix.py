@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+from qms_core.core.forecast.common.demand_store import DemandStore, KeyType
+
+
+class DemandMatrix:
+    """
+    稠密需求矩阵：行为 (ITEMNUM, Warehouse)，列为统一日历上的 ISO 周（周一）
+    - values: float32 (n_keys × n_weeks)，首个需求周之前为 0
+    - start_idx: 每行首个需求周所在列；start_idx 之后即为与 ItemDemand.history 等价的补齐序列
+    - key_index: key → 行号
+    用于分类 / 预测 / 安全库存等批量数组计算
+    """
+
+    def __init__(self, keys: list[KeyType], weeks: pd.DatetimeIndex, values: np.ndarray, start_idx: np.ndarray):
+        self.keys = keys
+        self.key_index = {key: i for i, key in enumerate(keys)}
+        self.weeks = weeks
+        self.values = values
+        self.start_idx = start_idx
+
+    @classmethod
+    def from_store(cls, store: DemandStore, dtype=np.float32) -> "DemandMatrix":
+        """
+        由 DemandStore 构建（DPS 父→子替代已在 ItemDataPreloader.load_demand_history 中完成）
+        """
+        n_keys = len(store)
+        if n_keys == 0:
+            weeks = pd.DatetimeIndex([store.max_date])
+            return cls([], weeks, np.zeros((0, 1), dtype=dtype), np.zeros(0, dtype=np.int64))
+
+        start_week = store.first_weeks.min()
+        weeks = pd.date_range(start=start_week, end=store.max_date, freq="W-MON")
+        start_idx = ((store.first_weeks - start_week) // np.timedelta64(7, "D")).astype(np.int64)
+
+        values = np.zeros((n_keys, len(weeks)), dtype=dtype)
+        lengths = np.diff(store.offsets)
+        rows = np.repeat(np.arange(n_keys), lengths)
+        cols = np.arange(store.offsets[-1]) - np.repeat(store.offsets[:-1] - start_idx, lengths)
+        values[rows, cols] = store.values
+
+        return cls(list(store.keys), weeks, values, start_idx)
+
+    @classmethod
+    def from_df(cls, demand_df: pd.DataFrame, max_date: Optional[pd.Timestamp] = None, dtype=np.float32) -> "DemandMatrix":
+        return cls.from_store(DemandStore.from_df(demand_df, max_date), dtype=dtype)
+
+    @classmethod
+    def from_preloader(cls, preloader, max_date: Optional[pd.Timestamp] = None, dtype=np.float32) -> "DemandMatrix":
+        """
+        直接从 DEMANDHISTORY_WEEKLY 构建（含 DPS 父→子替代）
+        """
+        return cls.from_df(preloader.load_demand_history(max_date), max_date, dtype=dtype)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    @property
+    def memory_bytes(self) -> int:
+        return int(self.values.nbytes + self.start_idx.nbytes)
+
+    def history_mask(self) -> np.ndarray:
+        """
+        布尔矩阵：True 表示该周位于该行的历史区间内（首个需求周之后）
+        """
+        return np.arange(self.values.shape[1])[None, :] >= self.start_idx[:, None]
+
+    def get_row(self, key: KeyType) -> np.ndarray:
+        """
+        返回 key 的补齐后周需求（从首个需求周开始）；无历史返回空数组
+        """
+        i = self.key_index.get(key)
+        if i is None:
+            return self.values[:0, 0]
+        return self.values[i, self.start_idx[i]:]
+
+    def take(self, keys: list[KeyType]) -> "DemandMatrix":
+        """
+        按给定 key 顺序取子矩阵；不存在的 key 为全 0 行且 start_idx 指向最后一周之后
+        """
+        n_weeks = self.values.shape[1]
+        rows = np.array([self.key_index.get(k, -1) for k in keys], dtype=np.int64)
+        found = rows >= 0
+        values = np.zeros((len(keys), n_weeks), dtype=self.values.dtype)
+        values[found] = self.values[rows[found]]
+        start_idx = np.full(len(keys), n_weeks, dtype=np.int64)
+        start_idx[found] = self.start_idx[rows[found]]
+        return DemandMatrix(list(keys), self.weeks, values, start_idx)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        宽表视图（行 MultiIndex[ITEMNUM, Warehouse]，列为周）
+        """
+        index = pd.MultiIndex.from_tuples(self.keys, names=["ITEMNUM", "Warehouse"]) if self.keys \
+            else pd.MultiIndex.from_arrays([[], []], names=["ITEMNUM", "Warehouse"])
+        return pd.DataFrame(self.values, index=index, columns=self.weeks)
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Optional
+
+KeyType = tuple[str, str]
+
+
+class DemandStore:
+    """
+    按 (ITEMNUM, Warehouse) 分区的需求历史存储
+    - 整体只做一次解析 / 聚合 / 排序，并补齐每个 key 从首个需求周到 max_date 的空缺周（补 0）
+    - 所有 key 的周需求拼接在一个连续数组中，通过 offsets 以 O(1) 切片访问
+    - get_history 生成的 DataFrame 按 key 缓存，Pipeline 内各 Job 共享同一份历史
+    """
+
+    def __init__(self, keys: list[KeyType], offsets: np.ndarray, first_weeks: np.ndarray,
+                 values: np.ndarray, max_date: pd.Timestamp):
+        self.keys = keys
+        self.key_index = {key: i for i, key in enumerate(keys)}
+        self.offsets = offsets          # 长度 n_keys + 1，第 i 个 key 对应 values[offsets[i]:offsets[i+1]]
+        self.first_weeks = first_weeks  # 每个 key 首个需求周（datetime64[ns]）
+        self.values = values            # 补齐空缺周后的周需求（float64）
+        self.max_date = max_date
+        self._history_cache: dict[KeyType, pd.DataFrame] = {}
+
+    @classmethod
+    def from_df(cls, demand_df: pd.DataFrame, max_date: Optional[pd.Timestamp] = None) -> "DemandStore":
+        """
+        由预加载的长表（ITEMNUM, Warehouse, YearWeek, TotalDemand）构建，语义与 ItemDemand.load_from_df 一致
+        """
+        if max_date is None:
+            max_date = pd.to_datetime(datetime.now().strftime("%G-W%V") + "-1", format="%G-W%V-%u")
+        max_date = pd.Timestamp(max_date).normalize()
+
+        if demand_df is None or demand_df.empty:
+            return cls([], np.zeros(1, dtype=np.int64), np.array([], dtype="datetime64[ns]"),
+                       np.array([], dtype=np.float64), max_date)
+
+        df = demand_df[["ITEMNUM", "Warehouse", "YearWeek", "TotalDemand"]]
+        weeks = df["YearWeek"]
+        if not pd.api.types.is_datetime64_any_dtype(weeks):
+            # 只解析去重后的周字符串
+            codes, uniques = pd.factorize(weeks)
+            parsed = pd.to_datetime(pd.Series(uniques, dtype=object) + "-1", format="%G-W%V-%u")
+            weeks = parsed.to_numpy(dtype="datetime64[ns]")[codes]
+        else:
+            weeks = weeks.to_numpy(dtype="datetime64[ns]")
+
+        df = pd.DataFrame({
+            "ITEMNUM": df["ITEMNUM"].to_numpy(),
+            "Warehouse": df["Warehouse"].to_numpy(),
+            "YearWeek": weeks,
+            "TotalDemand": df["TotalDemand"].to_numpy(dtype=np.float64),
+        })
+        df = df[df["YearWeek"] <= max_date]
+
+        grouped = (
+            df.groupby(["ITEMNUM", "Warehouse", "YearWeek"], sort=True)["TotalDemand"]
+            .sum()
+            .reset_index()
+        )
+        if grouped.empty:
+            return cls.from_df(None, max_date)
+
+        key_codes, key_uniques = pd.factorize(
+            pd.MultiIndex.from_arrays([grouped["ITEMNUM"], grouped["Warehouse"]]), sort=False
+        )
+        week_arr = grouped["YearWeek"].to_numpy(dtype="datetime64[ns]")
+        max_week = np.datetime64(max_date.to_datetime64(), "ns")
+
+        # 每个 key 的首周与补齐后的长度
+        first_pos = np.flatnonzero(np.r_[True, key_codes[1:] != key_codes[:-1]])
+        first_weeks = week_arr[first_pos]
+        lengths = (max_week - first_weeks) // np.timedelta64(7, "D") + 1
+        offsets = np.zeros(len(first_weeks) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        values = np.zeros(offsets[-1], dtype=np.float64)
+        pos = offsets[key_codes] + (week_arr - first_weeks[key_codes]) // np.timedelta64(7, "D")
+        values[pos] = grouped["TotalDemand"].to_numpy()
+
+        return cls(list(key_uniques), offsets, first_weeks, values, max_date)
+
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self.key_index
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def get_values(self, key: KeyType) -> np.ndarray:
+        """
+        O(1) 获取 key 的补齐后周需求（只读视图）；无历史返回空数组
+        """
+        i = self.key_index.get(key)
+        if i is None:
+            return self.values[:0]
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def get_history(self, key: KeyType) -> pd.DataFrame:
+        """
+        获取 key 的需求历史 DataFrame（YearWeek, TotalDemand），与 ItemDemand.load_from_df 结果一致。
+        结果会被缓存，调用方不应原地修改。
+        """
+        cached = self._history_cache.get(key)
+        if cached is not None:
+            return cached
+
+        i = self.key_index.get(key)
+        if i is None:
+            history = pd.DataFrame(columns=["YearWeek", "TotalDemand"])
+        else:
+            vals = self.values[self.offsets[i]:self.offsets[i + 1]]
+            weeks = self.first_weeks[i] + np.arange(len(vals)) * np.timedelta64(7, "D")
+            history = pd.DataFrame({"YearWeek": weeks, "TotalDemand": vals.copy()})
+
+        self._history_cache[key] = history
+        return history
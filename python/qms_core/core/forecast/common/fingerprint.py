@@ -0,0 +1,119 @@
+import hashlib
+import json
+from collections import Counter
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.common.params.ParasCenter import ParasCenter
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+
+KeyType = tuple[str, str]
+
+FINGERPRINT_FIELDS = ["DemandHash", "MasterHash", "InventoryHash", "LeadtimeHash", "ReplacementHash", "ParamsHash"]
+
+# 影响 分类 → 预测 → 安全库存 链路的指纹；库存只影响 MRP，而 MRP 每次都用最新库存全量计算
+CHAIN_FIELDS = ["DemandHash", "MasterHash", "LeadtimeHash", "ReplacementHash", "ParamsHash"]
+
+
+def _digest(payload) -> str:
+    """
+    稳定哈希：bytes 直接参与计算，其余对象先做有序 JSON 序列化
+    """
+    if not isinstance(payload, bytes):
+        payload = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class ItemFingerprinter:
+    """
+    基于 MRPDataContainer 中已预加载的输入，为每个 item 计算输入指纹：
+    - DemandHash: 补齐后的周需求切片 + 首个需求周（DPS 母件需求已在预加载时并入子件）
+    - MasterHash: IIM / IWI 使用字段
+    - InventoryHash: STKOH_AVAIL 可用 / 在途库存（含可用替代件）
+    - LeadtimeHash: 智能交期
+    - ReplacementHash: DPS 替代关系
+    - ParamsHash: 分类 / 预测 / 安全库存 / 服务水平参数
+    """
+
+    def __init__(self, data_container: MRPDataContainer, replacing_map: Optional[dict] = None,
+                 params: Optional[ParasCenter] = None):
+        self.data_container = data_container
+        self.replacing_map = replacing_map or {}
+        params_dict = (params or ParasCenter()).to_dict()
+        params_dict.pop("MRPParams", None)  # MRP 每次全量重算，不参与链路判定
+        self.params_hash = _digest(params_dict)
+
+    def fingerprint(self, itemnum: str, warehouse: str) -> dict:
+        key = (itemnum, warehouse)
+        container = self.data_container
+        store = container.demand_store
+
+        values = store.get_values(key)
+        i = store.key_index.get(key)
+        first_week = str(store.first_weeks[i]) if i is not None else ""
+
+        return {
+            "ITEMNUM": itemnum,
+            "Warehouse": warehouse,
+            "DemandHash": _digest(first_week.encode("utf-8") + np.ascontiguousarray(values).tobytes()),
+            "MasterHash": _digest(container.master_dict.get(key, {})),
+            "InventoryHash": _digest(container.inventory_dict.get(key, {})),
+            "LeadtimeHash": _digest(container.smart_lead_time_dict.get(key, {})),
+            "ReplacementHash": _digest(self.replacing_map.get(itemnum, [])),
+            "ParamsHash": self.params_hash,
+            "FingerprintDate": date.today(),
+        }
+
+    def fingerprint_all(self) -> pd.DataFrame:
+        rows = [self.fingerprint(item.itemnum, item.warehouse) for item in self.data_container.items]
+        return pd.DataFrame(rows, columns=["ITEMNUM", "Warehouse", *FINGERPRINT_FIELDS, "FingerprintDate"])
+
+    def diff(self, current: pd.DataFrame, previous: pd.DataFrame) -> tuple[set[KeyType], Counter]:
+        """
+        对比本次与上次的指纹，返回 (需要重算链路的 key 集合, 原因计数)。
+        - 无历史指纹 → "new"
+        - CHAIN_FIELDS 任一变化 → 对应字段名
+        - 仅库存变化 → "inventory_only"（不重算链路，只由 MRP 使用最新库存）
+        - DPS 母件本身 dirty → 同仓库的子件也标记为 "parent"
+        """
+        reasons = Counter()
+        dirty: set[KeyType] = set()
+
+        prev = {}
+        if previous is not None and not previous.empty:
+            prev = {
+                (row["ITEMNUM"], row["Warehouse"]): row
+                for row in previous[["ITEMNUM", "Warehouse", *FINGERPRINT_FIELDS]].to_dict("records")
+            }
+
+        for row in current[["ITEMNUM", "Warehouse", *FINGERPRINT_FIELDS]].to_dict("records"):
+            key = (row["ITEMNUM"], row["Warehouse"])
+            old = prev.get(key)
+            if old is None:
+                dirty.add(key)
+                reasons["new"] += 1
+                continue
+            changed = [f for f in CHAIN_FIELDS if row[f] != old[f]]
+            if changed:
+                dirty.add(key)
+                reasons.update(changed)
+            elif row["InventoryHash"] != old["InventoryHash"]:
+                reasons["inventory_only"] += 1
+
+        # 母件 dirty 时，子件一并重算
+        parent_to_children: dict[str, list[str]] = {}
+        for child, rels in self.replacing_map.items():
+            for rel in rels:
+                parent_to_children.setdefault(rel["parent"], []).append(child)
+        current_keys = set(zip(current["ITEMNUM"], current["Warehouse"]))
+        for itemnum, warehouse in list(dirty):
+            for child in parent_to_children.get(itemnum, []):
+                child_key = (child, warehouse)
+                if child_key in current_keys and child_key not in dirty:
+                    dirty.add(child_key)
+                    reasons["parent"] += 1
+
+        return dirty, reasons
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class ForecastCache:
+    """
+    预测结果的内容寻址缓存（本地 SQLite 文件）
+    - key: (需求历史, max_date, demand_type, forecaster 名, 预测参数) 的哈希
+    - value: 预测序列（pickle）+ model_used
+    - 淘汰：按创建时间（max_age_days）与条目数（max_entries，按最近访问保留）
+    - hits / misses / writes 计数供夜间日志查看；进程池模式下各 worker 从 0 计数，由 Job 汇总回父进程（merge_stats）
+    - 命中时只记录 LastAccess，在 flush_access（evict / report / close 时）用一次 executemany 批量写回
+
+    连接在首次使用时打开且不参与 pickle，因此可随 DemandForecaster 传入子进程。
+    """
+
+    def __init__(self, path: Union[str, Path] = "output/forecast_cache.sqlite",
+                 max_age_days: Optional[float] = 30, max_entries: Optional[int] = 500_000):
+        self.path = Path(path)
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._pending_access = []
+        self._conn = None
+
+    # ---------- key ----------
+    @staticmethod
+    def make_key(history: pd.DataFrame, max_date, demand_type, forecaster_name: str, params) -> str:
+        """
+        history: ItemDemand.history（截至 max_date），取 YearWeek 起点 + TotalDemand 数值参与哈希
+        params: pydantic 参数对象（或任意可 repr 的对象）
+        """
+        h = hashlib.blake2b(digest_size=20)
+        values = np.ascontiguousarray(history["TotalDemand"].to_numpy(dtype=np.float64))
+        first_week = str(pd.Timestamp(history["YearWeek"].iloc[0])) if len(history) else ""
+        h.update(first_week.encode("utf-8"))
+        h.update(values.tobytes())
+        h.update(str(pd.Timestamp(max_date)).encode("utf-8"))
+        h.update(str(getattr(demand_type, "value", demand_type)).encode("utf-8"))
+        h.update(forecaster_name.encode("utf-8"))
+        params_repr = params.model_dump_json() if hasattr(params, "model_dump_json") else repr(params)
+        h.update(params_repr.encode("utf-8"))
+        return h.hexdigest()
+
+    # ---------- 读写 ----------
+    def get(self, key: str) -> Optional[tuple[pd.Series, str]]:
+        row = self._connection().execute(
+            "SELECT Payload, ModelUsed FROM FORECAST_CACHE WHERE CacheKey = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._pending_access.append((time.time(), key))
+        return pickle.loads(row[0]), row[1]
+
+    def put(self, key: str, forecast_series: pd.Series, model_used: str):
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO FORECAST_CACHE (CacheKey, Payload, ModelUsed, CreatedAt, LastAccess) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, pickle.dumps(forecast_series, protocol=pickle.HIGHEST_PROTOCOL), str(model_used), now, now),
+        )
+        self.writes += 1
+
+    def evict(self) -> int:
+        """
+        按 max_age_days / max_entries 淘汰，返回删除条数
+        """
+        self.flush_access()
+        conn = self._connection()
+        deleted = 0
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            deleted += conn.execute("DELETE FROM FORECAST_CACHE WHERE CreatedAt < ?", (cutoff,)).rowcount
+        if self.max_entries is not None:
+            deleted += conn.execute(
+                "DELETE FROM FORECAST_CACHE WHERE CacheKey NOT IN "
+                "(SELECT CacheKey FROM FORECAST_CACHE ORDER BY LastAccess DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+        return deleted
+
+    def flush_access(self):
+        """
+        将累计的命中 LastAccess 在一个事务内批量写回
+        """
+        if not self._pending_access:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("UPDATE FORECAST_CACHE SET LastAccess = ? WHERE CacheKey = ?", self._pending_access)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._pending_access = []
+
+    def clear(self):
+        self._connection().execute("DELETE FROM FORECAST_CACHE")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM FORECAST_CACHE").fetchone()[0]
+
+    # ---------- 统计 ----------
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes, "hit_rate": round(self.hit_rate, 4)}
+
+    def merge_stats(self, stats: dict):
+        """
+        累加子进程回传的 stats()
+        """
+        self.hits += stats.get("hits", 0)
+        self.misses += stats.get("misses", 0)
+        self.writes += stats.get("writes", 0)
+
+    def reset_stats(self):
+        self.hits = self.misses = self.writes = 0
+
+    def report(self):
+        self.flush_access()
+        print(f"🗃️ Forecast 缓存：命中 {self.hits}，未命中 {self.misses}，写入 {self.writes}，"
+              f"命中率 {self.hit_rate:.1%}（{self.path}）")
+
+    # ---------- 连接 ----------
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            # autocommit + WAL：每次写入即持久化，多进程并发写时由 SQLite 加锁
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS FORECAST_CACHE ("
+                "CacheKey TEXT PRIMARY KEY, Payload BLOB, ModelUsed TEXT, CreatedAt REAL, LastAccess REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS IX_FORECAST_CACHE_ACCESS ON FORECAST_CACHE (LastAccess)")
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self.flush_access()
+            self._conn.close()
+            self._conn = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        # 子进程从 0 计数，结果经 merge_stats 汇总，避免重复累计父进程已有的计数
+        state["hits"] = state["misses"] = state["writes"] = 0
+        state["_pending_access"] = []
+        return state
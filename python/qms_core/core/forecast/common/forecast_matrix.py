@@ -0,0 +1,81 @@
+import numpy as np
+
+KeyType = tuple[str, str]
+
+
+class ForecastMatrix:
+    """
+    预测矩阵：行为 (ITEMNUM, Warehouse)，列为预测周（第 0 列为下一周）
+    - key_index: key → 行号
+    - values: float64 (n_items × width)，超出各自预测长度的列以最后一个预测值前向填充
+    - lengths: 各行原始预测长度
+    - 累计和矩阵带前导 0 列，window_sum 一次 gather 得到任意前置期窗口内的预测合计
+    与 pd.Series 补齐后 head(n).sum() 一致（NaN 视为 0）
+    """
+
+    def __init__(self, keys: list[KeyType], values: np.ndarray, lengths: np.ndarray):
+        self.keys = keys
+        self.key_index = {key: i for i, key in enumerate(keys)}
+        self.values = values
+        self.lengths = lengths
+        self._cumsum = None
+
+    @classmethod
+    def from_forecast_dict(cls, forecast_dict: dict, width: int = 1) -> "ForecastMatrix":
+        """
+        由 ItemDataPreloader.load_forecast_series 的结果构建（ForecastSeries 缺失的 key 不入矩阵）
+        """
+        keys = [key for key, fc in forecast_dict.items() if fc.get("ForecastSeries") is not None]
+        return cls.from_series(keys, [forecast_dict[key]["ForecastSeries"] for key in keys], width)
+
+    @classmethod
+    def from_series(cls, keys: list[KeyType], series_list: list, width: int = 1) -> "ForecastMatrix":
+        """
+        由预测序列列表构建，宽度至少为 width（通常取最大前置期周数）
+        """
+        arrays = [np.asarray(s, dtype=np.float64) for s in series_list]
+        n_items = len(arrays)
+        lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+        width = max(int(lengths.max()) if n_items else 0, int(width), 1)
+
+        values = np.zeros((n_items, width), dtype=np.float64)
+        if lengths.sum():
+            offsets = np.concatenate([[0], np.cumsum(lengths)])
+            rows = np.repeat(np.arange(n_items), lengths)
+            cols = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+            values[rows, cols] = np.concatenate(arrays)
+
+        # 前向填充：最后一个预测值延续到 width（无预测的行保持 0）
+        has_value = lengths > 0
+        last = np.zeros(n_items)
+        last[has_value] = values[has_value, lengths[has_value] - 1]
+        pad = np.arange(width)[None, :] >= lengths[:, None]
+        values = np.where(pad, last[:, None], values)
+        return cls(list(keys), values, lengths)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    @property
+    def cumsum(self) -> np.ndarray:
+        if self._cumsum is None:
+            cumsum = np.zeros((self.values.shape[0], self.values.shape[1] + 1))
+            np.nancumsum(self.values, axis=1, out=cumsum[:, 1:])
+            self._cumsum = cumsum
+        return self._cumsum
+
+    def window_sum(self, weeks: np.ndarray, rows: np.ndarray = None) -> np.ndarray:
+        """
+        各行前 weeks 周的预测合计（rows 缺省为全部行）；weeks 超出矩阵宽度时按最后一列的值继续外推
+        """
+        weeks = np.asarray(weeks, dtype=np.int64)
+        rows = np.arange(len(weeks)) if rows is None else np.asarray(rows, dtype=np.int64)
+        width = self.values.shape[1]
+        clipped = np.clip(weeks, 0, width)
+        total = self.cumsum[rows, clipped]
+        extra = weeks - clipped
+        if extra.any():
+            last = np.nan_to_num(self.values[rows, width - 1])
+            total = total + extra * last
+        return total
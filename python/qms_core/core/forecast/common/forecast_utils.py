@@ -3,6 +3,9 @@ import pandas as pd
 from scipy.stats import norm
 from qms_core.core.common.params.ParasCenter import ParasCenter
 from qms_core.core.common.params.SafetyStockParams import ServiceLevelParamsSchema
+from qms_core.core.common.week_calendar import (
+    dates_to_yearweek, dates_to_yearweek_str, parse_yearweek, yearweek_range
+)
 
 def croston_sba_forecast(demand_series, alpha=0.1):
     demand_series = np.asarray(demand_series)
@@ -30,6 +33,86 @@ def croston_sba_forecast(demand_series, alpha=0.1):
     forecast = (1 - alpha / 2) * (z_hat / p_hat)
     return {"forecast": forecast, "z_hat": z_hat, "p_hat": p_hat,"z_list": z}
 
+def croston_sba_batch(demand: np.ndarray, alpha=0.1, start_idx: np.ndarray = None) -> dict:
+    """
+    批量 Croston/SBA：demand 为 (n_items × n_weeks)，每行从 start_idx 开始为有效序列（默认全部有效）
+    - 沿时间轴单次遍历、对 item 向量化，结果与逐项 croston_sba_forecast 一致
+    - 返回数组：z_hat, p_hat, forecast, n_demands（需求次数）, z_std（需求量样本标准差，ddof=1，不足两次为 NaN）
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    n_items, n_weeks = demand.shape
+    if start_idx is None:
+        start_idx = np.zeros(n_items, dtype=np.int64)
+
+    z_hat = np.zeros(n_items)
+    p_hat = np.ones(n_items)
+    intervals = np.zeros(n_items)
+    n_demands = np.zeros(n_items, dtype=np.int64)
+    z_mean = np.zeros(n_items)   # Welford 累积量，用于需求量标准差
+    z_m2 = np.zeros(n_items)
+
+    for t in range(n_weeks):
+        x = demand[:, t]
+        valid = t >= start_idx
+        hit = valid & (x > 0)
+        first = hit & (n_demands == 0)
+        later = hit & (n_demands > 0)
+
+        z_hat = np.where(first, x, np.where(later, alpha * x + (1 - alpha) * z_hat, z_hat))
+        p_hat = np.where(first, intervals + 1, np.where(later, alpha * (intervals + 1) + (1 - alpha) * p_hat, p_hat))
+
+        n_demands = n_demands + hit
+        delta = np.where(hit, x - z_mean, 0.0)
+        z_mean = z_mean + np.where(hit, delta / np.maximum(n_demands, 1), 0.0)
+        z_m2 = z_m2 + np.where(hit, delta * (x - z_mean), 0.0)
+
+        intervals = np.where(hit, 0.0, np.where(valid, intervals + 1, intervals))
+
+    has_demand = n_demands > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        forecast = np.where(has_demand, (1 - alpha / 2) * (z_hat / p_hat), 0.0)
+        z_std = np.where(n_demands > 1, np.sqrt(z_m2 / (n_demands - 1)), np.nan)
+
+    return {
+        "z_hat": np.where(has_demand, z_hat, 0.0),
+        "p_hat": np.where(has_demand, p_hat, 1.0),
+        "forecast": forecast,
+        "n_demands": n_demands,
+        "z_std": z_std,
+    }
+
+def ols_trend_batch(Y: np.ndarray, start_idx: np.ndarray = None) -> dict:
+    """
+    批量单变量最小二乘（x = 0..n-1，对应每行有效区间内的周序号）
+    - Y: (n_items × n_weeks)，每行从 start_idx 开始有效（默认全部有效）
+    - 闭式解：slope = Σ(x-x̄)(y-ȳ) / Σ(x-x̄)²，intercept = ȳ - slope·x̄
+    - 返回数组：slope, intercept, resid_std（ddof=1，n<2 为 NaN）, n
+    n < 2 的行 slope 为 0、intercept 为均值（与 TrendedForecaster 的退化处理一致）
+    """
+    Y = np.asarray(Y, dtype=np.float64)
+    if Y.ndim == 1:
+        Y = Y[None, :]
+    n_items, n_weeks = Y.shape
+    if start_idx is None:
+        start_idx = np.zeros(n_items, dtype=np.int64)
+
+    valid = np.arange(n_weeks)[None, :] >= start_idx[:, None]
+    n = valid.sum(axis=1).astype(np.float64)
+    x = np.where(valid, np.arange(n_weeks)[None, :] - start_idx[:, None], 0).astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = x.sum(axis=1) / n
+        y_mean = np.where(valid, Y, 0.0).sum(axis=1) / n
+        xc = np.where(valid, x - x_mean[:, None], 0.0)
+        yc = np.where(valid, Y - y_mean[:, None], 0.0)
+        sxx = (xc * xc).sum(axis=1)
+        slope = np.where(sxx > 0, (xc * yc).sum(axis=1) / sxx, 0.0)
+        intercept = y_mean - slope * x_mean
+        resid = np.where(valid, yc - slope[:, None] * xc, 0.0)
+        resid_std = np.where(n >= 2, np.sqrt((resid * resid).sum(axis=1) / (n - 1)), np.nan)
+
+    return {"slope": slope, "intercept": intercept, "resid_std": resid_std, "n": n.astype(np.int64)}
+
 def croston_safety_stock(z_list, p_hat, lead_time_weeks, service_level):
     if len(z_list) <= 1:
         return 0
@@ -47,6 +130,46 @@ def weighted_bootstrap_quantile(data, weights=None, quantile=0.9, n_samples=1000
     samples = np.random.choice(data, size=n_samples, replace=True, p=norm_weights)
     return np.quantile(samples, quantile)
 
+def weighted_quantile(data, weights=None, quantile=0.9):
+    """
+    精确加权分位数（确定性）：按值排序后取累计权重首次达到 quantile 的值，
+    即 weighted_bootstrap_quantile 在 n_samples → ∞ 时的极限
+    """
+    data = np.asarray(data, dtype=float)
+    if len(data) == 0:
+        return 0
+    weights = np.ones_like(data) if weights is None else np.asarray(weights, dtype=float)
+    return float(weighted_quantile_batch(data[None, :], weights[None, :], quantile)[0])
+
+def weighted_quantile_batch(data: np.ndarray, weights: np.ndarray, quantile=0.9) -> np.ndarray:
+    """
+    批量精确加权分位数：data / weights 为 (n_items × n_obs)，权重为 0 的位置视为填充
+    - 每行一次 argsort + cumsum，返回 (n_items,)；全零权重行返回 0
+    """
+    data = np.asarray(data, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    order = np.argsort(data, axis=1, kind="stable")
+    sorted_data = np.take_along_axis(data, order, axis=1)
+    sorted_w = np.take_along_axis(weights, order, axis=1)
+
+    cum_w = np.cumsum(sorted_w, axis=1)
+    total = cum_w[:, -1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cdf = cum_w / total
+    # 容忍浮点累加误差，避免 cdf 恰好等于 quantile 时被跳过
+    hit = (cdf >= quantile - 1e-12) & (sorted_w > 0)
+    idx = np.argmax(hit, axis=1)
+
+    result = sorted_data[np.arange(len(data)), idx]
+    return np.where(total[:, 0] > 0, result, 0.0)
+
+def winsorize_matrix(X: np.ndarray, valid: np.ndarray, upper=0.95) -> np.ndarray:
+    """
+    按行单侧温莎化（与 singleside_winsorize_series 一致），只在 valid 区间内取分位数；无效位置置 0
+    """
+    q_high = np.nanquantile(np.where(valid, X, np.nan), upper, axis=1)
+    return np.where(valid, np.minimum(X, q_high[:, None]), 0.0)
+
 def winsorize_series(s, lower=0.01, upper=0.99):
     q_low = s.quantile(lower)
     q_high = s.quantile(upper)
@@ -58,7 +181,7 @@ def singleside_winsorize_series(s, upper=0.95):
 
 def preprocess_demand(df: pd.DataFrame, max_date=None, params=None) -> pd.DataFrame:
     if df is None or df.empty:
-        return pd.DataFrame(columns=["TotalDemand", "WeeksAgo", "Weight"])
+        return pd.DataFrame(columns=["YearWeek", "TotalDemand", "WeeksAgo", "Weight"])
 
     df = df.copy()
     if max_date is None:
@@ -76,7 +199,7 @@ def preprocess_demand(df: pd.DataFrame, max_date=None, params=None) -> pd.DataFr
     df["Weight"] = decay ** df["WeeksAgo"]
     df["TotalDemand"] = singleside_winsorize_series(df["TotalDemand"], upper=upper)
 
-    return df[["TotalDemand", "WeeksAgo", "Weight"]]
+    return df[["YearWeek", "TotalDemand", "WeeksAgo", "Weight"]]
 
 def score_service_level(iscst, wlead, cv,params: ServiceLevelParamsSchema = None) -> float:
     if params is None:
@@ -107,6 +230,35 @@ def score_service_level(iscst, wlead, cv,params: ServiceLevelParamsSchema = None
     mapped_score = min_servicelevel + (max_servicelevel - min_servicelevel) * sigmoid
     return round(mapped_score, 4)
 
+def score_service_level_batch(iscst: np.ndarray, wlead: np.ndarray, cv: np.ndarray,
+                              params: ServiceLevelParamsSchema = None) -> np.ndarray:
+    """
+    score_service_level 的批量版本：输入为等长数组（缺失为 NaN），结果与逐项计算一致
+    """
+    if params is None:
+        params = ParasCenter().service_level_params
+    max_leadtime = params.max_leadtime
+    min_servicelevel = params.min_servicelevel
+    max_servicelevel = params.max_servicelevel
+
+    if max_servicelevel <= min_servicelevel or max_servicelevel > 0.99:
+        max_servicelevel = 0.99
+        min_servicelevel = 0.85
+
+    iscst = np.asarray(iscst, dtype=np.float64)
+    wlead = np.asarray(wlead, dtype=np.float64)
+    cv = np.asarray(cv, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        lead_risk_score = np.log1p(wlead) / np.log1p(max_leadtime)
+        value_penalty = np.log1p(iscst)
+        raw_score = (cv * lead_risk_score) / value_penalty
+        sigmoid = 1 / (1 + np.exp(-raw_score))
+    mapped_score = np.round(min_servicelevel + (max_servicelevel - min_servicelevel) * sigmoid, 4)
+
+    valid = ~(np.isnan(iscst) | np.isnan(wlead)) & np.isfinite(cv) & np.isfinite(raw_score)
+    return np.where(valid, mapped_score, min_servicelevel)
+
 def to_yearweek(date) -> str:
     """
     将 datetime 日期转换为 'YYYY-XXW' 格式（系统标准周格式）
@@ -135,14 +287,20 @@ def to_yearweek_int(date) -> int:
     return year * 100 + week  # 如 2025 * 100 + 24 = 202524
 
 def convert_column_to_yearweek(df: pd.DataFrame, date_col: str, target_col: str = "YearWeek") -> pd.DataFrame:
-    df[target_col] = df[date_col].apply(to_yearweek)
+    df[target_col] = dates_to_yearweek_str(df[date_col])
     return df
 
+def to_yearweek_int_array(dates) -> np.ndarray:
+    """
+    向量化 to_yearweek_int：日期序列 → 整数 YearWeek 数组（float，缺失为 NaN）
+    """
+    return dates_to_yearweek(dates)
+
+def parse_yearweek_str_array(values) -> np.ndarray:
+    """
+    'YYYY-XXW' 字符串序列 → 整数 YearWeek 数组（float，无法解析为 NaN）；只解析去重后的取值
+    """
+    return parse_yearweek(pd.Series(values, dtype=object))
+
 def get_next_n_yearweeks(start_date: pd.Timestamp, n: int) -> list[int]:
-    yearweeks = []
-    date = start_date
-    for _ in range(n):
-        yw = to_yearweek_int(date)
-        yearweeks.append(yw)
-        date += pd.Timedelta(weeks=1)
-    return yearweeks
\ No newline at end of file
+    return yearweek_range(pd.Timestamp(start_date), n).tolist()
\ No newline at end of file
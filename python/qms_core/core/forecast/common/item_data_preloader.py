@@ -1,20 +1,65 @@
-from qms_core.infrastructure.db.reader import fetch_orm_data
+from qms_core.infrastructure.db.reader import fetch_orm_data, fetch_orm_data_by_keys
 import pandas as pd
-from typing import Optional
+from typing import Optional, Sequence
 from qms_core.core.item.item import Item
 
 class ItemDataPreloader:
-    def __init__(self, config, items: list[Item]):
+    """
+    批量预加载 item 所需的各类输入数据。
+    - key_filter=None：原有模式，全表读取后在 pandas 中按 ITEMNUM / Warehouse 过滤
+    - key_filter="auto" / "in" / "temp_table"：按 (ITEMNUM, Warehouse) key 集合把过滤下推到 SQL，
+      且只读取各 loader 实际用到的字段（适合只跑少量 item 的场景）
+    """
+    def __init__(self, config, items: list[Item], key_filter: Optional[str] = None):
         self.config = config
         self.items = items
+        self.key_filter = key_filter
         self.replacing_map = self._build_replacing_map()
 
+    def _item_keys(self) -> set[tuple[str, str]]:
+        return {(item.itemnum, item.warehouse) for item in self.items}
+
+    def _fetch_for_keys(
+        self,
+        orm_class,
+        keys,
+        columns: list[str],
+        key_columns: Sequence[str] = ("ITEMNUM", "Warehouse"),
+    ) -> pd.DataFrame:
+        """
+        读取 orm_class 中属于 keys 的记录。
+        key_filter 模式下下推到 SQL 且只读 columns；否则保持全表读取 + isin 的原有行为。
+        """
+        if self.key_filter:
+            return fetch_orm_data_by_keys(
+                self.config, orm_class, keys,
+                key_columns=key_columns, columns=columns, strategy=self.key_filter
+            )
+
+        df = fetch_orm_data(self.config, orm_class)
+        if df.empty:
+            return pd.DataFrame(columns=columns)
+
+        keys = [k if isinstance(k, tuple) else (k,) for k in keys]
+        for i, col in enumerate(key_columns):
+            df = df[df[col].isin({k[i] for k in keys})]
+        return df
+
     def _build_replacing_map(self, type_filter='1') -> dict:
         """
         从 DPS 表构建替代关系映射：{子件: [ {'parent': ..., 'using_existing': ...}, ... ]}
         """
         from qms_core.infrastructure.db.models import DPS
-        df = fetch_orm_data(self.config, DPS)
+        if self.key_filter:
+            df = fetch_orm_data(
+                self.config, DPS,
+                filters=[DPS.TYPE == type_filter],
+                columns=["ITEMNUM_PARENT", "ITEMNUM_CHILD", "TYPE", "USING_EXISTING"]
+            )
+        else:
+            df = fetch_orm_data(self.config, DPS)
+        if df.empty:
+            return {}
         df = df[df["TYPE"] == type_filter]
 
         if df.empty:
@@ -39,7 +84,16 @@ class ItemDataPreloader:
         """
         from qms_core.infrastructure.db.models import STKOHAvail
 
-        df = fetch_orm_data(self.config, STKOHAvail)
+        if self.key_filter:
+            # 主件 + 可用替代件父项
+            keys = self._item_keys()
+            for item in self.items:
+                for rel in self.replacing_map.get(item.itemnum, []):
+                    if rel.get("using_existing"):
+                        keys.add((rel["parent"], item.warehouse))
+            df = self._fetch_for_keys(STKOHAvail, keys, columns=["ITEMNUM", "Warehouse", "AVAIL", "IONOD"])
+        else:
+            df = fetch_orm_data(self.config, STKOHAvail)
 
         if df.empty:
             return pd.DataFrame(columns=["ITEMNUM", "Warehouse", "AvailableStock", "IntransitStock"])
@@ -111,12 +165,11 @@ class ItemDataPreloader:
                     all_keys.add(key)
                     parent_to_child[key] = item.itemnum  # 将母件映射为当前子件
 
-        itemnums = list(set(k[0] for k in all_keys))
-        warehouses = list(set(k[1] for k in all_keys))
-
         # 批量读取并筛选
-        df = fetch_orm_data(self.config, DemandHistoryWeekly)
-        df = df[df["ITEMNUM"].isin(itemnums) & df["Warehouse"].isin(warehouses)]
+        df = self._fetch_for_keys(
+            DemandHistoryWeekly, all_keys,
+            columns=["ITEMNUM", "Warehouse", "YearWeek", "TotalDemand"]
+        )
 
         if df.empty:
             return pd.DataFrame(columns=["ITEMNUM", "Warehouse", "YearWeek", "TotalDemand"])
@@ -146,21 +199,21 @@ class ItemDataPreloader:
         """
         from qms_core.infrastructure.db.models import IIM, IWI
 
-        keys = {(item.itemnum, item.warehouse) for item in self.items}
+        keys = self._item_keys()
         itemnums = list(set(k[0] for k in keys))
-        warehouses = list(set(k[1] for k in keys))
 
         # IIM：全局主数据（按 ITEMNUM）
-        iim_df = fetch_orm_data(self.config, IIM)
-        iim_df = iim_df[iim_df["ITEMNUM"].isin(itemnums)]
+        iim_df = self._fetch_for_keys(
+            IIM, itemnums, key_columns=["ITEMNUM"],
+            columns=["ITEMNUM", "IITYP", "IDESC", "IVEND", "VNDNAM", "ISCST", "CXPPLC", "PGC", "GAC", "RPFLAG"]
+        )
         iim_dict = {row["ITEMNUM"]: row for _, row in iim_df.iterrows()}
 
         # IWI：库别主数据（按 ITEMNUM + Warehouse）
-        iwi_df = fetch_orm_data(self.config, IWI)
-        iwi_df = iwi_df[
-            iwi_df["ITEMNUM"].isin(itemnums) &
-            iwi_df["Warehouse"].isin(warehouses)
-        ]
+        iwi_df = self._fetch_for_keys(
+            IWI, keys,
+            columns=["ITEMNUM", "Warehouse", "WLOTS", "MOQ", "WLEAD", "WSAFE", "WLOC"]
+        )
         iwi_dict = {
             (row["ITEMNUM"], row["Warehouse"]): row for _, row in iwi_df.iterrows()
         }
@@ -198,12 +251,11 @@ class ItemDataPreloader:
         """
         from qms_core.infrastructure.db.models import DemandType
 
-        keys = {(item.itemnum, item.warehouse) for item in self.items}
-        itemnums = [k[0] for k in keys]
-        warehouses = [k[1] for k in keys]
-
-        df = fetch_orm_data(self.config, DemandType)
-        df = df[df["ITEMNUM"].isin(itemnums) & df["Warehouse"].isin(warehouses)]
+        df = self._fetch_for_keys(
+            DemandType, self._item_keys(),
+            columns=["ITEMNUM", "Warehouse", "DemandType", "ActivityLevel", "WeeksWithDemand",
+                     "ZeroRatio", "CV", "TrendSlope", "SeasonalStrength"]
+        )
 
         result = {}
         for _, row in df.iterrows():
@@ -227,12 +279,10 @@ class ItemDataPreloader:
         import json
         from qms_core.infrastructure.db.models import ItemForecastRecord
 
-        keys = {(item.itemnum, item.warehouse) for item in self.items}
-        itemnums = [k[0] for k in keys]
-        warehouses = [k[1] for k in keys]
-
-        df = fetch_orm_data(self.config, ItemForecastRecord)
-        df = df[df["ITEMNUM"].isin(itemnums) & df["Warehouse"].isin(warehouses)]
+        df = self._fetch_for_keys(
+            ItemForecastRecord, self._item_keys(),
+            columns=["ITEMNUM", "Warehouse", "ForecastSeriesJSON", "Forecast_monthly", "ForecastModel"]
+        )
 
         result = {}
         for _, row in df.iterrows():
@@ -257,12 +307,11 @@ class ItemDataPreloader:
         """
         from qms_core.infrastructure.db.models import ItemSafetyRecord
 
-        keys = {(item.itemnum, item.warehouse) for item in self.items}
-        itemnums = [k[0] for k in keys]
-        warehouses = [k[1] for k in keys]
-
-        df = fetch_orm_data(self.config, ItemSafetyRecord)
-        df = df[df["ITEMNUM"].isin(itemnums) & df["Warehouse"].isin(warehouses)]
+        df = self._fetch_for_keys(
+            ItemSafetyRecord, self._item_keys(),
+            columns=["ITEMNUM", "Warehouse", "RecommendedServiceLevel", "DynamicSafetyStock",
+                     "FinalSafetyStock", "SafetyCalcDate"]
+        )
 
         result = {}
         for _, row in df.iterrows():
@@ -282,19 +331,21 @@ class ItemDataPreloader:
         """
         from qms_core.infrastructure.db.models import ItemSmartLeadtime,IIM,ItemTransportPreference
 
-        keys = {(item.itemnum, item.warehouse) for item in self.items}
-        itemnums = [k[0] for k in keys]
-        warehouses = [k[1] for k in keys]
-
-        # 全量拉取 (可以加 where 加速)
-        df_slt = fetch_orm_data(self.config, ItemSmartLeadtime)
-        df_master = fetch_orm_data(self.config, IIM)
-        df_pref = fetch_orm_data(self.config, ItemTransportPreference)
+        keys = self._item_keys()
+        itemnums = list(set(k[0] for k in keys))
 
-        # 过滤 SmartLeadtime 记录
-        df_slt = df_slt[df_slt["ITEMNUM"].isin(itemnums) & df_slt["Warehouse"].isin(warehouses)]
-        df_pref = df_pref[df_pref["ITEMNUM"].isin(itemnums) & df_pref["Warehouse"].isin(warehouses)]
-        df_master = df_master[df_master["ITEMNUM"].isin(itemnums)]
+        # 按 key 读取 SmartLeadtime / TransportPreference / IIM
+        df_slt = self._fetch_for_keys(
+            ItemSmartLeadtime, keys,
+            columns=["ITEMNUM", "Warehouse", "VendorCode", "TransportMode", "Source",
+                     "Q60LeadTime", "Q60PrepDays", "Q60TransportLeadTime",
+                     "MeanLeadTime", "LeadTimeStd", "Q90LeadTime"]
+        )
+        df_pref = self._fetch_for_keys(
+            ItemTransportPreference, keys,
+            columns=["ITEMNUM", "Warehouse", "VendorCode", "TransportMode", "Rank"]
+        )
+        df_master = self._fetch_for_keys(IIM, itemnums, key_columns=["ITEMNUM"], columns=["ITEMNUM", "IVEND"])
 
         # 合并 IIM 取 VendorCode
         df_master = df_master.rename(columns={"IVEND": "VendorCode"})
@@ -327,6 +378,9 @@ class ItemDataPreloader:
                 "Source": row.get("Source"),
                 "Q60LeadTime": row.get("Q60LeadTime"),
                 "Q60PrepDays": row.get("Q60PrepDays"),
-                "Q60TransportLeadTime": row.get("Q60TransportLeadTime")
+                "Q60TransportLeadTime": row.get("Q60TransportLeadTime"),
+                "MeanLeadTime": row.get("MeanLeadTime"),
+                "LeadTimeStd": row.get("LeadTimeStd"),
+                "Q90LeadTime": row.get("Q90LeadTime")
             }
         return result
\ No newline at end of file
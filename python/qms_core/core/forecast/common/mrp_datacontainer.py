@@ -1,6 +1,11 @@
 from qms_core.core.item.item import Item
 from qms_core.core.forecast.common.item_data_preloader import ItemDataPreloader
+from qms_core.core.forecast.common.demand_store import DemandStore
+from qms_core.core.forecast.common.demand_matrix import DemandMatrix
+from qms_core.core.forecast.common.forecast_utils import croston_sba_batch, ols_trend_batch, winsorize_matrix
+from typing import Optional
 import pandas as pd
+import numpy as np
 
 class MRPDataContainer:
     """
@@ -18,6 +23,109 @@ class MRPDataContainer:
         self.demand_type_dict = demand_type_dict
         self.safety_stock_dict = safety_stock_dict
         self.smart_lead_time_dict = smart_lead_time_dict
+        self._demand_store = None
+        self._demand_matrices = {}
+        self._preprocessed_cache = {}
+        self._croston_cache = {}
+        self._trend_fit_cache = {}
+
+    @property
+    def demand_store(self) -> DemandStore:
+        """
+        按 key 分区的需求历史，首次访问时由 demand_df 构建一次，之后各 Job 共享
+        """
+        if self._demand_store is None:
+            self._demand_store = DemandStore.from_df(self.demand_df)
+        return self._demand_store
+
+    @property
+    def demand_matrix(self) -> DemandMatrix:
+        """
+        稠密 float32 需求矩阵（key × 统一周日历），由 demand_store 构建一次后共享
+        """
+        return self.get_demand_matrix(np.float32)
+
+    def get_demand_matrix(self, dtype=np.float32) -> DemandMatrix:
+        """
+        按 dtype 缓存的需求矩阵（需要与逐项路径数值完全一致时可取 float64）
+        """
+        key = np.dtype(dtype).str
+        if key not in self._demand_matrices:
+            self._demand_matrices[key] = DemandMatrix.from_store(self.demand_store, dtype=dtype)
+        return self._demand_matrices[key]
+
+    def get_preprocessed_demand(self, winsor_upper: float) -> np.ndarray:
+        """
+        共享的预处理需求矩阵（float64，按行单侧温莎化，历史区间外为 0），与 preprocess_demand 的 TotalDemand 一致。
+        分类 / Croston / 趋势拟合 / 安全库存复用同一份，按 winsor_upper 缓存
+        """
+        if winsor_upper not in self._preprocessed_cache:
+            matrix = self.get_demand_matrix(np.float64)
+            if not len(matrix.keys):
+                self._preprocessed_cache[winsor_upper] = matrix.values
+            else:
+                self._preprocessed_cache[winsor_upper] = winsorize_matrix(matrix.values, matrix.history_mask(), winsor_upper)
+        return self._preprocessed_cache[winsor_upper]
+
+    def get_croston_batch(self, alpha: float, winsor_upper: float) -> dict:
+        """
+        整个需求矩阵（预处理后）的批量 Croston/SBA 结果，行与 demand_matrix 对齐，按 (alpha, winsor_upper) 缓存
+        """
+        cache_key = (alpha, winsor_upper)
+        if cache_key not in self._croston_cache:
+            matrix = self.get_demand_matrix(np.float64)
+            self._croston_cache[cache_key] = croston_sba_batch(
+                self.get_preprocessed_demand(winsor_upper), alpha, matrix.start_idx
+            )
+        return self._croston_cache[cache_key]
+
+    def get_croston_result(self, key: tuple[str, str], alpha: float, winsor_upper: float) -> Optional[dict]:
+        """
+        共享的 Croston/SBA 结果（Forecast 与 SafetyStock 复用）；无历史返回 None
+        """
+        return self._take_row(self.get_croston_batch(alpha, winsor_upper), key)
+
+    def get_trend_fit(self, key: tuple[str, str], winsor_upper: float) -> Optional[dict]:
+        """
+        共享的批量 OLS 趋势拟合（slope / intercept / resid_std / n），按 winsor_upper 缓存；无历史返回 None
+        """
+        if winsor_upper not in self._trend_fit_cache:
+            matrix = self.get_demand_matrix(np.float64)
+            self._trend_fit_cache[winsor_upper] = ols_trend_batch(
+                self.get_preprocessed_demand(winsor_upper), matrix.start_idx
+            )
+        return self._take_row(self._trend_fit_cache[winsor_upper], key)
+
+    def _take_row(self, batch_result: dict, key: tuple[str, str]) -> Optional[dict]:
+        row = self.get_demand_matrix(np.float64).key_index.get(key)
+        if row is None:
+            return None
+        return {name: values[row] for name, values in batch_result.items()}
+
+    def subset(self, items: list[Item]) -> "MRPDataContainer":
+        """
+        只包含部分 item 的视图（增量模式下用于只重算 dirty item）。
+        各输入 / 结果 dict 与需求缓存均与原容器共享同一对象
+        """
+        sub = MRPDataContainer(
+            items=items,
+            demand_df=self.demand_df,
+            forecast_dict=self.forecast_dict,
+            inventory_dict=self.inventory_dict,
+            master_dict=self.master_dict,
+            demand_type_dict=self.demand_type_dict,
+            safety_stock_dict=self.safety_stock_dict,
+            smart_lead_time_dict=self.smart_lead_time_dict,
+        )
+        sub._demand_store = self.demand_store
+        sub._demand_matrices = self._demand_matrices
+        sub._preprocessed_cache = self._preprocessed_cache
+        sub._croston_cache = self._croston_cache
+        sub._trend_fit_cache = self._trend_fit_cache
+        return sub
+
+    def load_item_demand(self, item: Item):
+        item.demand.load_from_store(self.demand_store)
 
     @classmethod
     def from_preloader(cls, preloader:ItemDataPreloader, items:list[Item]):
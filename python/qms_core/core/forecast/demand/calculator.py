@@ -2,16 +2,27 @@ from qms_core.core.common.params.ForecastParams import ForecastParamsSchema
 from qms_core.core.common.params.ParasCenter import ParasCenter
 from qms_core.core.common.params.enums import DemandType,ActivityLevel
 from qms_core.core.forecast.common.forecast_utils import preprocess_demand
+from qms_core.core.forecast.common.forecast_cache import ForecastCache
+from typing import Optional
 import pandas as pd
 from qms_core.core.forecast.demand.registry import ForecastMethodRegistry
 from qms_core.core.item.item import Item
 
 class DemandForecaster:
-    def __init__(self, params: ForecastParamsSchema = None):
+    """
+    cache: 可选的 ForecastCache，按 (历史, max_date, demand_type, forecaster, params) 复用已算过的预测
+    """
+    def __init__(self, params: ForecastParamsSchema = None, cache: Optional[ForecastCache] = None):
         self.params = params or ParasCenter().forecast_params
         self.registry = ForecastMethodRegistry(self.params)
+        self.cache = cache
 
-    def forecast_item(self, item:Item, max_date: pd.Timestamp = None):
+    def forecast_item(self, item:Item, max_date: pd.Timestamp = None, croston: dict = None, trend_fit: dict = None,
+                      preprocessed: pd.DataFrame = None):
+        """
+        croston / trend_fit: 容器中批量计算的共享拟合结果
+        preprocessed: 已按 max_date 截断并预处理（YearWeek, TotalDemand, WeeksAgo, Weight）的历史，批量回测等场景提供
+        """
         df = item.demand.history
         if df is None or df.empty:
             return self._set_forecast(item, [0] * self.params.forecast_horizon_weeks, "empty")
@@ -27,12 +38,39 @@ class DemandForecaster:
         if demand_type in [DemandType.SINGLE, DemandType.NEW] or activity in [ActivityLevel.DORMANT, ActivityLevel.INACTIVE]:
             return self._set_forecast(item, [0] * self.params.forecast_horizon_weeks, "cold_start")
 
-        df = self._preprocess(df, max_date)
-
         forecaster = self.registry.get_method(demand_type)
-        forecast_series = forecaster.forecast_series(df, max_weeks=self.params.forecast_horizon_weeks)
+
+        def compute():
+            # 已有共享的 Croston/SBA、OLS 结果时直接复用，不再逐项计算
+            if croston is not None and hasattr(forecaster, "forecast_from_croston"):
+                return forecaster.forecast_from_croston(croston, max_weeks=self.params.forecast_horizon_weeks)
+            if trend_fit is not None and hasattr(forecaster, "forecast_from_fit"):
+                return forecaster.forecast_from_fit(trend_fit, max_weeks=self.params.forecast_horizon_weeks)
+            if preprocessed is None:
+                return forecaster.forecast_series(self._preprocess(df, max_date), max_weeks=self.params.forecast_horizon_weeks)
+            return forecaster.forecast_series(preprocessed, max_weeks=self.params.forecast_horizon_weeks)
+
+        forecast_series = self._cached(df, max_date, demand_type, forecaster, compute)
         return self._set_forecast(item, forecast_series, demand_type)
 
+    def _cached(self, df: pd.DataFrame, max_date: pd.Timestamp, demand_type, forecaster, compute):
+        """
+        未配置缓存时直接计算；否则先按内容哈希查缓存，未命中再计算并写入
+        """
+        if self.cache is None:
+            return compute()
+
+        key = ForecastCache.make_key(df, max_date, demand_type, type(forecaster).__name__, self.params)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit[0]
+
+        forecast_series = compute()
+        if not isinstance(forecast_series, pd.Series):
+            forecast_series = pd.Series(forecast_series)
+        self.cache.put(key, forecast_series, getattr(demand_type, "value", demand_type))
+        return forecast_series
+
     def _preprocess(self, df: pd.DataFrame, max_date: pd.Timestamp) -> pd.DataFrame:
         return preprocess_demand(df, max_date, self.params)
 
@@ -57,9 +95,11 @@ class DemandForecaster:
             max_date = df["YearWeek"].max()
 
         df = df[df["YearWeek"] <= max_date].copy()
-        df = self._preprocess(df, max_date)
 
         method = method.upper()
         forecaster = self.registry.get_method(method)  
-        forecast_series = forecaster.forecast_series(df, max_weeks=self.params.forecast_horizon_weeks)
+        forecast_series = self._cached(
+            df, max_date, method, forecaster,
+            lambda: forecaster.forecast_series(self._preprocess(df, max_date), max_weeks=self.params.forecast_horizon_weeks)
+        )
         return self._set_forecast(item, forecast_series, method)
\ No newline at end of file
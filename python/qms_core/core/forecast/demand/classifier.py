@@ -4,9 +4,17 @@ from typing import Optional
 from qms_core.core.common.params.enums import ActivityLevel,DemandType
 import pandas as pd
 import numpy as np
-from qms_core.core.forecast.common.forecast_utils import preprocess_demand
-from statsmodels.tsa.seasonal import seasonal_decompose
+from qms_core.core.forecast.common.forecast_utils import preprocess_demand, winsorize_matrix
+from qms_core.core.forecast.common.decomposition import decomposition_metrics_batch, decomposition_metrics_ragged
 from qms_core.core.item.item import Item
+from qms_core.core.forecast.common.demand_matrix import DemandMatrix
+
+# np.select 选择结果的编码顺序
+_DEMAND_TYPE_CODES = [
+    DemandType.NEW, DemandType.STEADY, DemandType.SINGLE, DemandType.INTERMITTENT,
+    DemandType.TRENDED, DemandType.SEASONAL, DemandType.BURST,
+]
+_ACTIVITY_CODES = [ActivityLevel.DORMANT, ActivityLevel.INACTIVE, ActivityLevel.OCCASIONAL, ActivityLevel.ACTIVE]
 
 class DemandClassifier:
     def __init__(self, params: ClassifierParamsSchema = None):
@@ -75,13 +83,13 @@ class DemandClassifier:
         weeks_with_demand = (df["TotalDemand"] > 0).sum()
         zero_ratio = (df["TotalDemand"] == 0).sum() / len(df)
 
-        try:
-            decomposition = seasonal_decompose(df.set_index("YearWeek")["TotalDemand"], model="additive", period=self.params.seasonal_decompose_period)
-            trend_slope = decomposition.trend.dropna().diff().mean()
-            seasonal_strength = decomposition.seasonal.abs().mean()
-        except:
-            trend_slope = np.nan
-            seasonal_strength = np.nan
+        # 趋势 / 季节性分解指标默认为空（不判定 TRENDED / SEASONAL），由 enable_decomposition_metrics 开启
+        trend_slope, seasonal_strength = np.nan, np.nan
+        if p.enable_decomposition_metrics:
+            trend_slope, seasonal_strength = decomposition_metrics_batch(
+                df["TotalDemand"].to_numpy(dtype=np.float64), p.seasonal_decompose_period
+            )
+            trend_slope, seasonal_strength = trend_slope[0], seasonal_strength[0]
 
         return {
             "WeeksWithDemand": weeks_with_demand,
@@ -137,3 +145,137 @@ class DemandClassifier:
             return ActivityLevel.OCCASIONAL
         else:
             return ActivityLevel.ACTIVE
+
+
+    # ------------------------------------------------------------------
+    # 批量模式
+    # ------------------------------------------------------------------
+
+    def classify_batch(self, items: list[Item], matrix: DemandMatrix, max_date: pd.Timestamp = None,
+                       chunk_size: int = 20000, preprocessed: Optional[np.ndarray] = None) -> list[Item]:
+        """
+        对整个物料组合做列式批量分类，结果与 calculate_for_item 一致。
+        - matrix: 需求矩阵（建议 float64，与逐项路径数值一致）
+        - preprocessed: 可选，容器共享的预处理（温莎化）需求矩阵，与 matrix 行对齐；max_date 截断时不使用
+        - 已分类 / 被替代件 / 无历史等特殊情况不在此处理，作为返回值交给逐项路径
+        """
+        weeks = matrix.weeks
+        last_col = len(weeks) - 1 if max_date is None else int(weeks.searchsorted(max_date, side="right")) - 1
+        if last_col != len(weeks) - 1:
+            preprocessed = None
+
+        batch_items, rows, fallback = [], [], []
+        for item in items:
+            if getattr(item.demand_type, "_loaded", False):
+                continue
+            row = matrix.key_index.get((item.itemnum, item.warehouse))
+            if item.master.rpflag == "Y" or row is None or matrix.start_idx[row] > last_col:
+                fallback.append(item)
+                continue
+            batch_items.append(item)
+            rows.append(row)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        for i in range(0, len(rows), chunk_size):
+            chunk_rows = rows[i:i + chunk_size]
+            if preprocessed is not None:
+                result = self._classify_arrays(preprocessed[chunk_rows], matrix.start_idx[chunk_rows], winsorized=True)
+            else:
+                X = matrix.values[chunk_rows, :last_col + 1].astype(np.float64)
+                result = self._classify_arrays(X, matrix.start_idx[chunk_rows])
+            for j, item in enumerate(batch_items[i:i + chunk_size]):
+                item.demand_type.demand_type = _DEMAND_TYPE_CODES[result["DemandTypeCode"][j]]
+                item.demand_type.activity_level = _ACTIVITY_CODES[result["ActivityCode"][j]]
+                item.demand_type.metrics = {
+                    "WeeksWithDemand": int(result["WeeksWithDemand"][j]),
+                    "ZeroRatio": float(result["ZeroRatio"][j]),
+                    "CV": float(result["CV"][j]),
+                    "TrendSlope": float(result["TrendSlope"][j]),
+                    "SeasonalStrength": float(result["SeasonalStrength"][j]),
+                    "WeightedMean": float(result["WeightedMean"][j]),
+                    "WeightedStd": float(result["WeightedStd"][j]),
+                }
+                item.demand_type._loaded = True
+
+        return fallback
+
+    def _classify_arrays(self, X: np.ndarray, start_idx: np.ndarray, winsorized: bool = False) -> dict:
+        """
+        X: (n_items × n_weeks)，每行从 start_idx 开始为有效历史，最后一列为 max_date 所在周；
+        winsorized=True 表示 X 已按 winsor_upper 预处理
+        """
+        p = self.params
+        n_weeks = X.shape[1]
+        col = np.arange(n_weeks)
+        weeks_ago = (n_weeks - 1 - col)[None, :]
+        valid = col[None, :] >= start_idx[:, None]
+        n = (n_weeks - start_idx).astype(np.float64)
+
+        # preprocess_demand：单侧温莎化 + 指数衰减权重
+        if not winsorized:
+            X = winsorize_matrix(X, valid, p.winsor_upper)
+        weight = np.where(valid, p.decay_factor ** weeks_ago, 0.0)
+
+        sum_w = weight.sum(axis=1)
+        weighted_mean = (X * weight).sum(axis=1) / sum_w
+        weighted_std = np.sqrt((weight * (X - weighted_mean[:, None]) ** 2).sum(axis=1) / sum_w)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cv = np.where(weighted_mean > 0, weighted_std / weighted_mean, np.inf)
+        weeks_with_demand = ((X > 0) & valid).sum(axis=1)
+        zero_ratio = ((X == 0) & valid).sum(axis=1) / n
+        # 与逐项路径一致，未开启 enable_decomposition_metrics 时趋势 / 季节性分解指标为空
+        if p.enable_decomposition_metrics:
+            trend_slope, seasonal_strength = decomposition_metrics_ragged(X, start_idx, p.seasonal_decompose_period)
+        else:
+            trend_slope = np.full(len(X), np.nan)
+            seasonal_strength = np.full(len(X), np.nan)
+
+        # 需求类型
+        recent_demand = np.where(weeks_ago <= 12, X, 0.0).sum(axis=1)
+        is_new = (n - 1) < p.new_item_weeks
+        tail_mask = valid & (weeks_ago < p.burst_tail_window)
+        mean_mask = valid & (weeks_ago < p.burst_mean_window)
+        max_tail = np.where(tail_mask, X, -np.inf).max(axis=1)
+        mean_tail = np.where(mean_mask, X, 0.0).sum(axis=1) / mean_mask.sum(axis=1)
+
+        with np.errstate(invalid="ignore"):
+            demand_code = np.select(
+                [
+                    is_new & (weeks_with_demand <= p.new_item_weeks),
+                    is_new,
+                    (zero_ratio > p.single_zero_ratio) & (recent_demand <= p.single_recent_demand),
+                    zero_ratio > p.intermittent_zero_ratio,
+                    (cv < p.steady_cv_threshold) & (weeks_with_demand / n > p.steady_min_weeks_ratio)
+                    & (zero_ratio < p.steady_max_zero_ratio),
+                    np.abs(trend_slope) > np.maximum(p.trend_slope_threshold, weighted_mean * 0.05),
+                    seasonal_strength > np.maximum(weighted_std * p.seasonal_strength_ratio, p.seasonal_strength_min),
+                    (cv > p.burst_cv_threshold) & (zero_ratio < p.burst_zero_ratio_max)
+                    & (max_tail > p.burst_recent_max_multiplier * mean_tail),
+                ],
+                [0, 1, 2, 3, 1, 4, 5, 6],
+                default=3,
+            )
+
+        # 活跃度
+        recent_weeks_with_demand = ((X > 0) & valid & (weeks_ago <= p.recent_weeks_window - 1)).sum(axis=1)
+        activity_code = np.select(
+            [
+                (zero_ratio >= p.dormant_zero_ratio) & (recent_weeks_with_demand == 0),
+                (zero_ratio >= p.inactive_zero_ratio) & (recent_weeks_with_demand <= p.inactive_recent_weeks_demand_threshold),
+                zero_ratio >= p.occasional_zero_ratio_threshold,
+            ],
+            [0, 1, 2],
+            default=3,
+        )
+
+        return {
+            "DemandTypeCode": demand_code,
+            "ActivityCode": activity_code,
+            "WeeksWithDemand": weeks_with_demand,
+            "ZeroRatio": zero_ratio,
+            "CV": cv,
+            "TrendSlope": trend_slope,
+            "SeasonalStrength": seasonal_strength,
+            "WeightedMean": weighted_mean,
+            "WeightedStd": weighted_std,
+        }
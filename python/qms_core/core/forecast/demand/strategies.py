@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from qms_core.core.forecast.common.forecast_utils import weighted_bootstrap_quantile, croston_sba_forecast
+from qms_core.core.forecast.common.forecast_utils import weighted_bootstrap_quantile, weighted_quantile, croston_sba_forecast, ols_trend_batch
 from qms_core.core.common.params.enums import DemandType
 from abc import ABC, abstractmethod
 
@@ -20,13 +19,16 @@ class BaseForecaster(ABC):
 class SteadyForecaster(BaseForecaster):
     demand_type = DemandType.STEADY
 
-    def __init__(self, n_samples=1000, quantile=0.6):
+    def __init__(self, n_samples=1000, quantile=0.6, quantile_method="exact"):
+        if quantile_method not in ("exact", "bootstrap"):
+            raise ValueError(f"❌ 未知的分位数算法: {quantile_method}")
         self.n_samples = n_samples
         self.quantile = quantile
+        self.quantile_method = quantile_method
 
     @classmethod
     def from_params(cls, params):
-        return cls(params.steady_n_samples, params.steady_quantile)
+        return cls(params.steady_n_samples, params.steady_quantile, params.steady_quantile_method)
 
     def forecast_series(self, df: pd.DataFrame, max_weeks: int = 12) -> pd.Series:
         demand = df["TotalDemand"]
@@ -35,7 +37,10 @@ class SteadyForecaster(BaseForecaster):
         if demand.empty or weight.empty or weight.sum() == 0:
             return pd.Series([0] * max_weeks)
 
-        unit = weighted_bootstrap_quantile(demand, weight, self.quantile, self.n_samples)
+        if self.quantile_method == "bootstrap":
+            unit = weighted_bootstrap_quantile(demand, weight, self.quantile, self.n_samples)
+        else:
+            unit = weighted_quantile(demand, weight, self.quantile)
         return pd.Series([unit] * max_weeks)
 
     def forecast(self, df: pd.DataFrame, lead_time_weeks=12):
@@ -87,18 +92,23 @@ class TrendedForecaster(BaseForecaster):
         return cls()
 
     def forecast_series(self, df: pd.DataFrame, max_weeks: int = 12) -> pd.Series:
-        df = df.copy()
-        df["Weeks"] = (df["YearWeek"] - df["YearWeek"].min()).dt.days // 7
+        # 历史已按周补齐，周序号即行号
+        y = df["TotalDemand"].to_numpy(dtype=np.float64)
 
-        X = df[["Weeks"]]
-        y = df["TotalDemand"]
+        if len(y) < 2:
+            return pd.Series([y.mean() if len(y) else 0] * max_weeks)
 
-        if len(X) < 2:
-            return pd.Series([y.mean() if not y.empty else 0] * max_weeks)
+        fit = ols_trend_batch(y)
+        return self.forecast_from_fit({k: v[0] for k, v in fit.items()}, max_weeks)
 
-        model = LinearRegression().fit(X, y)
-        future_weeks = pd.DataFrame({"Weeks": [X["Weeks"].max() + i for i in range(1, max_weeks + 1)]})
-        return pd.Series(model.predict(future_weeks))
+    def forecast_from_fit(self, fit: dict, max_weeks: int = 12) -> pd.Series:
+        """
+        使用预先批量计算的 OLS 结果（slope / intercept / n，见 MRPDataContainer.get_trend_fit）
+        """
+        if fit["n"] < 2:
+            return pd.Series([float(fit["intercept"]) if fit["n"] else 0] * max_weeks)
+        future_weeks = np.arange(fit["n"], fit["n"] + max_weeks, dtype=np.float64)
+        return pd.Series(fit["slope"] * future_weeks + fit["intercept"])
 
     def forecast(self, df: pd.DataFrame, lead_time_weeks=12):
         return self.forecast_series(df, max_weeks=lead_time_weeks)
@@ -118,6 +128,12 @@ class IntermittentForecaster(BaseForecaster):
         result = croston_sba_forecast(df["TotalDemand"].tolist(), self.alpha)
         return pd.Series([result["forecast"]] * max_weeks)
 
+    def forecast_from_croston(self, croston: dict, max_weeks: int = 12) -> pd.Series:
+        """
+        使用预先批量计算的 Croston/SBA 结果（见 MRPDataContainer.get_croston_result）
+        """
+        return pd.Series([float(croston["forecast"])] * max_weeks)
+
     def forecast(self, df: pd.DataFrame, lead_time_weeks=12):
         return self.forecast_series(df, max_weeks=lead_time_weeks)
 
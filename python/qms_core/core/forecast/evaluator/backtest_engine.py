@@ -0,0 +1,358 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from qms_core.core.item.item import Item
+from qms_core.core.forecast.common.demand_matrix import DemandMatrix
+from qms_core.core.forecast.common.demand_store import DemandStore
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.common.forecast_utils import winsorize_matrix
+from qms_core.core.forecast.demand import DemandClassifier, DemandForecaster
+from qms_core.core.forecast.safety_stock import SafetyStockCalculator
+from qms_core.core.common.params.enums import DemandType, ForecastType
+
+# 进程池 worker 内的引擎实例（由 initializer 注入一次，避免每个 origin 重复传输需求矩阵）
+_WORKER_ENGINE: Optional["RollingOriginBacktester"] = None
+
+
+def _init_worker(engine: "RollingOriginBacktester"):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = engine
+
+
+def _run_origin_in_worker(origin: pd.Timestamp) -> pd.DataFrame:
+    return _WORKER_ENGINE.run_origin(origin)
+
+
+class RollingOriginBacktester:
+    """
+    滚动起点回测：多个预测起点 × 全部物料一次完成，指标口径与 ForecastEvaluator 一致
+    - 所有起点共享同一份需求矩阵 / DemandStore；每个起点只截取矩阵前若干列
+    - 每个起点内：批量分类（classify_batch）→ 预测 / 安全库存
+      （复用按起点批量计算的温莎化矩阵、Croston、OLS，不再逐项 preprocess_demand）
+    - 实际值 / 上期 / 去年同期通过累计和差分 O(1) 取窗口合计
+    - 指标（APE / MoM / YoY / Coverage / ForecastScore）对全部 (item, origin) 向量化计算
+    - n_workers > 1 时按起点并行
+    """
+
+    def __init__(self, matrix: DemandMatrix, store: DemandStore, master_dict: Optional[dict] = None,
+                 classifier: Optional[DemandClassifier] = None, forecaster: Optional[DemandForecaster] = None,
+                 safetystock_calculator: Optional[SafetyStockCalculator] = None,
+                 backtest_window_weeks: int = 4, forecast_type=ForecastType.MONTHLY,
+                 analysis_start: Optional[pd.Timestamp] = None, n_workers: int = 1):
+        if matrix.values.dtype != np.float64:
+            matrix = DemandMatrix(matrix.keys, matrix.weeks, matrix.values.astype(np.float64), matrix.start_idx)
+        self.matrix = matrix
+        self.store = store
+        self.master_dict = master_dict or {}
+        self.classifier = classifier or DemandClassifier()
+        self.forecaster = forecaster or DemandForecaster()
+        self.safetystock_calculator = safetystock_calculator or SafetyStockCalculator()
+        self.backtest_window_weeks = backtest_window_weeks
+        self.forecast_type = forecast_type
+        self.analysis_start = pd.Timestamp(analysis_start) if analysis_start is not None else None
+        self.n_workers = max(1, n_workers)
+
+        # 前置 0 列的累计和：任意 [a, b) 列窗口合计 = cum[:, b] - cum[:, a]
+        self._cum = np.zeros((matrix.values.shape[0], matrix.values.shape[1] + 1))
+        np.cumsum(matrix.values, axis=1, out=self._cum[:, 1:])
+
+    @classmethod
+    def from_container(cls, data_container: MRPDataContainer, **kwargs) -> "RollingOriginBacktester":
+        return cls(
+            matrix=data_container.get_demand_matrix(np.float64),
+            store=data_container.demand_store,
+            master_dict=data_container.master_dict,
+            **kwargs,
+        )
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+
+    def run(self, origins) -> pd.DataFrame:
+        """
+        origins: 预测起点列表（自动对齐到所在周周一）。
+        返回每个 (item, origin) 一行，字段与 ForecastEvaluator.result 一致
+        """
+        origins = sorted({self._to_monday(o) for o in origins})
+        if self.n_workers <= 1 or len(origins) <= 1:
+            frames = [self.run_origin(o) for o in origins]
+        else:
+            print(f"⚙️ 回测：{len(origins)} 个起点，{self.n_workers} 进程并行")
+            with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker, initargs=(self,)) as executor:
+                frames = list(executor.map(_run_origin_in_worker, origins))
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def run_origin(self, origin: pd.Timestamp) -> pd.DataFrame:
+        origin = self._to_monday(origin)
+        weeks = self.matrix.weeks
+        last_col = int(weeks.searchsorted(origin, side="right")) - 1
+        if last_col < 0:
+            return pd.DataFrame()
+
+        rows = self._eligible_rows(origin, last_col)
+        if not len(rows):
+            return pd.DataFrame()
+
+        items = self._predict(rows, origin, last_col)
+        if not items:
+            return pd.DataFrame()
+        return self._evaluate(items, origin)
+
+    @staticmethod
+    def summarize(result: pd.DataFrame) -> pd.DataFrame:
+        """
+        按起点汇总：物料数、APE 中位数、覆盖率、平均得分
+        """
+        if result.empty:
+            return pd.DataFrame(columns=["EvalEnd", "Items", "MedianAPE", "CoverageRate", "MeanScore"])
+        return (
+            result.groupby("EvalEnd")
+            .agg(Items=("ITEMNUM", "size"), MedianAPE=("APE", "median"),
+                 CoverageRate=("Covered", "mean"), MeanScore=("ForecastScore", "mean"))
+            .reset_index()
+        )
+
+    @staticmethod
+    def to_evaluation_records(result: pd.DataFrame) -> pd.DataFrame:
+        """
+        取每个物料最近一个起点，转换为 FORECAST_EVALUATION 表结构（主键 ITEMNUM + Warehouse）
+        """
+        if result.empty:
+            return pd.DataFrame()
+        latest = result.sort_values("EvalEnd").groupby(["ITEMNUM", "Warehouse"], sort=False).tail(1)
+        return pd.DataFrame({
+            "ITEMNUM": latest["ITEMNUM"].to_numpy(),
+            "Warehouse": latest["Warehouse"].to_numpy(),
+            "EvalStart": pd.to_datetime(latest["EvalStart"]).dt.date.to_numpy(),
+            "EvalEnd": pd.to_datetime(latest["EvalEnd"]).dt.date.to_numpy(),
+            "BacktestWindow": latest["BacktestWindow"].to_numpy(),
+            "PredictedDemand": latest["PredictedDemand"].to_numpy(),
+            "ActualDemand": latest["ActualDemand"].to_numpy(),
+            "DynamicSafetyStock": latest["DynamicSafetyStock"].to_numpy(),
+            "APE": latest["APE"].to_numpy(),
+            "MoM_Growth": latest["MoM_Growth"].to_numpy(),
+            "YoY_Growth": latest["YoY_Growth"].to_numpy(),
+            "ForecastScore": latest["ForecastScore"].to_numpy(),
+            "Covered": np.where(latest["Covered"].to_numpy(dtype=bool), "Y", "N"),
+            "CoverageGap": latest["CoverageGap"].to_numpy(),
+            "DemandType": latest["DemandType"].astype(str).to_numpy(),
+            "ActivityLevel": latest["ActivityLevel"].astype(str).to_numpy(),
+            "LastUpdated": datetime.now().date(),
+        })
+
+    # ------------------------------------------------------------------
+    # 单个起点
+    # ------------------------------------------------------------------
+
+    def _eligible_rows(self, origin: pd.Timestamp, last_col: int) -> np.ndarray:
+        """
+        截至起点已有历史、且 [analysis_start, origin] 区间内有数据的行（与 ForecastEvaluator 的空结果判定一致）
+        """
+        start_idx = self.matrix.start_idx
+        first_col = start_idx
+        if self.analysis_start is not None:
+            first_col = np.maximum(start_idx, int(self.matrix.weeks.searchsorted(self.analysis_start, side="left")))
+        return np.flatnonzero(first_col <= last_col)
+
+    def _predict(self, rows: np.ndarray, origin: pd.Timestamp, last_col: int) -> list[tuple[int, Item]]:
+        """
+        对截至 origin 的历史执行 分类 → 预测 → 安全库存，返回 [(矩阵行号, item)]
+        """
+        matrix = self.matrix
+        keys = [matrix.keys[r] for r in rows]
+        truncated = DemandMatrix(keys, matrix.weeks[:last_col + 1], matrix.values[rows, :last_col + 1],
+                                 matrix.start_idx[rows])
+
+        # 起点专用容器：历史取完整 DemandStore（各计算器按 max_date 截断），批量拟合基于截断矩阵
+        container = MRPDataContainer([], None, {}, {}, self.master_dict, {}, {}, {})
+        container._demand_store = self.store
+        container._demand_matrices[np.dtype(np.float64).str] = truncated
+
+        items = []
+        for key in keys:
+            item = Item(itemnum=key[0], warehouse=key[1])
+            item.master.load_from_dict(self.master_dict.get(key, {}))
+            container.load_item_demand(item)
+            items.append(item)
+
+        for item in self.classifier.classify_batch(items, truncated, max_date=origin):
+            try:
+                self.classifier.calculate_for_item(item, max_date=origin)
+            except Exception as e:
+                print(f"❌ 回测分类失败：{item.itemnum} @ {item.warehouse} ({origin.date()}): {e}")
+
+        fc_params = self.forecaster.params
+        ss_params = self.safetystock_calculator.params
+        valid = truncated.history_mask()
+        winsorized = {}
+
+        def winsorized_row(i: int, upper: float) -> np.ndarray:
+            if upper not in winsorized:
+                winsorized[upper] = winsorize_matrix(truncated.values, valid, upper)
+            return winsorized[upper][i, truncated.start_idx[i]:]
+
+        results = []
+        for i, (row, item) in enumerate(zip(rows, items)):
+            if not getattr(item.demand_type, "_loaded", False):
+                continue
+            key = (item.itemnum, item.warehouse)
+            demand_type = item.demand_type.demand_type
+            try:
+                fits = {}
+                if demand_type == DemandType.INTERMITTENT:
+                    fits["croston"] = container.get_croston_result(
+                        key, alpha=fc_params.intermittent_alpha, winsor_upper=fc_params.winsor_upper)
+                elif demand_type == DemandType.TRENDED:
+                    fits["trend_fit"] = container.get_trend_fit(key, winsor_upper=fc_params.winsor_upper)
+                else:
+                    fits["preprocessed"] = self._preprocessed_frame(
+                        truncated, i, winsorized_row(i, fc_params.winsor_upper), fc_params.decay_factor)
+                self.forecaster.forecast_item(item, max_date=origin, **fits)
+
+                croston = None
+                if demand_type == DemandType.INTERMITTENT:
+                    croston = container.get_croston_result(
+                        key, alpha=ss_params.intermittent_alpha, winsor_upper=ss_params.winsor_upper)
+                self.safetystock_calculator.calculate_for_item(
+                    item, max_date=origin, croston=croston,
+                    demand_series=winsorized_row(i, ss_params.winsor_upper).tolist()
+                )
+            except Exception as e:
+                print(f"❌ 回测预测失败：{item.itemnum} @ {item.warehouse} ({origin.date()}): {e}")
+                continue
+            results.append((row, item))
+        return results
+
+    @staticmethod
+    def _preprocessed_frame(matrix: DemandMatrix, i: int, demand: np.ndarray, decay: float) -> pd.DataFrame:
+        """
+        与 preprocess_demand(history[<= origin], origin, params) 相同结构的预处理历史
+        """
+        start = matrix.start_idx[i]
+        weeks_ago = np.arange(matrix.values.shape[1] - 1 - start, -1, -1, dtype=np.int64)
+        return pd.DataFrame({
+            "YearWeek": matrix.weeks[start:],
+            "TotalDemand": demand,
+            "WeeksAgo": weeks_ago,
+            "Weight": decay ** weeks_ago,
+        })
+
+    def _evaluate(self, items: list[tuple[int, Item]], origin: pd.Timestamp) -> pd.DataFrame:
+        weeks = self.matrix.weeks
+        window = self.backtest_window_weeks
+        rows = np.array([r for r, _ in items], dtype=np.int64)
+        its = [it for _, it in items]
+
+        monthly = np.array([it.forecast.forecast_monthly or 0 for it in its], dtype=np.float64)
+        if self.forecast_type == ForecastType.MONTHLY:
+            predicted = monthly
+        elif self.forecast_type == ForecastType.QUARTERLY:
+            predicted = monthly * 3
+        else:
+            raise NotImplementedError(f"forecast_type '{self.forecast_type}' 暂未实现")
+        predicted = np.maximum(predicted, 0)
+
+        actual_start = origin
+        actual_end = origin + pd.Timedelta(weeks=window)
+        actual = self._window_sum(rows, actual_start, actual_end)
+        last_period = self._window_sum(rows, origin - pd.Timedelta(weeks=window), origin)
+        last_year = self._window_sum(rows, actual_start - pd.DateOffset(years=1), actual_end - pd.DateOffset(years=1))
+
+        dyn_ss = np.array([it.safetystock.dynamic_safety_stock or 0 for it in its], dtype=np.float64)
+        final_ss = np.array([it.safetystock.final_safety_stock or d for it, d in zip(its, dyn_ss)], dtype=np.float64)
+        service_level = np.array([it.safetystock.recommended_service_level or 0.85 for it in its], dtype=np.float64)
+
+        metrics = score_forecast_batch(predicted, actual, last_period, last_year, dyn_ss)
+
+        eval_start = weeks[self.matrix.start_idx[rows]]
+        if self.analysis_start is not None:
+            eval_start = pd.DatetimeIndex(np.full(len(rows), self.analysis_start.to_datetime64()))
+
+        return pd.DataFrame({
+            "ITEMNUM": [it.itemnum for it in its],
+            "Warehouse": [it.warehouse for it in its],
+            "PredictedDemand": predicted,
+            "ActualDemand": actual,
+            "SamePeriodLastYearDemand": last_year,
+            "LastPeriodDemand": last_period,
+            "YoY_Growth": metrics["YoY_Growth"],
+            "MoM_Growth": metrics["MoM_Growth"],
+            "Error": metrics["Error"],
+            "AbsoluteError": metrics["AbsoluteError"],
+            "APE": metrics["APE"],
+            "ForecastScore": metrics["ForecastScore"],
+            "DemandType": [it.demand_type.demand_type for it in its],
+            "ActivityLevel": [it.demand_type.activity_level for it in its],
+            "ISCST": [it.master.cost for it in its],
+            "CXPPLC": [it.master.plc for it in its],
+            "IDESC": [it.master.idesc for it in its],
+            "EvalStart": eval_start,
+            "EvalEnd": origin,
+            "BacktestWindow": window,
+            "DynamicSafetyStock": dyn_ss,
+            "FinalSafetyStock": final_ss,
+            "ForecastPlusSafety": metrics["ForecastPlusSafety"],
+            "CoverageGap": metrics["CoverageGap"],
+            "Covered": metrics["Covered"],
+            "RecommendedServiceLevel": service_level,
+        })
+
+    def _window_sum(self, rows: np.ndarray, start: pd.Timestamp, end: pd.Timestamp) -> np.ndarray:
+        """
+        YearWeek ∈ [start, end) 的需求合计（累计和差分）
+        """
+        a = int(self.matrix.weeks.searchsorted(start, side="left"))
+        b = int(self.matrix.weeks.searchsorted(end, side="left"))
+        if b <= a:
+            return np.zeros(len(rows))
+        return self._cum[rows, b] - self._cum[rows, a]
+
+    @staticmethod
+    def _to_monday(ts) -> pd.Timestamp:
+        ts = pd.Timestamp(ts).normalize()
+        return ts - pd.Timedelta(days=ts.weekday())
+
+
+def score_forecast_batch(predicted: np.ndarray, actual: np.ndarray, last_period: np.ndarray,
+                         last_year: np.ndarray, dyn_ss: np.ndarray) -> dict:
+    """
+    ForecastEvaluator.evaluate 的评分口径（向量化）：
+    APE / MoM / YoY（无基数为 NaN，MoM / YoY 输出时置 0）、覆盖与加权得分
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        error = predicted - actual
+        absolute_error = np.abs(error)
+        ape = np.where(actual > 0, absolute_error / actual, np.nan)
+        mom = np.where(last_period > 0, (actual - last_period) / last_period, 0.0)
+        yoy = np.where(last_year > 0, (actual - last_year) / last_year, 0.0)
+
+        coverage = predicted + dyn_ss
+        is_covered = actual <= coverage
+        coverage_gap = coverage - actual
+
+        ape_score = np.where(np.isnan(ape), 0.0, 1 / (1 + ape))
+        trend_score = 1 / (1 + np.abs(mom) + np.abs(yoy))
+        coverage_score = np.where(is_covered, 1.0, np.maximum(0.5, 1 - np.abs(coverage_gap) / (actual + 1e-6)))
+        over_penalty = np.maximum(0, (predicted - actual) / (actual + 1e-6))
+        over_penalty_score = np.maximum(0.5, 1 - over_penalty)
+
+    score = np.round(ape_score * 0.4 + trend_score * 0.2 + coverage_score * 0.2 + over_penalty_score * 0.2, 3)
+    return {
+        "Error": error,
+        "AbsoluteError": absolute_error,
+        "APE": ape,
+        "MoM_Growth": mom,
+        "YoY_Growth": yoy,
+        "ForecastPlusSafety": coverage,
+        "Covered": is_covered,
+        "CoverageGap": coverage_gap,
+        "ForecastScore": score,
+    }
@@ -7,7 +7,8 @@ from .strategies import (
     TrendedSafetyStockStrategy,
     IntermittentSafetyStockStrategy,
     BurstSafetyStockStrategy,
-    DefaultSafetyStockStrategy
+    DefaultSafetyStockStrategy,
+    SafetyStockBatch
 )
 
 __all__ = [
@@ -19,5 +20,6 @@ __all__ = [
     "TrendedSafetyStockStrategy",
     "IntermittentSafetyStockStrategy",
     "BurstSafetyStockStrategy",
-    "DefaultSafetyStockStrategy"
+    "DefaultSafetyStockStrategy",
+    "SafetyStockBatch"
 ]
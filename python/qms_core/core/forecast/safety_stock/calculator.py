@@ -1,10 +1,14 @@
 import numpy as np
 import pandas as pd
-from qms_core.core.forecast.common.forecast_utils import preprocess_demand,score_service_level
+from scipy.stats import norm
+from qms_core.core.forecast.common.forecast_utils import (
+    preprocess_demand, score_service_level, score_service_level_batch, winsorize_matrix, croston_sba_batch
+)
 from qms_core.core.common.params.ParasCenter import ParasCenter
 from qms_core.core.common.params.SafetyStockParams import SafetyStockParamsSchema
 from qms_core.core.common.params.enums import DemandType, ActivityLevel
 from qms_core.core.forecast.safety_stock.registry import SafetyStockMethodRegistry
+from qms_core.core.forecast.safety_stock.strategies import SafetyStockBatch
 
 class SafetyStockCalculator:
     def __init__(self, params: SafetyStockParamsSchema = None):
@@ -14,7 +18,7 @@ class SafetyStockCalculator:
     def preprocess_demand(self, df: pd.DataFrame, max_date=None) -> pd.DataFrame:
         return preprocess_demand(df, max_date, self.params)
 
-    def calculate_for_item(self, item, demand_series=None, max_date=None) -> dict:
+    def calculate_for_item(self, item, demand_series=None, max_date=None, croston: dict = None) -> dict:
         demand_type = item.demand_type.demand_type
         activity_level = item.demand_type.activity_level
 
@@ -27,9 +31,9 @@ class SafetyStockCalculator:
             item.safetystock.set_values(result)
             return result
 
-        # 自动读取原始需求
+        # 自动读取原始需求（与分类 / 预测一致，只使用 max_date 及之前的历史）
         if demand_series is None and hasattr(item, "demand") and hasattr(item.demand, "history"):
-            raw_df = item.demand.history
+            raw_df = self._history_until(item.demand.history, max_date)
             demand_df = self.preprocess_demand(raw_df, max_date)
             demand_series = demand_df["TotalDemand"].tolist()
         else:
@@ -44,17 +48,203 @@ class SafetyStockCalculator:
         # 获取策略类
         strategy = self.registry.get_method(demand_type)
 
-        result = strategy.calculate(
-            forecast_series=item.forecast.forecast_series,
-            service_level=service_level,
-            lead_time_weeks=lead_time_weeks,
-            manual_ss=item.master.safety_stock,
-            demand_series=demand_series
-        )
+        # 已有共享的 Croston/SBA 结果时直接复用
+        if croston is not None and hasattr(strategy, "calculate_from_croston"):
+            result = strategy.calculate_from_croston(
+                croston=croston,
+                service_level=service_level,
+                lead_time_weeks=lead_time_weeks,
+                manual_ss=item.master.safety_stock,
+                demand_series=demand_series
+            )
+        else:
+            result = strategy.calculate(
+                forecast_series=item.forecast.forecast_series,
+                service_level=service_level,
+                lead_time_weeks=lead_time_weeks,
+                manual_ss=item.master.safety_stock,
+                demand_series=demand_series
+            )
 
         item.safetystock.set_values(result)
         return result
     
+    def calculate_batch(self, items: list, data_container, max_date=None) -> list:
+        """
+        批量计算安全库存：基于容器共享的需求矩阵 / 预处理结果 / Croston 结果，
+        按策略分组做数组运算，逐项结果与 calculate_for_item 一致。
+
+        返回未能批量处理的 item（预测序列缺失、策略未实现 calculate_batch 等），由调用方逐项计算
+        """
+        skipped, batch_items, fallback = self.split_batch_items(items)
+        for item in skipped:
+            item.safetystock.set_values(self.skipped_result(item))
+        if not batch_items:
+            return fallback
+
+        batch = self.build_batch(batch_items, data_container, max_date)
+        results, done = self.evaluate_batch(self.group_by_strategy(batch_items), batch)
+        for i, item in enumerate(batch_items):
+            if done[i]:
+                item.safetystock.set_values({name: values[i] for name, values in results.items()})
+            else:
+                fallback.append(item)
+        return fallback
+
+    def split_batch_items(self, items: list) -> tuple[list, list, list]:
+        """
+        划分为 (跳过计算的 item, 可批量计算的 item, 需逐项计算的 item)
+        """
+        skipped, batch_items, fallback = [], [], []
+        for item in items:
+            demand_type = item.demand_type.demand_type
+            activity_level = item.demand_type.activity_level
+            if demand_type in [DemandType.SINGLE, DemandType.NEW] or activity_level in [ActivityLevel.DORMANT, ActivityLevel.INACTIVE]:
+                skipped.append(item)
+            elif isinstance(getattr(item.forecast, "forecast_series", None), pd.Series):
+                batch_items.append(item)
+            else:
+                fallback.append(item)
+        return skipped, batch_items, fallback
+
+    @staticmethod
+    def skipped_result(item) -> dict:
+        return {
+            "RecommendedServiceLevel": None,
+            "DynamicSafetyStock": 0.0,
+            "FinalSafetyStock": item.master.safety_stock or 0.0
+        }
+
+    def group_by_strategy(self, items: list) -> list:
+        """
+        按策略实例分组，返回 [(strategy, 行号数组)]
+        """
+        groups = {}
+        for i, item in enumerate(items):
+            strategy = self.registry.get_method(item.demand_type.demand_type)
+            groups.setdefault(type(strategy), (strategy, []))[1].append(i)
+        return [(strategy, np.asarray(rows)) for strategy, rows in groups.values()]
+
+    @staticmethod
+    def evaluate_batch(groups: list, batch: SafetyStockBatch) -> tuple[dict, np.ndarray]:
+        """
+        对各策略分组执行 calculate_batch，返回与 batch 行对齐的结果数组，以及标记已批量计算行的掩码
+        """
+        n = len(batch)
+        results = {
+            "RecommendedServiceLevel": np.full(n, None, dtype=object),
+            "DynamicSafetyStock": np.zeros(n),
+            "FinalSafetyStock": np.zeros(n),
+        }
+        done = np.zeros(n, dtype=bool)
+        for strategy, rows in groups:
+            try:
+                result = strategy.calculate_batch(batch.take(rows))
+            except NotImplementedError:
+                continue
+            for name, values in result.items():
+                results[name][rows] = values
+            done[rows] = True
+        return results, done
+
+    def build_batch(self, items: list, data_container, max_date=None) -> SafetyStockBatch:
+        """
+        构建 SafetyStockBatch（预测矩阵、服务水平 / Z、周交期、需求标准差、Croston 结果），行与 items 对齐
+        """
+        n = len(items)
+
+        # 预测矩阵（NaN 补齐）
+        series = [np.asarray(item.forecast.forecast_series, dtype=np.float64) for item in items]
+        forecast_len = np.array([len(s) for s in series], dtype=np.int64)
+        forecast = np.full((n, max(int(forecast_len.max()), 1)), np.nan)
+        for i, s in enumerate(series):
+            forecast[i, :len(s)] = s
+
+        # 预处理需求（与 preprocess_demand 一致，max_date 截断时重新温莎化）
+        params = self.params
+        matrix = data_container.get_demand_matrix(np.float64)
+        if max_date is None:
+            demand = data_container.get_preprocessed_demand(params.winsor_upper)
+            croston_all = data_container.get_croston_batch(params.intermittent_alpha, params.winsor_upper)
+            n_cols = demand.shape[1]
+        else:
+            n_cols = int(matrix.weeks.searchsorted(max_date, side="right"))
+            demand = winsorize_matrix(matrix.values[:, :n_cols], matrix.history_mask()[:, :n_cols], params.winsor_upper)
+            croston_all = croston_sba_batch(demand, params.intermittent_alpha, matrix.start_idx)
+
+        rows = np.array([matrix.key_index.get((item.itemnum, item.warehouse), -1) for item in items], dtype=np.int64)
+        found = rows >= 0
+        start = np.where(found, matrix.start_idx[np.maximum(rows, 0)] if len(matrix.keys) else 0, n_cols)
+        history_len = np.maximum(n_cols - start, 0)
+
+        demand_std = np.full(n, np.nan)
+        for s in np.unique(start[history_len > 1]):
+            sel = np.flatnonzero((start == s) & (history_len > 1))
+            demand_std[sel] = np.std(demand[rows[sel], s:], axis=1, ddof=1)
+
+        croston = {
+            "p_hat": np.ones(n),
+            "n_demands": np.zeros(n, dtype=np.int64),
+            "z_std": np.full(n, np.nan),
+        }
+        for name, values in croston.items():
+            values[found] = croston_all[name][rows[found]]
+
+        # 服务水平 / Z / 周交期
+        service_level = self._service_level_batch(items)
+        recommended = np.array([round(sl, 4) for sl in service_level], dtype=np.float64)
+        service_level = np.asarray(service_level, dtype=np.float64)
+
+        return SafetyStockBatch(
+            forecast=forecast,
+            forecast_len=forecast_len,
+            service_level=service_level,
+            recommended_service_level=recommended,
+            z=norm.ppf(service_level),
+            lead_time_weeks=np.array([self._calc_lead_time_weeks(item) for item in items], dtype=np.int64),
+            manual_ss=np.array([item.master.safety_stock or 0 for item in items], dtype=np.float64),
+            history_len=history_len,
+            demand_std=demand_std,
+            croston=croston,
+        )
+
+    def _service_level_batch(self, items: list) -> list:
+        """
+        逐项服务水平：主数据指定值原样保留，其余统一批量打分
+        """
+        return self.score_service_levels(self.service_level_inputs(items))
+
+    def service_level_inputs(self, items: list) -> dict:
+        """
+        服务水平打分输入：主数据指定值（None 表示需要打分）与 cost / wlead / CV 数组
+        """
+        def _num(value):
+            return np.nan if value is None else value
+
+        return {
+            "manual": [getattr(item.master, "service_level", None) for item in items],
+            "cost": np.array([_num(item.master.cost) for item in items], dtype=np.float64),
+            "wlead": np.array([_num(self._service_level_wlead(item)) for item in items], dtype=np.float64),
+            "cv": np.array([_num(item.demand_type.metrics.get("CV")) for item in items], dtype=np.float64),
+        }
+
+    def score_service_levels(self, inputs: dict, params=None) -> list:
+        """
+        由 service_level_inputs 计算服务水平；params 缺省为 self.params.service_level（场景分析时可替换）
+        """
+        service_level = list(inputs["manual"])
+        pending = np.array([svc is None for svc in service_level], dtype=bool)
+        if pending.any():
+            scores = score_service_level_batch(
+                iscst=inputs["cost"][pending],
+                wlead=inputs["wlead"][pending],
+                cv=inputs["cv"][pending],
+                params=params or self.params.service_level
+            )
+            for i, score in zip(np.flatnonzero(pending), scores):
+                service_level[i] = score
+        return service_level
+
     def calculate_with_strategy(self, item, strategy_name: str, max_date=None, demand_series=None) -> dict:
         """
         使用指定的策略（忽略 item.demand_type），手动计算安全库存。
@@ -72,7 +262,7 @@ class SafetyStockCalculator:
         strategy = self.registry.get_method(strategy_name)
 
         if demand_series is None and hasattr(item, "demand") and hasattr(item.demand, "history"):
-            raw_df = item.demand.history
+            raw_df = self._history_until(item.demand.history, max_date)
             demand_df = preprocess_demand(raw_df, max_date, self.params)
             demand_series = demand_df["TotalDemand"].tolist()
 
@@ -90,10 +280,22 @@ class SafetyStockCalculator:
         item.safetystock.set_values(result)
         return result
     
+    @staticmethod
+    def _history_until(df: pd.DataFrame, max_date) -> pd.DataFrame:
+        if max_date is None or df is None or df.empty:
+            return df
+        return df[df["YearWeek"] <= max_date]
+
     def _calc_lead_time_weeks(self, item) -> int:
         raw_wlead = getattr(item.master, "lead_time", 7) or 7
         return max(1, int(np.ceil(raw_wlead / 7)))
     
+    def _service_level_wlead(self, item):
+        """
+        服务水平打分所用的交期（天）
+        """
+        return item.master.lead_time
+
     def _get_service_level(self, item) -> float:
         svc = getattr(item.master, "service_level", None)
 
@@ -101,7 +303,7 @@ class SafetyStockCalculator:
             return svc
         return score_service_level(
             iscst=item.master.cost,
-            wlead=item.master.lead_time,
+            wlead=self._service_level_wlead(item),
             cv=item.demand_type.metrics.get("CV"),
             params=self.params.service_level
     )
\ No newline at end of file
@@ -1,5 +1,4 @@
 from qms_core.core.forecast.safety_stock.calculator import SafetyStockCalculator
-from qms_core.core.forecast.common.forecast_utils import score_service_level
 
 class DynamicSafetyStockCalculator(SafetyStockCalculator):
     """
@@ -21,19 +20,20 @@ class DynamicSafetyStockCalculator(SafetyStockCalculator):
         # 最终回退至静态逻辑
         return super()._calc_lead_time_weeks(item)
 
-    def _get_service_level(self, item) -> float:
-        svc = getattr(item.master, "service_level", None)
-        if svc is not None:
-            return svc
+    def _service_level_wlead(self, item):
+        return getattr(item.smart_leadtime, "total_days", None)
 
-        wlead_days = getattr(item.smart_leadtime, "total_days", None)
-        if wlead_days is None:
+    def _get_service_level(self, item) -> float:
+        if getattr(item.master, "service_level", None) is None and self._service_level_wlead(item) is None:
             # raise ValueError(f"[DynamicSafetyStockCalculator] 无法获取交期信息：{item.itemnum}-{item.warehouse}")
             print("[Servicelevel Calculator]:NO VALID LEADTIME DATA")
+        return super()._get_service_level(item)
 
-        return score_service_level(
-            iscst=item.master.cost,
-            wlead=wlead_days,
-            cv=item.demand_type.metrics.get("CV"),
-            params=self.params.service_level
-        )
\ No newline at end of file
+    def _service_level_batch(self, items: list) -> list:
+        missing = sum(
+            1 for item in items
+            if getattr(item.master, "service_level", None) is None and self._service_level_wlead(item) is None
+        )
+        if missing:
+            print(f"[Servicelevel Calculator]:NO VALID LEADTIME DATA × {missing}")
+        return super()._service_level_batch(items)
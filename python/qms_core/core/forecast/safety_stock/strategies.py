@@ -1,11 +1,98 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
 import pandas as pd
 import numpy as np
 from scipy.stats import norm
-from sklearn.linear_model import LinearRegression
-from qms_core.core.forecast.common.forecast_utils import croston_safety_stock, croston_sba_forecast
+from qms_core.core.forecast.common.forecast_utils import croston_safety_stock, croston_sba_forecast, ols_trend_batch
 from qms_core.core.common.params.enums import DemandType
 
+# === 批量输入 ===
+
+@dataclass
+class SafetyStockBatch:
+    """
+    一组 item 的安全库存批量输入（各数组按行对齐）
+    - forecast: (n × H) 预测矩阵，超出各自序列长度的位置为 NaN；forecast_len: 各行预测序列长度
+    - service_level / recommended_service_level / z: 服务水平、输出用的四舍五入值与 norm.ppf 结果
+    - lead_time_weeks: 周交期；manual_ss: 手工安全库存（缺失按 0）
+    - history_len / demand_std: 预处理后需求序列长度与样本标准差（ddof=1，不足两点为 NaN）
+    - croston: 共享的 Croston/SBA 结果（p_hat / n_demands / z_std），Intermittent 使用
+    """
+    forecast: np.ndarray
+    forecast_len: np.ndarray
+    service_level: np.ndarray
+    recommended_service_level: np.ndarray
+    z: np.ndarray
+    lead_time_weeks: np.ndarray
+    manual_ss: np.ndarray
+    history_len: np.ndarray
+    demand_std: np.ndarray
+    croston: Optional[dict] = None
+
+    def __len__(self) -> int:
+        return len(self.forecast_len)
+
+    def take(self, idx: np.ndarray) -> "SafetyStockBatch":
+        return SafetyStockBatch(
+            forecast=self.forecast[idx],
+            forecast_len=self.forecast_len[idx],
+            service_level=self.service_level[idx],
+            recommended_service_level=self.recommended_service_level[idx],
+            z=self.z[idx],
+            lead_time_weeks=self.lead_time_weeks[idx],
+            manual_ss=self.manual_ss[idx],
+            history_len=self.history_len[idx],
+            demand_std=self.demand_std[idx],
+            croston=None if self.croston is None else {k: v[idx] for k, v in self.croston.items()},
+        )
+
+
+def _rows_by_width(widths: np.ndarray):
+    """
+    按窗口宽度分组，组内切片等宽，逐行结果与逐项计算完全一致
+    """
+    for w in np.unique(widths):
+        yield int(w), np.flatnonzero(widths == w)
+
+
+def _window_std_batch(forecast: np.ndarray, forecast_len: np.ndarray, window: np.ndarray) -> np.ndarray:
+    """
+    forecast_series[:window].std(ddof=1) 的批量版本（跳过 NaN；窗口长度 ≤ 1 记 0）
+    """
+    widths = np.minimum(window, forecast_len)
+    std = np.zeros(len(widths))
+    for w, rows in _rows_by_width(widths):
+        if w <= 1:
+            continue
+        sub = forecast[rows, :w]
+        valid = ~np.isnan(sub)
+        count = valid.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg = np.where(valid, sub, 0.0).sum(axis=1) / count
+            sqr = np.where(valid, (avg[:, None] - sub) ** 2, 0.0)
+            std[rows] = np.where(count > 1, np.sqrt(sqr.sum(axis=1) / (count - 1)), np.nan)
+    return std
+
+
+def _fallback_demand_std(std: np.ndarray, batch: SafetyStockBatch) -> np.ndarray:
+    """
+    预测波动为 0 且有需求历史时，改用历史需求标准差
+    """
+    return np.where((std == 0) & (batch.history_len > 0), batch.demand_std, std)
+
+
+def _batch_result(dynamic_ss: np.ndarray, batch: SafetyStockBatch, final_basis: np.ndarray = None) -> dict:
+    """
+    FinalSafetyStock = max(动态安全库存, 手工安全库存)，NaN 的处理与内置 max 一致
+    """
+    basis = dynamic_ss if final_basis is None else final_basis
+    return {
+        "RecommendedServiceLevel": batch.recommended_service_level,
+        "DynamicSafetyStock": dynamic_ss,
+        "FinalSafetyStock": np.where(batch.manual_ss > basis, batch.manual_ss, basis),
+    }
+
 # === 抽象基类 ===
 
 class BaseSafetyStockStrategy(ABC):
@@ -27,6 +114,13 @@ class BaseSafetyStockStrategy(ABC):
         """
         pass
 
+    def calculate_batch(self, batch: SafetyStockBatch) -> dict:
+        """
+        批量版本：返回与 calculate 同名字段的数组，逐行结果与 calculate 一致。
+        未实现的策略由调用方回落到逐项路径
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} 未实现 calculate_batch()")
+
 # === 各种策略类 ===
 
 class SteadySafetyStockStrategy(BaseSafetyStockStrategy):
@@ -35,6 +129,10 @@ class SteadySafetyStockStrategy(BaseSafetyStockStrategy):
     @classmethod
     def from_params(cls, params): return cls()
 
+    def calculate_batch(self, batch):
+        std = _fallback_demand_std(_window_std_batch(batch.forecast, batch.forecast_len, batch.lead_time_weeks), batch)
+        return _batch_result(np.round(batch.z * std, 2), batch)
+
     def calculate(self, forecast_series, service_level, lead_time_weeks, manual_ss=0.0, demand_series=None):
         window = forecast_series[:lead_time_weeks]
         std = window.std(ddof=1) if len(window) > 1 else 0
@@ -55,6 +153,11 @@ class SeasonalSafetyStockStrategy(BaseSafetyStockStrategy):
     @classmethod
     def from_params(cls, params): return cls()
 
+    def calculate_batch(self, batch):
+        std = _window_std_batch(batch.forecast, batch.forecast_len, batch.lead_time_weeks * 2)
+        std = _fallback_demand_std(std, batch)
+        return _batch_result(np.round(batch.z * std, 2), batch)
+
     def calculate(self, forecast_series, service_level, lead_time_weeks, manual_ss=0.0, demand_series=None):
         window = forecast_series[:lead_time_weeks * 2]
         std = window.std(ddof=1) if len(window) > 1 else 0
@@ -75,15 +178,20 @@ class TrendedSafetyStockStrategy(BaseSafetyStockStrategy):
     @classmethod
     def from_params(cls, params): return cls()
 
+    def calculate_batch(self, batch):
+        std = np.zeros(len(batch))
+        for w, rows in _rows_by_width(np.minimum(batch.lead_time_weeks, batch.forecast_len)):
+            if w >= 2:
+                std[rows] = ols_trend_batch(batch.forecast[rows, :w])["resid_std"]
+        std = _fallback_demand_std(std, batch)
+        return _batch_result(np.round(batch.z * std * np.sqrt(batch.lead_time_weeks), 2), batch)
+
     def calculate(self, forecast_series, service_level, lead_time_weeks, manual_ss=0.0, demand_series=None):
-        y = forecast_series[:lead_time_weeks]
-        X = np.arange(len(y)).reshape(-1, 1)
+        y = np.asarray(forecast_series[:lead_time_weeks], dtype=np.float64)
         if len(y) < 2:
             std = 0
         else:
-            model = LinearRegression().fit(X, y)
-            resid = y - model.predict(X)
-            std = resid.std(ddof=1)
+            std = float(ols_trend_batch(y)["resid_std"][0])
         if std == 0 and demand_series:
             std = np.std(demand_series, ddof=1)
 
@@ -117,7 +225,47 @@ class IntermittentSafetyStockStrategy(BaseSafetyStockStrategy):
         z_list = result.get("z_list", [])
         p_hat = result.get("p_hat", 1)
         dynamic_ss = croston_safety_stock(z_list, p_hat, lead_time_weeks, service_level)
+        return self._finalize(dynamic_ss, p_hat, service_level, lead_time_weeks, manual_ss, demand_series)
 
+    def calculate_from_croston(self, croston, service_level, lead_time_weeks, manual_ss=0.0, demand_series=None):
+        """
+        使用预先批量计算的 Croston/SBA 结果（n_demands / z_std / p_hat），与 calculate 结果一致
+        """
+        if not demand_series:
+            return {
+                "RecommendedServiceLevel": round(service_level, 4),
+                "DynamicSafetyStock": 0.0,
+                "FinalSafetyStock": manual_ss or 0
+            }
+
+        p_hat = float(croston["p_hat"])
+        if croston["n_demands"] <= 1:
+            dynamic_ss = 0
+        else:
+            dynamic_ss = norm.ppf(service_level) * float(croston["z_std"]) * np.sqrt(lead_time_weeks / p_hat)
+        return self._finalize(dynamic_ss, p_hat, service_level, lead_time_weeks, manual_ss, demand_series)
+
+    def calculate_batch(self, batch):
+        """
+        与 calculate_from_croston 一致；FinalSafetyStock 取未四舍五入的动态值比较
+        """
+        croston = batch.croston
+        lead = batch.lead_time_weeks
+        p_hat = croston["p_hat"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dynamic_ss = np.where(croston["n_demands"] <= 1, 0.0, batch.z * croston["z_std"] * np.sqrt(lead / p_hat))
+            refill = (dynamic_ss == 0) & (batch.history_len > 1)
+            dynamic_ss = np.where(
+                refill, np.round(batch.z * batch.demand_std * np.sqrt(lead / np.maximum(p_hat, 1)), 2), dynamic_ss
+            )
+
+        result = _batch_result(np.round(dynamic_ss, 2), batch, final_basis=dynamic_ss)
+        no_history = batch.history_len == 0
+        result["DynamicSafetyStock"] = np.where(no_history, 0.0, result["DynamicSafetyStock"])
+        result["FinalSafetyStock"] = np.where(no_history, batch.manual_ss, result["FinalSafetyStock"])
+        return result
+
+    def _finalize(self, dynamic_ss, p_hat, service_level, lead_time_weeks, manual_ss, demand_series):
         if dynamic_ss == 0 and len(demand_series) > 1:
             z_std = np.std(demand_series, ddof=1)
             Z = norm.ppf(service_level)
@@ -135,6 +283,17 @@ class BurstSafetyStockStrategy(BaseSafetyStockStrategy):
     @classmethod
     def from_params(cls, params): return cls()
 
+    def calculate_batch(self, batch):
+        widths = np.minimum(batch.lead_time_weeks, batch.forecast_len)
+        dynamic_ss = np.zeros(len(batch))
+        for w, rows in _rows_by_width(widths):
+            if w > 0:
+                sub = batch.forecast[rows, :w]
+                peak = np.where(np.isnan(sub), -np.inf, sub).max(axis=1)
+                peak = np.where(np.isnan(sub).all(axis=1), np.nan, peak)
+                dynamic_ss[rows] = np.round(peak * 0.8, 2)
+        return _batch_result(dynamic_ss, batch)
+
     def calculate(self, forecast_series, service_level, lead_time_weeks, manual_ss=0.0, demand_series=None):
         window = forecast_series[:lead_time_weeks]
         dynamic_ss = round(window.max() * 0.8, 2) if len(window) else 0
@@ -145,6 +304,13 @@ class BurstSafetyStockStrategy(BaseSafetyStockStrategy):
         }
 
 class DefaultSafetyStockStrategy(BaseSafetyStockStrategy):
+    def calculate_batch(self, batch):
+        return {
+            "RecommendedServiceLevel": np.full(len(batch), None, dtype=object),
+            "DynamicSafetyStock": np.zeros(len(batch)),
+            "FinalSafetyStock": batch.manual_ss,
+        }
+
     def calculate(self, forecast_series, service_level, lead_time_weeks, manual_ss=0.0, demand_series=None):
         return {
             "RecommendedServiceLevel": None,
@@ -0,0 +1,6 @@
+from .engine import Scenario, ScenarioEngine
+
+__all__ = [
+    "Scenario",
+    "ScenarioEngine"
+]
@@ -0,0 +1,250 @@
+import copy
+import dataclasses
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from scipy.stats import norm
+from typing import Optional
+from qms_core.core.common.base_loader import BaseLoader
+from qms_core.core.common.params.loader_params import LoaderParams
+from qms_core.core.common.params.ParasCenter import ParasCenter, MRPParamsSchema
+from qms_core.core.common.params.SafetyStockParams import ServiceLevelParamsSchema
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.MRP.MRP_calculator import MRPCalculator
+from qms_core.core.forecast.safety_stock import SafetyStockCalculator
+from qms_core.infrastructure.db.models import ItemSafetyRecord, MRPOrder
+
+
+@dataclass
+class Scenario:
+    """
+    一组待评估的参数：MRP 下单规则 + 服务水平打分参数
+    """
+    name: str
+    mrp_params: MRPParamsSchema
+    service_level_params: ServiceLevelParamsSchema
+
+    @classmethod
+    def from_overrides(
+        cls,
+        name: str,
+        mrp: Optional[dict] = None,
+        service_level: Optional[dict] = None,
+        base_mrp: Optional[MRPParamsSchema] = None,
+        base_service_level: Optional[ServiceLevelParamsSchema] = None,
+    ) -> "Scenario":
+        """
+        在基准参数上覆盖部分字段，如 Scenario.from_overrides("moq10", mrp={"min_moq": 10})
+        """
+        base_mrp = base_mrp or ParasCenter().mrp_params
+        base_service_level = base_service_level or ParasCenter().safety_params.service_level
+        return cls(
+            name=name,
+            mrp_params=MRPParamsSchema.model_validate({**base_mrp.model_dump(), **(mrp or {})}),
+            service_level_params=ServiceLevelParamsSchema.model_validate(
+                {**base_service_level.model_dump(), **(service_level or {})}
+            ),
+        )
+
+
+# 进程池 worker 的共享状态（initializer 中设置一次，各场景复用）
+_WORKER_STATE = None
+
+
+def _init_worker(state: dict):
+    global _WORKER_STATE
+    _WORKER_STATE = state
+
+
+def _evaluate_in_worker(scenario: Scenario) -> dict:
+    return _evaluate_scenario(_WORKER_STATE, scenario)
+
+
+def _evaluate_scenario(state: dict, scenario: Scenario) -> dict:
+    """
+    单个场景：服务水平重新打分 → 批量安全库存 → 替换头寸中的安全库存 → MRP 净需求 / MOQ / WLOTS
+    """
+    calculator: SafetyStockCalculator = state["calculator"]
+    batch = state["batch"]
+    positions = state["positions"].copy()
+    cost = state["cost"]
+
+    # 安全库存：仅可批量计算的行随服务水平参数变化，其余沿用基准结果
+    if len(batch):
+        service_level = calculator.score_service_levels(state["service_level_inputs"], scenario.service_level_params)
+        recommended = np.array([round(sl, 4) for sl in service_level], dtype=np.float64)
+        service_level = np.asarray(service_level, dtype=np.float64)
+        scenario_batch = dataclasses.replace(
+            batch, service_level=service_level, recommended_service_level=recommended, z=norm.ppf(service_level)
+        )
+        results, done = calculator.evaluate_batch(state["groups"], scenario_batch)
+
+        pos_rows = state["pos_rows"]
+        hit = pos_rows >= 0
+        hit[hit] = done[pos_rows[hit]]
+        for name, values in results.items():
+            column = positions[name].to_numpy(dtype=object if name == "RecommendedServiceLevel" else np.float64, copy=True)
+            column[hit] = values[pos_rows[hit]]
+            positions[name] = column
+
+    orders = MRPCalculator(params=scenario.mrp_params)._postprocess_dataframe(positions.copy())
+    orders["Algorithm"] = f"Scenario:{scenario.name}"
+
+    qty = orders["RecommendedQty"].reindex(positions.index, fill_value=0).to_numpy(dtype=np.float64)
+    final_ss = positions["FinalSafetyStock"].to_numpy(dtype=np.float64)
+    position_after = (positions["AvailableStock"].to_numpy(dtype=np.float64)
+                      + positions["IntransitStock"].to_numpy(dtype=np.float64) + qty)
+    required = positions["Forecast_within_LT"].to_numpy(dtype=np.float64) + final_ss
+    service_level = pd.to_numeric(positions["RecommendedServiceLevel"], errors="coerce")
+
+    ordered = qty > 0
+    metrics = {
+        "Scenario": scenario.name,
+        "Items": len(positions),
+        "OrderCount": int(ordered.sum()),
+        "OrderQty": float(qty.sum()),
+        "TotalOrderValue": float(np.nansum(qty * cost)),
+        "SafetyStockValue": float(np.nansum(final_ss * cost)),
+        "AvgServiceLevel": float(service_level.mean()) if service_level.notna().any() else np.nan,
+        "Coverage": float(np.mean(position_after >= required - 1e-9)) if len(positions) else np.nan,
+    }
+
+    safety = positions[["ITEMNUM", "Warehouse", "RecommendedServiceLevel", "DynamicSafetyStock", "FinalSafetyStock"]].copy()
+    safety["SafetyCalcDate"] = datetime.now()
+    return {"metrics": metrics, "orders": orders, "safety": safety}
+
+
+class ScenarioEngine:
+    """
+    参数场景引擎：数据容器只加载一次，共享的输入（item 组件注入、SafetyStockBatch、服务水平打分输入、
+    MRP 头寸与 Forecast_within_LT）在 prepare 中构建一次，每个场景只重做依赖参数的部分：
+    - 服务水平打分（ServiceLevelParamsSchema）→ Z → 各策略 calculate_batch
+    - MRP 净需求 / MOQ / WLOTS（MRPParamsSchema）
+    返回每个场景一行的对比表；场景互相独立，n_workers > 1 时用进程池并行；只有选定的场景写库
+    """
+    METRIC_COLUMNS = [
+        "Scenario", "Items", "OrderCount", "OrderQty", "TotalOrderValue", "SafetyStockValue", "AvgServiceLevel", "Coverage"
+    ]
+    # 选定场景只替换 Algorithm=Static 的订单，动态 MRP / DRP 订单保留
+    ORDER_LOAD_PARAMS = LoaderParams(
+        only_update_delta=False,
+        exclude_fields=["CalcDate"],
+        write_params={"delete_where": {"Algorithm": ["Static"]}, "upsert": False}
+    )
+
+    def __init__(
+        self,
+        data_container: MRPDataContainer,
+        safety_calculator: Optional[SafetyStockCalculator] = None,
+        mrp_params: Optional[MRPParamsSchema] = None,
+        n_workers: int = 1,
+    ):
+        self.data_container = data_container
+        self.safety_calculator = safety_calculator or SafetyStockCalculator()
+        self.mrp_params = mrp_params or ParasCenter().mrp_params
+        self.n_workers = max(1, n_workers)
+        self.results: dict[str, dict] = {}
+        self._state = None
+
+    def baseline(self, name: str = "baseline") -> Scenario:
+        """
+        当前参数对应的基准场景
+        """
+        return Scenario(name, self.mrp_params, self.safety_calculator.params.service_level)
+
+    def prepare(self) -> "ScenarioEngine":
+        container = self.data_container
+        calculator = self.safety_calculator
+        items = container.items
+
+        for item in items:
+            key = (item.itemnum, item.warehouse)
+            if key in container.forecast_dict:
+                item.forecast.load_from_dict(container.forecast_dict[key])
+            item.master.load_from_dict(container.master_dict.get(key, {}))
+            item.demand_type.load_from_dict(container.demand_type_dict.get(key, {}))
+            item.smart_leadtime.load_from_dict(container.smart_lead_time_dict.get(key, {}))
+
+        # 基准安全库存：跳过项固定，可批量项按基准服务水平计算，其余沿用容器中已有结果
+        skipped, batch_items, _ = calculator.split_batch_items(items)
+        safety_stock_dict = dict(container.safety_stock_dict)
+        for item in skipped:
+            safety_stock_dict[(item.itemnum, item.warehouse)] = calculator.skipped_result(item)
+
+        batch = calculator.build_batch(batch_items, container) if batch_items else None
+        groups = calculator.group_by_strategy(batch_items)
+        if batch_items:
+            results, done = calculator.evaluate_batch(groups, batch)
+            for i in np.flatnonzero(done):
+                item = batch_items[i]
+                safety_stock_dict[(item.itemnum, item.warehouse)] = {name: values[i] for name, values in results.items()}
+
+        # MRP 头寸只依赖库存 / 预测 / 交期，与场景参数无关
+        shared = copy.copy(container)
+        shared.safety_stock_dict = safety_stock_dict
+        positions = MRPCalculator(data_container=shared, params=self.mrp_params).prepare_batch()
+
+        batch_index = {(item.itemnum, item.warehouse): i for i, item in enumerate(batch_items)}
+        keys = list(zip(positions["ITEMNUM"], positions["Warehouse"])) if len(positions) else []
+        cost = np.array([container.master_dict.get(key, {}).get("cost") for key in keys], dtype=np.float64)
+
+        self._state = {
+            "calculator": calculator,
+            "batch": batch if batch_items else [],
+            "groups": groups,
+            "service_level_inputs": calculator.service_level_inputs(batch_items),
+            "positions": positions,
+            "pos_rows": np.array([batch_index.get(key, -1) for key in keys], dtype=np.int64),
+            "cost": cost,
+        }
+        print(f"🧮 ScenarioEngine: {len(items)} 项 item，批量安全库存 {len(batch_items)} 项，MRP 头寸 {len(positions)} 行")
+        return self
+
+    def evaluate(self, scenario: Scenario) -> dict:
+        if self._state is None:
+            self.prepare()
+        result = _evaluate_scenario(self._state, scenario)
+        self.results[scenario.name] = result
+        return result
+
+    def run(self, scenarios: list[Scenario]) -> pd.DataFrame:
+        """
+        评估全部场景，返回对比表（每个场景一行）
+        """
+        names = [scenario.name for scenario in scenarios]
+        if len(set(names)) != len(names):
+            raise ValueError(f"场景名称重复：{names}")
+        if self._state is None:
+            self.prepare()
+
+        if self.n_workers > 1 and len(scenarios) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(self.n_workers, len(scenarios)), initializer=_init_worker, initargs=(self._state,)
+            ) as executor:
+                outputs = list(executor.map(_evaluate_in_worker, scenarios))
+        else:
+            outputs = [_evaluate_scenario(self._state, scenario) for scenario in scenarios]
+
+        for scenario, output in zip(scenarios, outputs):
+            self.results[scenario.name] = output
+        return pd.DataFrame([output["metrics"] for output in outputs], columns=self.METRIC_COLUMNS)
+
+    def persist(self, name: str, config, dry_run: bool = True, session=None) -> dict:
+        """
+        将选定场景的订单写入 MRPOrder、安全库存写入 ItemSafetyRecord：
+        - MRPOrder：先删除全部 Algorithm=Static 的订单再写入本场景订单，Dynamic / DRP / DRP-Dynamic 订单不受影响
+        - ItemSafetyRecord：沿用表默认 LoaderParams
+        """
+        if name not in self.results:
+            raise KeyError(f"场景 {name} 尚未评估")
+        result = self.results[name]
+        orders = result["orders"].copy()
+        orders["Algorithm"] = "Static"
+        return {
+            "orders": BaseLoader(config=config, orm_class=MRPOrder, params=self.ORDER_LOAD_PARAMS).write(orders, dry_run, session),
+            "safety": BaseLoader(config=config, orm_class=ItemSafetyRecord, params=ItemSafetyRecord.__default_loader_params__).write(
+                result["safety"], dry_run, session
+            ),
+        }
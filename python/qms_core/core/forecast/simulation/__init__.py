@@ -0,0 +1,5 @@
+from .inventory_simulator import MonteCarloInventorySimulator
+
+__all__ = [
+    "MonteCarloInventorySimulator"
+]
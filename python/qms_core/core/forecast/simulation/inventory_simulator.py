@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from scipy.stats import norm
+from typing import Optional
+from qms_core.core.common.params.ParasCenter import ParasCenter, MRPParamsSchema
+from qms_core.core.common.params.SimulationParams import SimulationParamsSchema
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.MRP.MRP_calculator import MRPCalculator
+
+
+class MonteCarloInventorySimulator:
+    """
+    Monte Carlo 库存推演：校验安全库存 / 订货策略能否达到目标服务水平
+    - 需求路径：从各物料最近 history_weeks 周的实际周需求中有放回抽样
+    - 交期路径：SmartLeadtime 分布（均值 MeanLeadTime / Q60LeadTime，标准差 LeadTimeStd 或由 Q60 / Q90 反推），
+      无智能交期时使用主数据交期；按天抽样后与 MRP 相同地四舍五入到周（至少 1 周）
+    - 订货策略：与 MRPCalculator 一致，每周检查 库存 + 在途 < Forecast_within_LT + FinalSafetyStock 时，
+      按净需求下单（MOQ / WLOTS 规则同 _postprocess_dataframe），到货周 = 下单周 + 抽样交期
+    - 未满足需求按丢失处理；期初在途在第 1 周到货
+    需求 / 交期路径为 items × paths × weeks 的三维数组，按 chunk_cells 分块生成，
+    每块使用 (seed, 块序号) 派生的随机数流，相同参数下结果可复现
+    """
+    RESULT_COLUMNS = [
+        "ITEMNUM", "Warehouse", "TargetServiceLevel", "ReorderPoint", "FillRate", "StockoutProbability",
+        "PathStockoutProbability", "AvgInventory", "Paths", "HorizonWeeks", "SimDate"
+    ]
+
+    def __init__(
+        self,
+        data_container: MRPDataContainer,
+        params: Optional[SimulationParamsSchema] = None,
+        mrp_params: Optional[MRPParamsSchema] = None,
+    ):
+        self.params = params or ParasCenter().simulation_params
+        self.data_container = data_container
+        self.mrp_calculator = MRPCalculator(data_container=data_container, params=mrp_params)
+        self.mrp_params = self.mrp_calculator.params
+
+    def run(self) -> pd.DataFrame:
+        positions = self.mrp_calculator.prepare_batch()
+        if positions.empty:
+            return pd.DataFrame(columns=self.RESULT_COLUMNS)
+
+        # 无需求历史的物料无法抽样，不参与模拟
+        keys = list(zip(positions["ITEMNUM"], positions["Warehouse"]))
+        history = self.data_container.get_demand_matrix(np.float64)
+        rows, lo, length = self._history_windows(history, keys)
+        keep = length > 0
+        positions, rows, lo, length = positions[keep].reset_index(drop=True), rows[keep], lo[keep], length[keep]
+        keys = [key for key, k in zip(keys, keep) if k]
+        if positions.empty:
+            return pd.DataFrame(columns=self.RESULT_COLUMNS)
+
+        lead_mean, lead_std = self._lead_time_distribution(keys, positions)
+        reorder_point = (positions["Forecast_within_LT"] + positions["FinalSafetyStock"]).to_numpy(dtype=np.float64)
+
+        n_paths, horizon = self.params.n_paths, self.params.horizon_weeks
+        chunk = max(1, self.params.chunk_cells // (n_paths * horizon))
+        metrics = {name: np.empty(len(keys)) for name in (
+            "FillRate", "StockoutProbability", "PathStockoutProbability", "AvgInventory"
+        )}
+        for k, begin in enumerate(range(0, len(keys), chunk)):
+            sl = slice(begin, begin + chunk)
+            rng = np.random.default_rng([self.params.seed, k])
+            demand = self._demand_paths(rng, history.values, rows[sl], lo[sl], length[sl])
+            lead_weeks = self._lead_week_paths(rng, lead_mean[sl], lead_std[sl])
+            result = self._simulate_chunk(positions.iloc[sl], reorder_point[sl], demand, lead_weeks)
+            for name, values in result.items():
+                metrics[name][sl] = values
+
+        out = pd.DataFrame({
+            "ITEMNUM": positions["ITEMNUM"].to_numpy(),
+            "Warehouse": positions["Warehouse"].to_numpy(),
+            "TargetServiceLevel": pd.to_numeric(positions["RecommendedServiceLevel"], errors="coerce").to_numpy(),
+            "ReorderPoint": reorder_point,
+            **metrics,
+        })
+        out["Paths"] = n_paths
+        out["HorizonWeeks"] = horizon
+        out["SimDate"] = datetime.now()
+        return out[self.RESULT_COLUMNS]
+
+    def _history_windows(self, matrix, keys: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        每个 key 在需求矩阵中的行号与抽样窗口 [lo, lo + length)；无历史的 length 为 0
+        """
+        n_cols = matrix.values.shape[1]
+        rows = np.array([matrix.key_index.get(key, -1) for key in keys], dtype=np.int64)
+        start = np.full(len(keys), n_cols, dtype=np.int64)
+        found = rows >= 0
+        start[found] = matrix.start_idx[rows[found]]
+        if self.params.history_weeks is not None:
+            start = np.maximum(start, n_cols - self.params.history_weeks)
+        return rows, start, np.maximum(n_cols - start, 0)
+
+    def _lead_time_distribution(self, keys: list, positions: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """
+        交期（天）的均值与标准差
+        """
+        mean = pd.to_numeric(positions["WLEAD"], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        std = np.zeros(len(keys))
+        if not self.params.use_dynamic_leadtime:
+            return mean, std
+
+        z_spread = norm.ppf(0.9) - norm.ppf(0.6)
+        smart = self.data_container.smart_lead_time_dict
+        for i, key in enumerate(keys):
+            record = smart.get(key)
+            if not record:
+                continue
+            q60, q90 = record.get("Q60LeadTime"), record.get("Q90LeadTime")
+            center = record.get("MeanLeadTime") if pd.notna(record.get("MeanLeadTime")) else q60
+            if center is None or pd.isna(center):
+                continue
+            mean[i] = center
+            if pd.notna(record.get("LeadTimeStd")):
+                std[i] = record["LeadTimeStd"]
+            elif q60 is not None and q90 is not None and pd.notna(q60) and pd.notna(q90):
+                std[i] = max(q90 - q60, 0) / z_spread
+        return mean, std
+
+    def _demand_paths(self, rng, history: np.ndarray, rows: np.ndarray, lo: np.ndarray, length: np.ndarray) -> np.ndarray:
+        """
+        items × paths × weeks 的需求路径（按物料历史窗口有放回抽样）
+        """
+        shape = (len(rows), self.params.n_paths, self.params.horizon_weeks)
+        cols = lo[:, None, None] + (rng.random(shape) * length[:, None, None]).astype(np.int64)
+        return history[rows[:, None, None], cols]
+
+    def _lead_week_paths(self, rng, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+        """
+        items × paths × weeks 的交期路径（周），第 t 周下单使用 [:, :, t]
+        """
+        shape = (len(mean), self.params.n_paths, self.params.horizon_weeks)
+        days = mean[:, None, None] + std[:, None, None] * rng.standard_normal(shape)
+        return np.maximum(np.round(np.clip(days, 0, None) / 7), 1).astype(np.int64)
+
+    def _order_qty(self, net: np.ndarray, moq: np.ndarray, lot_size: np.ndarray) -> np.ndarray:
+        """
+        净需求 → 下单量，规则同 MRPCalculator._postprocess_dataframe
+        """
+        params = self.mrp_params
+        qty = np.clip(net, 0, None)
+        if params.use_moq:
+            qty = np.where(qty > 0, np.maximum(qty, np.maximum(moq, params.min_moq)), qty)
+        if params.use_wlot:
+            rounding = np.ceil if params.round_up_to_wlots else np.round
+            qty = np.where(qty > 0, rounding(qty / lot_size) * lot_size, qty)
+        return np.rint(qty)
+
+    def _simulate_chunk(self, positions: pd.DataFrame, reorder_point: np.ndarray,
+                        demand: np.ndarray, lead_weeks: np.ndarray) -> dict:
+        """
+        逐周推进（每周一次 items × paths 的数组运算）
+        """
+        n_items, n_paths, horizon = demand.shape
+        on_hand = np.repeat(np.clip(positions["AvailableStock"].to_numpy(dtype=np.float64), 0, None)[:, None], n_paths, axis=1)
+        intransit = np.clip(positions["IntransitStock"].to_numpy(dtype=np.float64), 0, None)
+        moq = positions["MOQ"].to_numpy(dtype=np.float64)[:, None]
+        lot_size = positions["LotSize"].replace(0, 1).to_numpy(dtype=np.float64)[:, None]
+        rop = reorder_point[:, None]
+
+        pipeline = np.zeros((n_items, n_paths, horizon + int(lead_weeks.max()) + 1))
+        pipeline[:, :, min(1, horizon - 1)] += intransit[:, None]
+        on_order = np.repeat(intransit[:, None], n_paths, axis=1)
+
+        served_total = np.zeros((n_items, n_paths))
+        stockout_weeks = np.zeros((n_items, n_paths), dtype=np.int64)
+        inventory_total = np.zeros((n_items, n_paths))
+        item_idx, path_idx = np.indices((n_items, n_paths))
+
+        for t in range(horizon):
+            arrival = pipeline[:, :, t]
+            on_hand += arrival
+            on_order -= arrival
+
+            d = demand[:, :, t]
+            served = np.minimum(d, on_hand)
+            on_hand -= served
+            served_total += served
+            stockout_weeks += served < d - 1e-9
+            inventory_total += on_hand
+
+            qty = self._order_qty(rop - on_hand - on_order, moq, lot_size)
+            placed = qty > 0
+            if placed.any():
+                due = t + lead_weeks[:, :, t][placed]
+                pipeline[item_idx[placed], path_idx[placed], due] += qty[placed]
+                on_order += qty
+
+        demand_total = demand.sum(axis=(1, 2))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fill_rate = np.where(demand_total > 0, served_total.sum(axis=1) / demand_total, 1.0)
+        return {
+            "FillRate": fill_rate,
+            "StockoutProbability": stockout_weeks.sum(axis=1) / (n_paths * horizon),
+            "PathStockoutProbability": (stockout_weeks > 0).mean(axis=1),
+            "AvgInventory": inventory_total.sum(axis=1) / (n_paths * horizon),
+        }
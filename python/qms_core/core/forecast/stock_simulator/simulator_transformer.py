@@ -1,4 +1,6 @@
 from qms_core.core.common.base_transformer import BaseTransformer
+from qms_core.core.common.week_calendar import parse_yearweek, yearweek_to_ordinal
+import numpy as np
 import pandas as pd
 
 class StockSimulatorTransformer(BaseTransformer):
@@ -27,4 +29,105 @@ class StockSimulatorTransformer(BaseTransformer):
                 })
 
         result_df = pd.DataFrame(result_rows)
-        return result_df
\ No newline at end of file
+        return result_df
+
+class ColumnarStockSimulatorTransformer(BaseTransformer):
+    """
+    列式库存推演：全部流水按 (ITEMNUM, Warehouse, YearWeek) 排序一次，分组累计和得到逐行 ProjectedStock
+    （逐行结果与 StockSimulatorTransformer 一致：按物料分组、周内保持原始顺序、同样的逐笔累加顺序），
+    并用分段归约给出每个物料的首次缺货周、最低库存、覆盖周数与期末库存
+    """
+    SUMMARY_COLUMNS = ["ITEMNUM", "Warehouse", "FirstStockoutWeek", "MinStock", "WeeksOfCoverage", "EndingStock", "HasStockout"]
+
+    def __init__(self, stockout_level: float = 0.0):
+        super().__init__()
+        self.stockout_level = stockout_level
+
+    def transform(self, data_dict: dict[str, pd.DataFrame]) -> pd.DataFrame:
+        balances, _ = self.simulate(data_dict)
+        return balances
+
+    def simulate(self, data_dict: dict[str, pd.DataFrame]) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        返回 (逐行推演结果, 物料级汇总)
+        """
+        stock_df = data_dict["stock"]
+        transaction_df = data_dict["transaction"]
+        tx = transaction_df[transaction_df["ITEMNUM"].notna() & transaction_df["Warehouse"].notna()]
+        if tx.empty:
+            return (pd.DataFrame(columns=["ITEMNUM", "Warehouse", "YearWeek", "ProjectedStock"]),
+                    pd.DataFrame(columns=self.SUMMARY_COLUMNS))
+
+        # 一次排序：物料 → 仓库 → 周，lexsort 稳定，周内保持原始顺序
+        item_codes, _ = pd.factorize(tx["ITEMNUM"], sort=True)
+        wh_codes, wh_uniques = pd.factorize(tx["Warehouse"], sort=True)
+        yearweek = parse_yearweek(tx["YearWeek"])
+        order = np.lexsort((np.nan_to_num(yearweek, nan=np.inf), wh_codes, item_codes))
+        group = (item_codes.astype(np.int64) * len(wh_uniques) + wh_codes)[order]
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+
+        itemnum = tx["ITEMNUM"].to_numpy()[order]
+        warehouse = tx["Warehouse"].to_numpy()[order]
+        qty = pd.to_numeric(tx["QtyChange"], errors="coerce").to_numpy(dtype=np.float64)[order]
+
+        # 期初库存（重复 key 取最后一条，与 to_dict 一致）计入每组第一笔
+        stock = stock_df.drop_duplicates(["ITEMNUM", "Warehouse"], keep="last")
+        stock_index = pd.MultiIndex.from_arrays([stock["ITEMNUM"], stock["Warehouse"]])
+        hit = stock_index.get_indexer(pd.MultiIndex.from_arrays([itemnum[starts], warehouse[starts]]))
+        initial = np.where(hit >= 0, pd.to_numeric(stock["AVAIL"], errors="coerce").to_numpy(dtype=np.float64)[hit], 0.0)
+        qty[starts] = initial + qty[starts]
+        projected = self._grouped_cumsum(qty, starts)
+
+        balances = pd.DataFrame({
+            "ITEMNUM": itemnum,
+            "Warehouse": warehouse,
+            "YearWeek": tx["YearWeek"].to_numpy()[order],
+            "ProjectedStock": projected,
+        })
+        return balances, self._summarize(balances, starts, yearweek[order])
+
+    @staticmethod
+    def _grouped_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """
+        分组累计和：按组内序号 k 逐列推进，每步对所有长度 > k 的组做一次数组加法，
+        加法顺序与逐笔 stock += QtyChange 完全相同（pandas groupby.cumsum 的补偿求和会产生尾差）
+        """
+        out = values.copy()
+        lengths = np.diff(np.r_[starts, len(values)])
+        by_length = np.argsort(-lengths, kind="stable")
+        sorted_starts, sorted_lengths = starts[by_length], lengths[by_length]
+        for k in range(1, int(lengths.max()) if len(lengths) else 0):
+            active = sorted_starts[:np.searchsorted(-sorted_lengths, -k, side="left")] + k
+            out[active] = out[active - 1] + values[active]
+        return out
+
+    def _summarize(self, balances: pd.DataFrame, starts: np.ndarray, yearweek: np.ndarray) -> pd.DataFrame:
+        """
+        分段归约：MinStock / EndingStock / 首次低于 stockout_level 的周；
+        覆盖周数 = 首次缺货周 − 推演起始周（全体流水最早的周），未缺货时覆盖到该物料最后一周
+        """
+        projected = balances["ProjectedStock"].to_numpy(dtype=np.float64)
+        n = len(projected)
+        ends = np.r_[starts[1:], n] - 1
+        week_no = yearweek_to_ordinal(yearweek)
+        start_week = np.nanmin(week_no)
+
+        below = projected < self.stockout_level
+        first = np.minimum.reduceat(np.where(below, np.arange(n), n), starts)
+        has_stockout = first < n
+        first_idx = np.where(has_stockout, first, ends)
+
+        coverage = (week_no[first_idx] - start_week + np.where(has_stockout, 0, 1)).astype(np.int64)
+        stockout_week = pd.Series(
+            np.where(has_stockout, balances["YearWeek"].to_numpy(dtype=object)[first_idx], None), dtype=object
+        )
+        return pd.DataFrame({
+            "ITEMNUM": balances["ITEMNUM"].to_numpy()[starts],
+            "Warehouse": balances["Warehouse"].to_numpy()[starts],
+            "FirstStockoutWeek": stockout_week,
+            "MinStock": np.minimum.reduceat(projected, starts),
+            "WeeksOfCoverage": coverage,
+            "EndingStock": projected[ends],
+            "HasStockout": has_stockout,
+        })
+
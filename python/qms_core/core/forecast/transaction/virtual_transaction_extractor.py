@@ -5,7 +5,7 @@ from qms_core.infrastructure.db.reader import fetch_orm_data
 from qms_core.core.common.base_extractor import BaseExtractor
 import pandas as pd
 import json
-from qms_core.core.forecast.common.forecast_utils import get_next_n_yearweeks,to_yearweek_int
+from qms_core.core.forecast.common.forecast_utils import get_next_n_yearweeks,to_yearweek_int,parse_yearweek_str_array
 import numpy as np
 
 class VirtualTransactionExtractor(BaseExtractor):
@@ -17,15 +17,8 @@ class VirtualTransactionExtractor(BaseExtractor):
         """
         将 ETA_Week (如 '2025-24W') 转换为整数 YearWeek (如 202524)，用于后续计算。
         """
-        def parse_yearweek_str(yw_str: str):
-            try:
-                year, week = yw_str.replace("W", "").split("-")
-                return int(year) * 100 + int(week)
-            except Exception:
-                return np.nan
-
         df = df.copy()
-        df["YearWeek"] = df["ETA_Week"].apply(parse_yearweek_str).astype("Int64")
+        df["YearWeek"] = pd.array(parse_yearweek_str_array(df["ETA_Week"]), dtype="Float64").astype("Int64")
         return df
     
     def fetch_ETA(self,drop_overdue: bool = True)-> pd.DataFrame:
@@ -40,19 +33,21 @@ class VirtualTransactionExtractor(BaseExtractor):
     def fetch_forecast(self) -> dict[tuple[str, str], pd.Series]:
         df = fetch_orm_data(self.config, ItemForecastRecord)
 
+        # YearWeek 序列只生成一次（例：[202526, 202527, ...]），各物料按预测长度截取
+        today = pd.Timestamp.today()
+        start_date = today - pd.Timedelta(days=today.weekday())
+        yearweeks = []
+
         forecast_dict = {}
-        for _, row in df.iterrows():
-            key = (row["ITEMNUM"], row["Warehouse"])
+        for key, payload in zip(zip(df["ITEMNUM"], df["Warehouse"]), df["ForecastSeriesJSON"]):
             try:
-                values = json.loads(row["ForecastSeriesJSON"])
+                values = json.loads(payload)
                 if not isinstance(values, list) or not values:
                     continue
 
-                # 自动生成 YearWeek 序列
-                today = pd.Timestamp.today()
-                start_date = today - pd.Timedelta(days=today.weekday())
-                yearweeks = get_next_n_yearweeks(start_date, len(values))  # 例：返回 [202526, 202527, ...]
-                series = pd.Series(data=values, index=yearweeks, dtype=float)
+                if len(values) > len(yearweeks):
+                    yearweeks = get_next_n_yearweeks(start_date, len(values))
+                series = pd.Series(data=values, index=yearweeks[:len(values)], dtype=float)
                 forecast_dict[key] = series
 
             except Exception as e:
@@ -1,4 +1,6 @@
 from qms_core.core.common.base_transformer import BaseTransformer
+from qms_core.core.common.week_calendar import yearweek_to_str
+import numpy as np
 import pandas as pd
 
 class VirtualTransactionTransformer(BaseTransformer):
@@ -62,4 +64,70 @@ class VirtualTransactionTransformer(BaseTransformer):
         all_df = all_df.sort_values(by=["ITEMNUM", "Warehouse", "YearWeek"]).reset_index(drop=True)
         all_df["YearWeek"] = all_df["YearWeek"].apply(self._yearweek_int_to_str)
         all_df = self.enforce_column_types(all_df)
-        return all_df
\ No newline at end of file
+        return all_df
+
+class ColumnarVirtualTransactionTransformer(VirtualTransactionTransformer):
+    """
+    VirtualTransactionTransformer 的列式实现，输出（行、顺序、字段类型）与之完全一致：
+    - 预测：各物料序列一次拼接，key 用 np.repeat 展开，全零序列按分段归约剔除
+    - ETA：仅对 ETA 行做 (key, 周, 类型) 汇总（同一周可能有多张 PO）
+    - 两类流水拼成一个 frame 后按 factorize 编码 lexsort 一次；YearWeek 经周维表查找格式化
+    """
+    KEY_COLUMNS = ["ITEMNUM", "Warehouse", "YearWeek", "StockChangeType"]
+
+    def transform(self, data_dict: dict) -> pd.DataFrame:
+        eta_df = self._eta_flows(data_dict["eta"])
+        forecast_df = self._forecast_flows(data_dict["forecast"])
+
+        all_df = pd.concat([eta_df, forecast_df], ignore_index=True)
+        # ETA 的缺失 key 已在汇总时剔除，这里只需剔除无法识别的周
+        all_df = all_df[all_df["YearWeek"].notna()]
+        all_df["YearWeek"] = all_df["YearWeek"].astype(np.int64)
+
+        codes = [pd.factorize(all_df[col], sort=True)[0] for col in self.KEY_COLUMNS]
+        order = np.lexsort(codes[::-1])
+        all_df = all_df.iloc[order].reset_index(drop=True)
+
+        # 预测序列索引重复时（同一 key / 周 / 类型多行）退回分组汇总
+        sorted_codes = [c[order] for c in codes]
+        same = np.logical_and.reduce([c[1:] == c[:-1] for c in sorted_codes]) if len(all_df) > 1 else np.zeros(0, bool)
+        if same.any():
+            all_df = all_df.groupby(self.KEY_COLUMNS, as_index=False).agg({"QtyChange": "sum"})
+
+        all_df["YearWeek"] = yearweek_to_str(all_df["YearWeek"].to_numpy())
+        all_df = self.enforce_column_types(all_df)
+        return all_df
+
+    @classmethod
+    def _eta_flows(cls, eta_df: pd.DataFrame) -> pd.DataFrame:
+        eta_df = eta_df.rename(columns={"InTransitQty": "QtyChange"}).assign(StockChangeType="ETAInbound")
+        eta_df = eta_df[cls.KEY_COLUMNS + ["QtyChange"]]
+        return eta_df.groupby(cls.KEY_COLUMNS, as_index=False).agg({"QtyChange": "sum"})
+
+    @classmethod
+    def _forecast_flows(cls, forecast_dict: dict) -> pd.DataFrame:
+        keys = list(forecast_dict.keys())
+        series = list(forecast_dict.values())
+        lengths = np.fromiter((len(s) for s in series), dtype=np.int64, count=len(series))
+        if not lengths.sum():
+            return pd.DataFrame(columns=cls.KEY_COLUMNS + ["QtyChange"])
+
+        values = np.concatenate([s.values for s in series]).astype(np.float64)
+        weeks = np.concatenate([s.index.values for s in series])
+
+        # 与 (series == 0).all() 一致：空序列与全零序列不输出（NaN 视为非零）
+        starts = np.r_[0, np.cumsum(lengths)[:-1]]
+        nonzero = np.zeros(len(series), dtype=bool)
+        has_rows = lengths > 0
+        nonzero[has_rows] = np.add.reduceat((values != 0).astype(np.int64), starts[has_rows]) > 0
+        row_keep = np.repeat(nonzero, lengths)
+
+        key_idx = np.repeat(np.arange(len(keys)), lengths)[row_keep]
+        return pd.DataFrame({
+            "ITEMNUM": np.array([k[0] for k in keys], dtype=object)[key_idx],
+            "Warehouse": np.array([k[1] for k in keys], dtype=object)[key_idx],
+            "YearWeek": weeks[row_keep],
+            "StockChangeType": "ForecastDemand",
+            # 单行分组求和：NaN → 0，-0.0 → 0.0
+            "QtyChange": np.nan_to_num(-values[row_keep], nan=0.0) + 0.0,
+        })
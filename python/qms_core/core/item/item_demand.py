@@ -91,6 +91,17 @@ class ItemDemand(ItemComponentBase):
 
         self._loaded = True
 
+    def load_from_store(self, store, force_reload=False):
+        """
+        从 DemandStore 中按 key 直接取出已补齐空缺周的历史（与其他 Job 共享同一份数据）
+        """
+        if not force_reload and not self.history.empty:
+            return
+
+        self.history = store.get_history((self.itemnum, self.warehouse))
+        if not self.history.empty:
+            self._loaded = True
+
     def _extra_fields(self) -> dict:
         return {
             "weeks": len(self.history),
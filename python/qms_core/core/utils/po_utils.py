@@ -29,12 +29,11 @@ def generate_virtual_po_sublines(df: pd.DataFrame,
     df['__grp_size'] = df.groupby([po_col, line_col])[line_col].transform('size')
     df['__subline'] = df.groupby([po_col, line_col]).cumcount() + 1
 
-    # 拼接新行号
-    df[new_col] = df.apply(
-        lambda row: f"{row[line_col]}-{row['__subline']}"
-        if row['__grp_size'] > 1 else str(row[line_col]),
-        axis=1
-    )
+    # 拼接新行号（逐元素拼接，避免 apply(axis=1) 逐行构造 Series）
+    df[new_col] = [
+        f"{line}-{sub}" if size > 1 else str(line)
+        for line, sub, size in zip(df[line_col].to_numpy(dtype=object), df['__subline'].to_numpy(), df['__grp_size'].to_numpy())
+    ]
 
     # 清理中间列
     df = df.drop(columns=['__grp_size', '__subline'])
@@ -15,7 +15,14 @@ class MRPConfig:
     未来若迁 PostgreSQL，可在此切换连接串，业务代码零改动。
     """
 
-    def __init__(self, db_path: Optional[str | Path] = None, echo: bool = False):
+    def __init__(
+        self,
+        db_path: Optional[str | Path] = None,
+        echo: bool = False,
+        fetch_mode: str = "orm",
+        fetch_chunk_size: Optional[int] = None,
+        category_strings: bool = False,
+    ):
         project_root = Path(__file__).resolve().parents[3]   # qms/ ← infra/ ← THIS
         default_path = project_root / DEFAULT_DB_REL
         self.db_path: Path = Path(db_path).expanduser() if db_path else default_path
@@ -26,6 +33,14 @@ class MRPConfig:
                                     connect_args={"check_same_thread": False})
         self._SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
 
+        # fetch_orm_data 默认读取方式（调用方无需改代码即可切换）
+        # - fetch_mode: "orm" 逐对象读取 / "columnar" Core select 直接按列组装
+        # - fetch_chunk_size: columnar 模式下 yield_per 分块大小（None 表示一次读取）
+        # - category_strings: columnar 模式下 String 列转为 category
+        self.fetch_mode = fetch_mode
+        self.fetch_chunk_size = fetch_chunk_size
+        self.category_strings = category_strings
+
     # --- public API -------------------------------------------------
 
     def get_sqlite_conn(self) -> sqlite3.Connection:
@@ -31,6 +31,8 @@ def write_dataframe_to_table_by_orm(
     df,
     orm_class,
     delete_before_insert: bool = False,
+    delete_where: dict = None,
+    delete_scope: list = None,
     upsert: bool = False,
     hot_zone_delete: bool = False,
     hot_zone_column: str = None,
@@ -50,6 +52,12 @@ def write_dataframe_to_table_by_orm(
     if delete_before_insert and upsert:
         print("⚠️ 同时启用了 delete_before_insert 和 upsert，系统将自动执行 INSERT 模式。")
         upsert = False
+    if delete_scope:
+        # 按本次写入数据中出现的取值限定删除范围（如 Algorithm），等价于 delete_where
+        delete_where = {**(delete_where or {}), **{col: df[col].dropna().unique().tolist() for col in delete_scope}}
+    if delete_where and upsert:
+        print("⚠️ 同时启用了 delete_where 和 upsert，系统将自动执行 INSERT 模式。")
+        upsert = False
 
     dialect = engine.dialect.name
     if dialect == "sqlite":
@@ -65,6 +73,14 @@ def write_dataframe_to_table_by_orm(
         if delete_before_insert:
             session.query(orm_class).delete()
             print(f"🗑️ 表 {orm_class.__tablename__} 已清空，准备重新插入。")
+        elif delete_where:
+            # 只删除 {列名: 取值列表} 匹配的行（与插入在同一事务内），其余行保留
+            query = session.query(orm_class)
+            for column, values in delete_where.items():
+                values = list(values) if isinstance(values, (list, tuple, set)) else [values]
+                query = query.filter(getattr(orm_class, column).in_(values))
+            deleted = query.delete(synchronize_session=False)
+            print(f"🗑️ 表 {orm_class.__tablename__} 已删除 {deleted} 条 {delete_where} 记录，准备重新插入。")
         elif hot_zone_delete:
             if not hot_zone_column:
                 raise ValueError("⚠️ 开启 hot_zone_delete 时，必须指定 hot_zone_column。")
@@ -256,7 +272,12 @@ class SmartTableWriter:
                 if df2[field].dtype == "object":
                     df2[field] = df2[field].apply(lambda x: x.name if hasattr(x, "value") else x)
 
-                common_dtype = np.result_type(df1[field].dtype, df2[field].dtype)
+                dtype1, dtype2 = df1[field].dtype, df2[field].dtype
+                if isinstance(dtype1, np.dtype) and isinstance(dtype2, np.dtype):
+                    common_dtype = np.result_type(dtype1, dtype2)
+                else:
+                    # pandas 扩展类型（如 pandas 3 的 StringDtype）np.result_type 无法识别：同类型保持，否则统一为 object
+                    common_dtype = dtype1 if dtype1 == dtype2 else object
                 df1[field] = df1[field].astype(common_dtype)
                 df2[field] = df2[field].astype(common_dtype)
         return df1, df2
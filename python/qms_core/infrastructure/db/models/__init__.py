@@ -20,10 +20,10 @@ from .demand_forecast import DemandType, ItemForecastRecord
 from .evaluation import ForecastEvaluation
 
 # === 安全库存相关 ===
-from .safety_stock import ItemSafetyRecord, SAFETY_TRANSFER_LOG
+from .safety_stock import ItemSafetyRecord, SAFETY_TRANSFER_LOG, InventorySimulationRecord
 
 # === MRP 结果输出 ===
-from .mrp_result import MRPOrder
+from .mrp_result import MRPOrder, MRPTimePhasedOrder, DRPTransferProposal
 
 # === 供应商与运输方式 ===
 from .vendor import VendorMaster, VendorTransportStats
@@ -49,6 +49,9 @@ from .item_leadtime_stats import (
 
 from .virtual_transaction import VirtualStockTransaction
 
+# === 增量计算输入指纹 ===
+from .fingerprint import ItemInputFingerprint
+
 # === Changelog ===
 from .change_log import IWI_ChangeLog, IIM_ChangeLog, DemandType_ChangeLog,DemandChangeLog
 
@@ -76,9 +79,12 @@ __all__ = [
     # === 安全库存 ===
     "ItemSafetyRecord",
     "SAFETY_TRANSFER_LOG",
+    "InventorySimulationRecord",
 
     # === MRP 结果 ===
     "MRPOrder",
+    "MRPTimePhasedOrder",
+    "DRPTransferProposal",
 
     # === 供应商与运输 ===
     "VendorMaster",
@@ -104,5 +110,7 @@ __all__ = [
     "DemandType_Changelog",
     "DemandChangeLog",
     # === Virtual Stock Transaction ===
-    "VirtualStockTransaction"
+    "VirtualStockTransaction",
+    # === Input Fingerprint ===
+    "ItemInputFingerprint"
 ]
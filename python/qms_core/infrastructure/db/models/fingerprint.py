@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Date, PrimaryKeyConstraint
+from qms_core.infrastructure.db.models.base import Base
+from qms_core.core.common.params import LoaderParams
+
+class ItemInputFingerprint(Base):
+    """
+    每个 item 的输入指纹（增量模式使用）：
+    各字段为对应输入切片的哈希值，任一变化即视为 dirty 需要重算
+    """
+    __tablename__ = "ITEM_INPUT_FINGERPRINT"
+    __table_args__ = (
+        PrimaryKeyConstraint('ITEMNUM', 'Warehouse'),
+    )
+    __default_loader_params__ = LoaderParams(
+        use_smart_writer=True,
+        key_fields=["ITEMNUM", "Warehouse"],
+        monitor_fields=["DemandHash", "MasterHash", "InventoryHash", "LeadtimeHash", "ReplacementHash", "ParamsHash"],
+        exclude_fields=["FingerprintDate"],
+        enable_logging=False,
+        write_params={"upsert": True}
+    )
+
+    ITEMNUM = Column(String)
+    Warehouse = Column(String)
+    DemandHash = Column(String)        # DEMANDHISTORY_WEEKLY 切片（已含 DPS 母件需求）
+    MasterHash = Column(String)        # IIM / IWI 使用字段
+    InventoryHash = Column(String)     # STKOH_AVAIL（含可用替代件库存）
+    LeadtimeHash = Column(String)      # ITEM_SMART_LEADTIME
+    ReplacementHash = Column(String)   # DPS 替代关系
+    ParamsHash = Column(String)        # 分类 / 预测 / 安全库存参数
+    FingerprintDate = Column(Date)
@@ -13,7 +13,8 @@ class MRPOrder(Base):
         skip_if_unchanged=True,
         exclude_fields=["CalcDate"],
         write_params={
-            "delete_before_insert": True,
+            # 只清空静态 / 动态 MRP 的结果，DRP 订单由 DRPJob 自行维护
+            "delete_where": {"Algorithm": ["Static", "Dynamic"]},
             "upsert": False
         }
     )
@@ -45,4 +46,75 @@ class MRPOrder(Base):
 
     OrderReason = Column(String)
     Algorithm = Column(String)
-    CalcDate = Column(Date)
\ No newline at end of file
+    CalcDate = Column(Date)
+
+class DRPTransferProposal(Base):
+    """
+    DRP 仓间调拨建议：同一物料由富余仓调往缺口仓（TransportMode.INTERNAL），与 MRPOrder 配套
+    """
+    __tablename__ = "DRP_TRANSFER_PROPOSAL"
+    __table_args__ = (
+        PrimaryKeyConstraint('ITEMNUM', 'FromWarehouse', 'ToWarehouse', 'Algorithm'),
+    )
+    __default_loader_params__ = LoaderParams(
+        use_smart_writer=True,
+        only_update_delta=False,
+        skip_if_unchanged=True,
+        exclude_fields=["CalcDate"],
+        write_params={
+            "delete_before_insert": True,
+            "upsert": False
+        }
+    )
+    ITEMNUM = Column(String)
+    FromWarehouse = Column(String)
+    ToWarehouse = Column(String)
+
+    TransferQty = Column(Float)
+    TransportMode = Column(String)
+    LeadTimeDays = Column(Integer)
+
+    SourceSurplus = Column(Float)
+    DestinationShortage = Column(Float)
+
+    Algorithm = Column(String)
+    CalcDate = Column(Date)
+
+class MRPTimePhasedOrder(Base):
+    """
+    分周 MRP 结果：每行为 item × 周的毛需求 / 计划接收 / 预计可用量 / 计划订单
+    """
+    __tablename__ = "MRP_TIME_PHASED"
+    __table_args__ = (
+        PrimaryKeyConstraint('ITEMNUM', 'Warehouse', 'YearWeek', 'Algorithm'),
+    )
+    __default_loader_params__ = LoaderParams(
+        use_smart_writer=True,
+        only_update_delta=False,
+        skip_if_unchanged=True,
+        exclude_fields=["CalcDate"],
+        write_params={
+            # 静态 / 动态分周 MRP 各自只替换本算法的结果
+            "delete_scope": ["Algorithm"],
+            "upsert": False
+        }
+    )
+    ITEMNUM = Column(String)
+    Warehouse = Column(String)
+    YearWeek = Column(String)
+    WeekIndex = Column(Integer)
+
+    GrossRequirement = Column(Float)
+    ScheduledReceipt = Column(Float)
+    OtherFlow = Column(Float)
+    SafetyStock = Column(Float)
+    NetRequirement = Column(Float)
+
+    PlannedReceipt = Column(Float)
+    PlannedRelease = Column(Float)
+    PastDueRelease = Column(Float)
+    ProjectedAvailable = Column(Float)
+
+    LeadWeeks = Column(Integer)
+    Algorithm = Column(String)
+    CalcDate = Column(Date)
@@ -37,4 +37,34 @@ class SAFETY_TRANSFER_LOG(Base):
     CHILD_WSAFE_BEFORE = Column(Float)
     CHILD_WSAFE_AFTER = Column(Float)
     PSCQTY = Column(Float)
-    OPERATOR = Column(String)
\ No newline at end of file
+    OPERATOR = Column(String)
+
+
+class InventorySimulationRecord(Base):
+    """
+    Monte Carlo 库存推演结果：按当前安全库存 / 订货策略模拟的满足率、缺货概率与平均库存，用于校验服务水平
+    """
+    __tablename__ = "ITEM_INVENTORY_SIMULATION"
+    __table_args__ = (
+        PrimaryKeyConstraint('ITEMNUM', 'Warehouse'),
+    )
+    __default_loader_params__ = LoaderParams(
+        use_smart_writer=True,
+        key_fields=["ITEMNUM", "Warehouse"],
+        monitor_fields=["FillRate", "StockoutProbability", "AvgInventory"],
+        exclude_fields=["SimDate"],
+        write_params={"upsert": True},
+        enable_logging=False
+    )
+
+    ITEMNUM = Column(String)
+    Warehouse = Column(String)
+    TargetServiceLevel = Column(Float)
+    ReorderPoint = Column(Float)
+    FillRate = Column(Float)
+    StockoutProbability = Column(Float)
+    PathStockoutProbability = Column(Float)
+    AvgInventory = Column(Float)
+    Paths = Column(Integer)
+    HorizonWeeks = Column(Integer)
+    SimDate = Column(Date)
@@ -1,21 +1,44 @@
+import uuid
+import numpy as np
 import pandas as pd
 from sqlalchemy.inspection import inspect
-from typing import Optional, List, Type
-from sqlalchemy import text
+from typing import Optional, List, Type, Iterable, Iterator, Sequence
+from sqlalchemy import text, select, tuple_, and_, Table, Column, MetaData
+from sqlalchemy import types as sqltypes
+
+# SQLite 旧版本默认的 SQLITE_MAX_VARIABLE_NUMBER，与 bulk_writer.smart_batch_size 保持一致
+SQLITE_MAX_VARIABLES = 999
 
 def fetch_orm_data(
     config,
     orm_class: Type,
     filters: Optional[List] = None,
     columns: Optional[List[str]] = None,
-    session = None
+    session = None,
+    mode: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    category_strings: Optional[bool] = None,
 ) -> pd.DataFrame:
     """
     通用函数：通过 ORM 类获取数据并转为 DataFrame
     - config: MRPConfig 实例
     - orm_class: SQLAlchemy ORM 类
     - filters: 可选的 SQLAlchemy filter 表达式列表
+    - mode: "orm" 逐对象读取 / "columnar" Core select 按列组装，dtype 与 "orm" 模式一致；
+            默认取 config.fetch_mode
+    - chunk_size / category_strings: 仅 columnar 模式，默认取 config 上的同名设置；
+      category_strings=True 时 String 列为 category（唯一与 "orm" 模式 dtype 不同的情况）
     """
+    mode = mode or getattr(config, "fetch_mode", "orm")
+    if mode == "columnar":
+        return fetch_orm_columnar(
+            config, orm_class, filters=filters, columns=columns, session=session,
+            chunk_size=chunk_size if chunk_size is not None else getattr(config, "fetch_chunk_size", None),
+            category_strings=category_strings if category_strings is not None else getattr(config, "category_strings", False),
+        )
+    if mode != "orm":
+        raise ValueError(f"❌ 未知的读取模式: {mode}")
+
     external_session = session is not None
     session = session or config.get_session()
 
@@ -44,6 +67,185 @@ def fetch_orm_data(
     finally:
         if not external_session:
             session.close()
-    
+
+def fetch_orm_columnar(
+    config,
+    orm_class: Type,
+    filters: Optional[List] = None,
+    columns: Optional[List[str]] = None,
+    session = None,
+    chunk_size: Optional[int] = None,
+    category_strings: bool = False,
+) -> pd.DataFrame:
+    """
+    列式读取：Core select 直接把游标行拆成列数组，不构造 ORM 对象。
+    - dtype 与 fetch_orm_data 的 "orm" 模式一致（Float→float64，Integer→int64 / 有空值时 float64，
+      Date→datetime.date 对象，DateTime→datetime64，String→pandas 默认推断的字符串类型），
+      category_strings=True 时 String 列改为 category
+    - chunk_size: 使用 yield_per 分块从游标读取，避免一次性持有全部行元组
+    """
+    columns = _resolve_columns(orm_class, columns)
+    col_data = {c: [] for c in columns}
+    for rows in _iter_row_partitions(config, orm_class, columns, filters, session, chunk_size):
+        for c, values in zip(columns, zip(*rows)):
+            col_data[c].extend(values)
+    return _build_typed_frame(orm_class, columns, col_data, category_strings)
+
+def iter_orm_data(
+    config,
+    orm_class: Type,
+    chunk_size: int = 50000,
+    filters: Optional[List] = None,
+    columns: Optional[List[str]] = None,
+    session = None,
+    category_strings: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    分块迭代读取大表（如 DEMANDHISTORY / PO_DELIVERY_HISTORY_RAW），每块为已设置 dtype 的 DataFrame
+    """
+    columns = _resolve_columns(orm_class, columns)
+    for rows in _iter_row_partitions(config, orm_class, columns, filters, session, chunk_size):
+        yield _build_typed_frame(orm_class, columns, dict(zip(columns, zip(*rows))), category_strings)
+
+def _resolve_columns(orm_class: Type, columns: Optional[List[str]]) -> List[str]:
+    return list(columns) if columns else [c.key for c in inspect(orm_class).mapper.column_attrs]
+
+def _iter_row_partitions(config, orm_class, columns, filters, session, chunk_size) -> Iterator[list]:
+    external_session = session is not None
+    session = session or config.get_session()
+
+    try:
+        stmt = select(*[getattr(orm_class, c) for c in columns])
+        if filters:
+            stmt = stmt.where(*filters)
+        if chunk_size:
+            result = session.execute(stmt.execution_options(yield_per=chunk_size))
+            for rows in result.partitions():
+                yield rows
+        else:
+            rows = session.execute(stmt).all()
+            if rows:
+                yield rows
+    finally:
+        if not external_session:
+            session.close()
+
+def _build_typed_frame(orm_class, columns, col_data: dict, category_strings: bool = False) -> pd.DataFrame:
+    col_types = {attr.key: attr.columns[0].type for attr in inspect(orm_class).mapper.column_attrs}
+    return pd.DataFrame({
+        c: _to_typed_array(list(col_data.get(c, ())), col_types.get(c), category_strings)
+        for c in columns
+    })
+
+def _to_typed_array(values: list, col_type, category_strings: bool = False):
+    """
+    按 ORM 列类型把一列 Python 值转为对应 dtype 的数组，与 "orm" 模式下 pandas 对同一列的推断一致
+    """
+    if values and all(v is None for v in values) and not (isinstance(col_type, sqltypes.String) and category_strings):
+        # 整列为空时 "orm" 模式下 pandas 推断为 object（None）
+        return pd.Series(values, dtype=object)
+    if isinstance(col_type, sqltypes.Float):
+        return np.array([np.nan if v is None else v for v in values], dtype="float64")
+    if isinstance(col_type, (sqltypes.Integer, sqltypes.Boolean)):
+        # 有空值时退化为 float64，与原 ORM 模式下 pandas 的推断一致
+        if any(v is None for v in values):
+            return np.array([np.nan if v is None else v for v in values], dtype="float64")
+        return np.array(values, dtype="bool" if isinstance(col_type, sqltypes.Boolean) else "int64")
+    if isinstance(col_type, sqltypes.String) and category_strings:
+        return pd.Categorical(values)
+    # String（pandas 3 为 str，pandas 2 为 object）/ DateTime（datetime64）/ Date（datetime.date 对象）等
+    # 交给 pandas 推断，与 "orm" 模式从记录构造 DataFrame 时相同
+    return pd.Series(values)
+
+def fetch_orm_data_by_keys(
+    config,
+    orm_class: Type,
+    keys: Iterable,
+    key_columns: Sequence[str] = ("ITEMNUM", "Warehouse"),
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+    strategy: str = "auto",
+    max_params: int = SQLITE_MAX_VARIABLES,
+    session = None
+) -> pd.DataFrame:
+    """
+    按 key 集合把过滤条件下推到 SQL（替代“全表读取 + pandas isin”）
+    - keys: key 元组集合，如 {(ITEMNUM, Warehouse), ...}；单列 key 可直接传标量
+    - key_columns: keys 对应的字段名
+    - columns: 只读取这些字段（默认全部字段）
+    - strategy:
+        "in"         分块 IN 列表，每块变量数不超过 max_params（SQLite 变量上限）
+        "temp_table" 写入临时 key 表后 JOIN，只需一次查询
+        "auto"       key 数量较少时用 "in"，否则用 "temp_table"
+    """
+    key_columns = list(key_columns)
+    columns = list(columns) if columns else [c.key for c in inspect(orm_class).mapper.column_attrs]
+    key_list = list({k if isinstance(k, tuple) else (k,) for k in keys})
+
+    if not key_list:
+        return pd.DataFrame(columns=columns)
+
+    chunk_size = max(1, max_params // len(key_columns))
+    if strategy == "auto":
+        strategy = "in" if len(key_list) <= chunk_size * 10 else "temp_table"
+    if strategy not in ("in", "temp_table"):
+        raise ValueError(f"❌ 未知的 key 过滤策略: {strategy}")
+
+    external_session = session is not None
+    session = session or config.get_session()
+
+    try:
+        orm_columns = [getattr(orm_class, c) for c in columns]
+
+        if strategy == "in":
+            key_expr = (
+                getattr(orm_class, key_columns[0]) if len(key_columns) == 1
+                else tuple_(*[getattr(orm_class, c) for c in key_columns])
+            )
+            rows = []
+            for i in range(0, len(key_list), chunk_size):
+                chunk = key_list[i:i + chunk_size]
+                values = [k[0] for k in chunk] if len(key_columns) == 1 else chunk
+                stmt = select(*orm_columns).where(key_expr.in_(values))
+                if filters:
+                    stmt = stmt.where(*filters)
+                rows.extend(session.execute(stmt).all())
+        else:
+            rows = _select_join_temp_keys(session, orm_class, orm_columns, key_list, key_columns, filters)
+
+        if getattr(config, "fetch_mode", "orm") == "columnar":
+            return _build_typed_frame(
+                orm_class, columns, dict(zip(columns, zip(*rows))),
+                getattr(config, "category_strings", False)
+            )
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    finally:
+        if not external_session:
+            session.close()
+
+def _select_join_temp_keys(session, orm_class, orm_columns, key_list, key_columns, filters=None) -> list:
+    """
+    将 keys 写入当前连接上的 TEMP 表，再与目标表 JOIN 读取；读取完成后删除临时表。
+    """
+    conn = session.connection()
+    table_cols = orm_class.__table__.c
+    tmp = Table(
+        f"_qms_keys_{uuid.uuid4().hex[:8]}",
+        MetaData(),
+        *[Column(c, table_cols[c].type) for c in key_columns],
+        prefixes=["TEMPORARY"],
+    )
+    tmp.create(conn)
+    try:
+        conn.execute(tmp.insert(), [dict(zip(key_columns, k)) for k in key_list])
+        on_clause = and_(*[getattr(orm_class, c) == tmp.c[c] for c in key_columns])
+        stmt = select(*orm_columns).select_from(orm_class.__table__.join(tmp, on_clause))
+        if filters:
+            stmt = stmt.where(*filters)
+        return conn.execute(stmt).all()
+    finally:
+        tmp.drop(conn)
+
 def run_sql(session, sql):
     return session.execute(text(sql))
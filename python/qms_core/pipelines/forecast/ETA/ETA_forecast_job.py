@@ -1,6 +1,6 @@
 from qms_core.core.common.base_job import BaseJobCore
 from qms_core.core.forecast.ETA.extractor import ETAExtractor
-from qms_core.core.forecast.ETA.calculator import ETATransformer
+from qms_core.core.forecast.ETA.calculator import ColumnarETATransformer
 from qms_core.infrastructure.db.models import PO_ETA_Recommendation
 from qms_core.core.forecast.ETA.service import build_mode_predictor
 import pandas as pd
@@ -12,7 +12,7 @@ class ETAForecastJob(BaseJobCore):
     - 输出：PO_ETA_Recommendation
     """
     EXTRACTOR_CLASS = ETAExtractor
-    TRANSFORMER_CLASS = ETATransformer
+    TRANSFORMER_CLASS = ColumnarETATransformer
     TARGET_TABLE = PO_ETA_Recommendation
 
     def __init__(self, config, lead_metric="Q60", predictor=None):
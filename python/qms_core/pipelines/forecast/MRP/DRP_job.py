@@ -0,0 +1,90 @@
+from qms_core.core.forecast.common.item_data_preloader import ItemDataPreloader
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.DRP.calculator import DRPCalculator
+from qms_core.core.forecast.DRP.extractor import DRPExtractor
+from qms_core.core.forecast.DRP.network import WarehouseNetwork
+from qms_core.core.common.base_loader import BaseLoader
+from qms_core.core.common.params.ParasCenter import ParasCenter
+from qms_core.core.common.params.loader_params import LoaderParams
+from qms_core.pipelines.forecast.common import BaseItemJob
+from qms_core.infrastructure.db.models import DRPTransferProposal, MRPOrder
+from qms_core.core.item.item_manager import ItemManager
+from typing import Optional
+import pandas as pd
+
+
+class DRPJob(BaseItemJob):
+    """
+    多仓 DRP Job：
+    - 输入：MRPDataContainer + IWM 仓库网络（INTERNAL 调拨 lane）
+    - 输出：DRPTransferProposal（调拨建议）；冲抵调拨后的供应商订单以 Algorithm=DRP / DRP-Dynamic 写入 MRPOrder，
+      写入前在同一 session 内只删除这两类旧订单，不影响静态 / 动态 MRP 结果
+    """
+    ORDER_ALGORITHMS = ["DRP", "DRP-Dynamic"]
+    ORDER_LOAD_PARAMS = LoaderParams(
+        only_update_delta=False,
+        exclude_fields=["CalcDate"],
+        write_params={"delete_where": {"Algorithm": ORDER_ALGORITHMS}, "upsert": False}
+    )
+
+    def __init__(
+        self,
+        config,
+        data_container: Optional[MRPDataContainer] = None,
+        network: Optional[WarehouseNetwork] = None,
+        calculator: Optional[DRPCalculator] = None,
+        load_params: Optional[LoaderParams] = None,
+    ):
+        super().__init__(config=config, data_container=data_container, load_params=load_params)
+        self.network = network
+        self.calculator = calculator
+        self.transfer_df = None
+        self.order_df = None
+        self.order_loader = BaseLoader(config=config, orm_class=MRPOrder, params=self.ORDER_LOAD_PARAMS)
+
+    def target_table(self):
+        return DRPTransferProposal
+
+    def prepare_items(
+            self,
+            items: Optional[list] = None,
+            item_ids: Optional[list[tuple[str, str]]] = None,
+            **kwargs
+        ):
+        if self.calculator:
+            self.data_container = self.calculator.data_container
+            return self.data_container.items
+
+        if not self.data_container:
+            manager = ItemManager(item_ids) if item_ids else ItemManager.from_demand_history(self.config)
+            preloader = ItemDataPreloader(self.config, manager.items)
+            self.data_container = MRPDataContainer.from_preloader(preloader, manager.items)
+
+        params = ParasCenter().drp_params
+        if self.network is None:
+            self.network = WarehouseNetwork.from_extractor(DRPExtractor(self.config), params)
+        self.calculator = DRPCalculator(self.data_container, self.network, params=params)
+        return self.data_container.items
+
+    def process_items(self, items: list, **kwargs):
+        self.transfer_df, self.order_df = self.calculator.run()
+        print(f"🔁 {self.job_name}: {len(self.network)} 条 lane，调拨建议 {len(self.transfer_df)} 条"
+              f"（{self.transfer_df['TransferQty'].sum() if len(self.transfer_df) else 0:.0f} 件），"
+              f"剩余供应商订单 {len(self.order_df)} 条")
+
+    def _collect_result(self, items: list) -> pd.DataFrame:
+        return self.transfer_df
+
+    def write_result(self, result: pd.DataFrame, dry_run: bool = True, session=None):
+        super().write_result(result, dry_run=dry_run, session=session)
+        if self.order_df is not None and not self.order_df.empty:
+            self.order_loader.write(self.order_df, dry_run, session)
+
+    def _export_core_fields(self, result: pd.DataFrame) -> dict:
+        return {
+            (row["ITEMNUM"], row["Warehouse"]): {
+                "RecommendedQty": row["RecommendedQty"],
+                "OrderReason": row["OrderReason"],
+            }
+            for _, row in self.order_df.iterrows()
+        }
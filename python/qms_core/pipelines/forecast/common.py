@@ -1,18 +1,37 @@
 from abc import ABC, abstractmethod
+import math
 import pandas as pd
-from typing import Optional, Union ,Type 
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union ,Type, Callable
 from qms_core.core.common.base_loader import BaseLoader
 from qms_core.core.common.params.loader_params import LoaderParams
 from qms_core.core.item.item import Item
 from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
 
+def _run_item_chunk(worker: Callable, component: str, chunk: list[tuple[Item, dict]],
+                    chunk_stats: Optional[Callable] = None) -> tuple[list, Optional[dict]]:
+    """
+    进程池 worker：只处理自身分到的 item 切片，回传计算后的子模块，
+    以及 chunk_stats(worker) 汇报的本 chunk 统计（如缓存命中数，未提供时为 None）
+    """
+    results = []
+    for item, item_kwargs in chunk:
+        worker(item, **item_kwargs)
+        results.append(getattr(item, component))
+    return results, (chunk_stats(worker) if chunk_stats else None)
+
+
 class BaseItemJob(ABC):
     """
     面向 item 分析流程的通用 Job 基类。
     结构遵循 ETL 三段：prepare_items (E), process_items (T), write_result (L)
     支持 dry_run、外部缓存注入、统一日志与核心字段导出。
+    支持 n_workers > 1 时按 chunk 使用进程池并行执行逐 item 计算（默认串行，便于调试）。
     """
 
+    # 并行模式下需要从 worker 回传的 item 子模块名（如 "demand_type" / "forecast" / "safetystock"）
+    result_component: Optional[str] = None
+
     def __init__(
         self,
         config,
@@ -20,10 +39,14 @@ class BaseItemJob(ABC):
         data_container: Optional[MRPDataContainer] = None, 
         loader: Optional[BaseLoader] = None,
         load_params: Optional[LoaderParams] = None,
+        n_workers: int = 1,
+        chunk_size: Optional[int] = None,
     ):
         self.config = config
         self.data_container = data_container
         self.job_name = job_name or self.__class__.__name__
+        self.n_workers = max(1, n_workers)
+        self.chunk_size = chunk_size
 
         orm_cls = self.target_table()
 
@@ -87,6 +110,70 @@ class BaseItemJob(ABC):
         """
         pass
 
+    def _item_worker(self) -> Callable:
+        """
+        返回可 pickle 的逐 item 计算函数 worker(item, **item_kwargs)，
+        通常为模块级函数 + functools.partial 绑定 calculator。使用 run_items 的子类需实现。
+        """
+        raise NotImplementedError(f"{self.job_name} 未实现 _item_worker()")
+
+    def _item_kwargs(self, item: Item) -> dict:
+        """
+        每个 item 额外传给 worker 的参数（如容器中预先批量计算的共享结果），默认无
+        """
+        return {}
+
+    def _chunk_stats(self) -> Optional[Callable]:
+        """
+        进程池模式下每个 chunk 结束时在子进程中调用的可 pickle 函数 f(worker) -> dict，
+        用于回传子进程内累计的统计（子进程中的计数不会自动回到父进程），默认无
+        """
+        return None
+
+    def _merge_chunk_stats(self, stats: list[dict]):
+        """
+        父进程汇总各 chunk 的 _chunk_stats 结果，默认忽略
+        """
+        pass
+
+    def run_items(self, items: list[Item]):
+        """
+        逐 item 执行 _item_worker：
+        - n_workers == 1：串行（默认）
+        - n_workers > 1：按 chunk 切分，ProcessPoolExecutor 并行，结果按原顺序写回 item
+        """
+        worker = self._item_worker()
+        if self.n_workers <= 1 or len(items) <= 1:
+            for item in items:
+                worker(item, **self._item_kwargs(item))
+            return
+
+        component = self.result_component
+        if component is None:
+            raise NotImplementedError(f"{self.job_name} 未设置 result_component，无法并行")
+
+        chunk_size = self.chunk_size or max(1, math.ceil(len(items) / (self.n_workers * 4)))
+        chunks = [
+            [(item, self._item_kwargs(item)) for item in items[i:i + chunk_size]]
+            for i in range(0, len(items), chunk_size)
+        ]
+
+        print(f"⚙️ {self.job_name}: {len(items)} 项 → {len(chunks)} 个 chunk，{self.n_workers} 进程并行")
+        chunk_stats = self._chunk_stats()
+        stats = []
+        with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+            results = executor.map(_run_item_chunk, [worker] * len(chunks), [component] * len(chunks), chunks,
+                                   [chunk_stats] * len(chunks))
+            offset = 0
+            for chunk_result, chunk_stat in results:
+                for processed in chunk_result:
+                    setattr(items[offset], f"_{component}", processed)
+                    offset += 1
+                if chunk_stat is not None:
+                    stats.append(chunk_stat)
+        if stats:
+            self._merge_chunk_stats(stats)
+
     @abstractmethod
     def _collect_result(self, items: list) -> Union[pd.DataFrame, dict]:
         """
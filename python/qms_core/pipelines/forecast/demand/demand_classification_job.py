@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from qms_core.core.item.item_manager import ItemManager
 from qms_core.core.forecast.common.item_data_preloader import ItemDataPreloader
 from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
@@ -6,11 +7,23 @@ from qms_core.core.forecast.demand.classifier import DemandClassifier
 from qms_core.infrastructure.db.models import DemandType
 from typing import Optional
 from qms_core.pipelines.forecast.common import BaseItemJob
+from functools import partial
+
+
+def _classify_one(classifier: DemandClassifier, item):
+    try:
+        classifier.calculate_for_item(item)
+    except Exception as e:
+        item.demand_type._loaded = False  # 明确标记为失败
+        print(f"❌ 分类失败 {item.itemnum} @ {item.warehouse}: {e}")
 
 
 class DemandClassificationJob(BaseItemJob):
-    def __init__(self, config,data_container: Optional[MRPDataContainer] = None, classifier: Optional[DemandClassifier] = None):
-        super().__init__(config=config,data_container=data_container)
+    result_component = "demand_type"
+
+    def __init__(self, config,data_container: Optional[MRPDataContainer] = None, classifier: Optional[DemandClassifier] = None,
+                 n_workers: int = 1, chunk_size: Optional[int] = None):
+        super().__init__(config=config,data_container=data_container, n_workers=n_workers, chunk_size=chunk_size)
         self.classifier = classifier or DemandClassifier()
 
     def target_table(self):
@@ -39,18 +52,23 @@ class DemandClassificationJob(BaseItemJob):
         self.master_dict = self.data_container.master_dict
 
         for item in self.data_container.items:
-            item.demand.load_from_df(self.demand_df)
+            self.data_container.load_item_demand(item)
             item.master.load_from_dict(self.master_dict.get((item.itemnum, item.warehouse), {}))
 
         return self.data_container.items
 
     def process_items(self, items: list, **kwargs):
-        for item in items:
-            try:
-                self.classifier.calculate_for_item(item)
-            except Exception as e:
-                item.demand_type._loaded = False  # 明确标记为失败
-                print(f"❌ 分类失败 {item.itemnum} @ {item.warehouse}: {e}")
+        # 容器提供需求矩阵时走批量分类，特殊情况（被替代件 / 无历史）回落到逐项路径
+        if self.data_container is not None and hasattr(self.data_container, "get_demand_matrix"):
+            matrix = self.data_container.get_demand_matrix(np.float64)
+            # 预处理后的需求矩阵缓存在容器中，供下游 Croston / 安全库存复用
+            preprocessed = self.data_container.get_preprocessed_demand(self.classifier.params.winsor_upper)
+            items = self.classifier.classify_batch(items, matrix, preprocessed=preprocessed)
+
+        self.run_items(items)
+
+    def _item_worker(self):
+        return partial(_classify_one, self.classifier)
 
     def _collect_result(self, items: list) -> pd.DataFrame:
         return pd.DataFrame([
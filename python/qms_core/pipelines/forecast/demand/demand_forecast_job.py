@@ -7,11 +7,34 @@ from qms_core.core.forecast.demand.calculator import DemandForecaster
 from qms_core.infrastructure.db.models import ItemForecastRecord
 from qms_core.pipelines.forecast.common import BaseItemJob
 from qms_core.core.item.item import Item
+from qms_core.core.common.params.enums import DemandType
+from functools import partial
+
+
+def _forecast_one(forecaster: DemandForecaster, item: Item, **shared_fits):
+    try:
+        forecaster.forecast_item(item, **shared_fits)
+    except Exception as e:
+        print(f"❌ Forecast 失败：{item.itemnum} @ {item.warehouse}: {e}")
+
+
+def _forecast_cache_stats(worker: partial) -> Optional[dict]:
+    """
+    进程池 chunk 结束时：写回本 chunk 缓存命中的 LastAccess，并回传子进程内的命中 / 未命中 / 写入计数
+    """
+    cache = worker.args[0].cache
+    if cache is None:
+        return None
+    cache.flush_access()
+    return cache.stats()
 
 
 class ForecastGenerationJob(BaseItemJob):
-    def __init__(self, config,data_container: Optional[MRPDataContainer] = None,forecaster: Optional[DemandForecaster] = None):
-        super().__init__(config,data_container=data_container)
+    result_component = "forecast"
+
+    def __init__(self, config,data_container: Optional[MRPDataContainer] = None,forecaster: Optional[DemandForecaster] = None,
+                 n_workers: int = 1, chunk_size: Optional[int] = None):
+        super().__init__(config,data_container=data_container, n_workers=n_workers, chunk_size=chunk_size)
         self.forecaster = forecaster or DemandForecaster()
 
     def target_table(self):
@@ -39,7 +62,7 @@ class ForecastGenerationJob(BaseItemJob):
         self.demand_type_dict = self.data_container.demand_type_dict
 
         for item in self.data_container.items:
-            item.demand.load_from_df(self.demand_df)
+            self.data_container.load_item_demand(item)
             item.demand_type.load_from_dict(self.demand_type_dict.get((item.itemnum, item.warehouse), {}))
 
         return self.data_container.items
@@ -72,11 +95,27 @@ class ForecastGenerationJob(BaseItemJob):
             }
 
     def process_items(self, items: list[Item], **kwargs):
-        for item in items:
-            try:
-                self.forecaster.forecast_item(item)
-            except Exception as e:
-                print(f"❌ Forecast 失败：{item.itemnum} @ {item.warehouse}: {e}")
+        self.run_items(items)
+
+        cache = self.forecaster.cache
+        if cache is not None:
+            evicted = cache.evict()
+            cache.report()
+            if evicted:
+                print(f"🧹 Forecast 缓存淘汰 {evicted} 条")
+
+    def _item_worker(self):
+        return partial(_forecast_one, self.forecaster)
+
+    def _chunk_stats(self):
+        return _forecast_cache_stats if self.forecaster.cache is not None else None
+
+    def _merge_chunk_stats(self, stats: list[dict]):
+        for chunk_stat in stats:
+            self.forecaster.cache.merge_stats(chunk_stat)
+
+    def _item_kwargs(self, item: Item) -> dict:
+        return self._shared_fits(item)
 
     def _collect_result(self, items: list[Item]) -> pd.DataFrame:
         return pd.DataFrame([
@@ -96,4 +135,20 @@ class ForecastGenerationJob(BaseItemJob):
                 "Forecast_monthly": item.forecast.forecast_monthly,
                 "ForecastModel": item.forecast.model_used
             }
-        return export
\ No newline at end of file
+        return export
+
+    def _shared_fits(self, item: Item) -> dict:
+        """
+        Intermittent / Trended 物料复用容器中批量计算的 Croston/SBA、OLS 结果（Croston 与安全库存共享）
+        """
+        if not hasattr(self.data_container, "get_croston_result"):
+            return {}
+        key = (item.itemnum, item.warehouse)
+        params = self.forecaster.params
+        demand_type = item.demand_type.demand_type
+        if demand_type == DemandType.INTERMITTENT:
+            return {"croston": self.data_container.get_croston_result(
+                key, alpha=params.intermittent_alpha, winsor_upper=params.winsor_upper)}
+        if demand_type == DemandType.TRENDED:
+            return {"trend_fit": self.data_container.get_trend_fit(key, winsor_upper=params.winsor_upper)}
+        return {}
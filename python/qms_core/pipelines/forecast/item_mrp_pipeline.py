@@ -7,6 +7,12 @@ from qms_core.pipelines.forecast.safetystock.safety_stock_job import SafetyStock
 from qms_core.pipelines.forecast.MRP.MRP_job import MRPJob
 from qms_core.core.item.item_manager import ItemManager
 from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.common.fingerprint import ItemFingerprinter
+from qms_core.core.forecast.common.forecast_cache import ForecastCache
+from qms_core.core.forecast.demand.calculator import DemandForecaster
+from qms_core.core.common.base_loader import BaseLoader
+from qms_core.infrastructure.db.models import ItemInputFingerprint
+from qms_core.infrastructure.db.reader import fetch_orm_data
 from qms_core.core.forecast.MRP.dynamic_MRP_calculator import  DynamicMRPCalculator
 from qms_core.core.item.item import Item
 from typing import Optional,List
@@ -17,15 +23,22 @@ class SharedMemoryPipeline(BasePipeline):
     """
     在 BasePipeline 基础上扩展：支持 Job 间共享中间结果作为 input_data 注入下游。
     典型应用场景：ITEM → Forecast → Safety → MRP 连续流水线计算。
+    incremental=True 时按输入指纹只重算 dirty item 的 分类 → 预测 → 安全库存，
+    其余 item 复用库中已有结果；MRP 始终基于最新库存全量计算。
     """
 
     DEFAULT_SHARED_KEYS = ["items", "forecast", "safety_stock", "demand_type"]
 
-    def __init__(self, config=None, items: Optional[List[Item]] = None, item_ids: Optional[list[tuple[str, str]]] = None):
+    def __init__(self, config=None, items: Optional[List[Item]] = None, item_ids: Optional[list[tuple[str, str]]] = None,
+                 n_workers: int = 1, incremental: bool = False, forecast_cache: Optional[ForecastCache] = None):
         super().__init__(config)
         self.items = items or []
         self.item_ids = item_ids or []
         self.data_container = None 
+        self.n_workers = n_workers  # 分类 / 预测 / 安全库存 Job 的进程数，1 为串行
+        self.incremental = incremental
+        self.forecast_cache = forecast_cache  # 可选的预测结果缓存
+        self.preloader = None
 
     def prepare_global_items(self) -> List[Item]:
         if not self.items:
@@ -38,6 +51,7 @@ class SharedMemoryPipeline(BasePipeline):
         print("📦 开始加载全局主数据...")
 
         preloader = ItemDataPreloader(self.config, self.items)
+        self.preloader = preloader
 
         self.data_container = MRPDataContainer(
             items=self.items,
@@ -52,40 +66,97 @@ class SharedMemoryPipeline(BasePipeline):
 
         print(f"✅ 主数据加载完成：{len(self.items)} 项物料")
 
+    def plan_incremental(self) -> tuple[MRPDataContainer, object, dict]:
+        """
+        增量计划：
+        - 计算本次输入指纹并与 ITEM_INPUT_FINGERPRINT 对比，得到 dirty item（含 DPS 母件变化的子件）
+        - 库中缺少分类（有需求历史时）/ 预测 / 安全库存结果的 item 同样视为 dirty
+        - clean item 的历史结果预先填入共享 dict，供下游 Job 与 MRP 使用
+        返回 (只含 dirty item 的子容器, 本次全部 item 的指纹 DataFrame, 统计)
+        """
+        fingerprinter = ItemFingerprinter(self.data_container, self.preloader.replacing_map)
+        current = fingerprinter.fingerprint_all()
+
+        ItemInputFingerprint.__table__.create(self.config.get_engine(), checkfirst=True)
+        previous = fetch_orm_data(self.config, ItemInputFingerprint)
+        dirty, reasons = fingerprinter.diff(current, previous)
+
+        demand_type_dict = self.preloader.load_demand_type()
+        forecast_dict = self.preloader.load_forecast_series()
+        safety_dict = self.preloader.load_safety_stock()
+        for item in self.items:
+            key = (item.itemnum, item.warehouse)
+            if key in dirty:
+                continue
+            # 无需求历史的 item 不会产生分类记录
+            missing_type = key in self.data_container.demand_store and key not in demand_type_dict
+            if missing_type or key not in forecast_dict or key not in safety_dict:
+                dirty.add(key)
+                reasons["missing_result"] += 1
+
+        clean_keys = {(item.itemnum, item.warehouse) for item in self.items} - dirty
+        self.data_container.demand_type_dict.update({k: demand_type_dict[k] for k in clean_keys if k in demand_type_dict})
+        self.data_container.forecast_dict.update({k: forecast_dict[k] for k in clean_keys})
+        self.data_container.safety_stock_dict.update({k: safety_dict[k] for k in clean_keys})
+
+        dirty_items = [item for item in self.items if (item.itemnum, item.warehouse) in dirty]
+        stats = {
+            "total": len(self.items),
+            "recomputed": len(dirty_items),
+            "skipped": len(self.items) - len(dirty_items),
+            "reasons": dict(reasons),
+        }
+        print(f"♻️ 增量模式：跳过 {stats['skipped']} 项，重算 {stats['recomputed']} 项 "
+              f"（原因：{stats['reasons'] or '无'}）")
+        return self.data_container.subset(dirty_items), current, stats
+
     def run_all(self, dry_run: bool = False, session=None) -> dict[str, object]:
         print("📦 Step 0: 加载主数据")
         self.items = self.prepare_global_items()
         self.load_global_data()
 
         results = {}
+        chain_container = self.data_container
+        if self.incremental:
+            chain_container, fingerprint_df, results["incremental"] = self.plan_incremental()
+
         with UnitOfWork(self.config) as uow:
-            print("\n🔮 Step 1: Demand Type Classification")
-            classify_job = DemandClassificationJob(config=self.config,data_container=self.data_container)
-            classify_result = classify_job.run(dry_run=dry_run, session=uow.session, return_output=True)
-            results["demand_type"] = classify_result # {"df": demand type classification result dataframe, "core": result dict, "items": proceed items}
-            demand_type_dict = classify_result.get("core",{})
-            self.data_container.demand_type_dict = demand_type_dict      
-            print(f"✅ 分类完成：{len(results['demand_type']['items'])} 项")
-
-            # Step 2: Forecast
-            print("\n🔮 Step 2: Forecast 预测")
-            forecast_job = ForecastGenerationJob(config=self.config,data_container=self.data_container)
-            forecast_result = forecast_job.run(dry_run=dry_run, session=uow.session, return_output=True)
-            results["forecast"] = forecast_result
-            forecast_dict = forecast_result.get("core", {})
-            self.data_container.forecast_dict = forecast_dict
-            print(f"✅ 预测完成：{len(results['forecast']['items'])} 项")
-   
-            # Step 3: Safety Stock
-            print("\n🛡️ Step 3: 安全库存计算")
-            safety_job = SafetyStockGenerationJob(config=self.config,data_container=self.data_container)
-            safety_result = safety_job.run(dry_run=dry_run, session=uow.session, return_output=True)
-            results["safety_stock"] = safety_result
-            safety_dict = safety_result.get("core", {})
-            self.data_container.safety_stock_dict = safety_dict
-            print(f"✅ 安全库存计算完成：{len(results['safety_stock']['items'])} 项")
- 
-            # Step 4: MRP
+            if chain_container.items:
+                print("\n🔮 Step 1: Demand Type Classification")
+                classify_job = DemandClassificationJob(config=self.config,data_container=chain_container,n_workers=self.n_workers)
+                classify_result = classify_job.run(dry_run=dry_run, session=uow.session, return_output=True)
+                results["demand_type"] = classify_result # {"df": demand type classification result dataframe, "core": result dict, "items": proceed items}
+                self.data_container.demand_type_dict.update(classify_result.get("core",{}))
+                print(f"✅ 分类完成：{len(results['demand_type']['items'])} 项")
+
+                # Step 2: Forecast
+                print("\n🔮 Step 2: Forecast 预测")
+                forecaster = DemandForecaster(cache=self.forecast_cache) if self.forecast_cache is not None else None
+                forecast_job = ForecastGenerationJob(config=self.config,data_container=chain_container,forecaster=forecaster,n_workers=self.n_workers)
+                forecast_result = forecast_job.run(dry_run=dry_run, session=uow.session, return_output=True)
+                results["forecast"] = forecast_result
+                self.data_container.forecast_dict.update(forecast_result.get("core", {}))
+                if self.forecast_cache is not None:
+                    results["forecast_cache"] = self.forecast_cache.stats()
+                print(f"✅ 预测完成：{len(results['forecast']['items'])} 项")
+
+                # Step 3: Safety Stock
+                print("\n🛡️ Step 3: 安全库存计算")
+                safety_job = SafetyStockGenerationJob(config=self.config,data_container=chain_container,n_workers=self.n_workers)
+                safety_result = safety_job.run(dry_run=dry_run, session=uow.session, return_output=True)
+                results["safety_stock"] = safety_result
+                self.data_container.safety_stock_dict.update(safety_result.get("core", {}))
+                print(f"✅ 安全库存计算完成：{len(results['safety_stock']['items'])} 项")
+            else:
+                print("\n♻️ 无 dirty item，跳过分类 / 预测 / 安全库存")
+
+            if self.incremental:
+                # 指纹与结果在同一事务中写入，失败时一并回滚
+                fingerprint_loader = BaseLoader(self.config, ItemInputFingerprint,
+                                                ItemInputFingerprint.__default_loader_params__)
+                fingerprint_loader.write(fingerprint_df, dry_run=dry_run, session=uow.session)
+
+            # Step 4: MRP（始终全量，使用本次加载的最新库存）
             print("\n📦 Step 4: 静态补货计算 MRP")
             mrp_job = MRPJob(config=self.config,use_vectorized=True,data_container=self.data_container)
             mrp_result = mrp_job.run(dry_run=dry_run, session=uow.session, return_output=True)
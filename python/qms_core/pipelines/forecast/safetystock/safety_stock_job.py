@@ -4,13 +4,25 @@ from qms_core.core.forecast.common.item_data_preloader import ItemDataPreloader
 from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
 from qms_core.core.forecast.safety_stock import SafetyStockCalculator
 from qms_core.infrastructure.db.models import ItemSafetyRecord
+from qms_core.core.common.params.enums import DemandType
 import pandas as pd
 from typing import Optional
+from functools import partial
+
+
+def _safety_one(calculator: SafetyStockCalculator, item, croston: Optional[dict] = None):
+    try:
+        calculator.calculate_for_item(item, croston=croston)
+    except Exception as e:
+        print(f"❌ SafetyStock 失败：{item.itemnum} @ {item.warehouse}: {e}")
 
 
 class SafetyStockGenerationJob(BaseItemJob):
-    def __init__(self, config,data_container: Optional[MRPDataContainer] = None, calculator: Optional[SafetyStockCalculator] = None):
-        super().__init__(config=config,data_container=data_container)
+    result_component = "safetystock"
+
+    def __init__(self, config,data_container: Optional[MRPDataContainer] = None, calculator: Optional[SafetyStockCalculator] = None,
+                 n_workers: int = 1, chunk_size: Optional[int] = None):
+        super().__init__(config=config,data_container=data_container, n_workers=n_workers, chunk_size=chunk_size)
         self.calculator = calculator or SafetyStockCalculator()
 
     def target_table(self):
@@ -45,7 +57,7 @@ class SafetyStockGenerationJob(BaseItemJob):
 
         # ✅ 完整数据注入流程
         for item in self.data_container.items:
-            item.demand.load_from_df(self.demand_df)
+            self.data_container.load_item_demand(item)
             item.forecast.load_from_dict(self.forecast_dict)
             item.master.load_from_dict(self.master_dict.get((item.itemnum, item.warehouse), {}))
             item.demand_type.load_from_dict(self.demand_type_dict.get((item.itemnum, item.warehouse), {}))
@@ -54,11 +66,30 @@ class SafetyStockGenerationJob(BaseItemJob):
         return self.data_container.items
 
     def process_items(self, items: list, **kwargs):
-        for item in items:
+        # 容器提供需求矩阵时走批量路径，仅策略不支持批量的 item 回落到逐项计算
+        if hasattr(self.data_container, "get_demand_matrix"):
             try:
-                self.calculator.calculate_for_item(item)
+                items = self.calculator.calculate_batch(items, self.data_container)
             except Exception as e:
-                print(f"❌ SafetyStock 失败：{item.itemnum} @ {item.warehouse}: {e}")
+                print(f"⚠️ SafetyStock 批量计算失败，回落到逐项计算：{e}")
+        self.run_items(items)
+
+    def _item_worker(self):
+        return partial(_safety_one, self.calculator)
+
+    def _item_kwargs(self, item) -> dict:
+        return {"croston": self._shared_croston(item)}
+
+    def _shared_croston(self, item) -> Optional[dict]:
+        """
+        Intermittent 物料复用容器中批量计算的 Croston/SBA 结果（与 Forecast 共享）
+        """
+        if item.demand_type.demand_type != DemandType.INTERMITTENT or not hasattr(self.data_container, "get_croston_result"):
+            return None
+        params = self.calculator.params
+        return self.data_container.get_croston_result(
+            (item.itemnum, item.warehouse), alpha=params.intermittent_alpha, winsor_upper=params.winsor_upper
+        )
 
     def _collect_result(self, items: list) -> pd.DataFrame:
         return pd.DataFrame([
@@ -1,5 +1,5 @@
 from qms_core.core.forecast.transaction.virtual_transaction_extractor import VirtualTransactionExtractor
-from qms_core.core.forecast.transaction.virtual_transaction_transformer import VirtualTransactionTransformer
+from qms_core.core.forecast.transaction.virtual_transaction_transformer import ColumnarVirtualTransactionTransformer
 from qms_core.core.common.base_job import BaseJobCore
 from qms_core.infrastructure.db.models import VirtualStockTransaction
 import pandas as pd
@@ -11,7 +11,7 @@ class VirtualTransactionJob(BaseJobCore):
     - 输出：VirtualStockTransaction
     """
     EXTRACTOR_CLASS = VirtualTransactionExtractor
-    TRANSFORMER_CLASS = VirtualTransactionTransformer
+    TRANSFORMER_CLASS = ColumnarVirtualTransactionTransformer
     TARGET_TABLE = VirtualStockTransaction
 
     def __init__(self, config):
@@ -0,0 +1,76 @@
+"""
+滚动起点回测基准：ForecastEvaluator 逐 (item, origin) 循环 vs RollingOriginBacktester 批量，
+并在抽样物料上校验两者结果一致。
+
+用法：python -m qms_core.testscripts.backtest_benchmark [n_items] [n_origins] [n_workers]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.item.item import Item
+from qms_core.core.forecast.demand import DemandClassifier, DemandForecaster
+from qms_core.core.forecast.safety_stock import SafetyStockCalculator
+from qms_core.core.forecast.evaluator.forecast_evaluator import ForecastEvaluator
+from qms_core.core.forecast.evaluator.backtest_engine import RollingOriginBacktester
+from qms_core.testscripts.parallel_jobs_benchmark import make_demand_df, make_container
+
+COMPARE_FIELDS = ["PredictedDemand", "ActualDemand", "LastPeriodDemand", "SamePeriodLastYearDemand",
+                  "APE", "MoM_Growth", "YoY_Growth", "DynamicSafetyStock", "CoverageGap", "ForecastScore"]
+
+
+def run_reference(container, keys, origins) -> pd.DataFrame:
+    classifier, forecaster, calculator = DemandClassifier(), DemandForecaster(), SafetyStockCalculator()
+    rows = []
+    for itemnum, warehouse in keys:
+        for origin in origins:
+            item = Item(itemnum=itemnum, warehouse=warehouse)
+            item.master.load_from_dict(container.master_dict[(itemnum, warehouse)])
+            container.load_item_demand(item)
+            if item.demand.history.empty or item.demand.history["YearWeek"].min() > origin:
+                continue
+            evaluator = ForecastEvaluator(item, classifier, forecaster, calculator, analysis_end=origin)
+            result = evaluator.evaluate()
+            if result:
+                rows.append(result)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_origins = int(sys.argv[2]) if len(sys.argv) > 2 else 26
+    n_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    container = make_container(make_demand_df(n_items), n_items)
+    weeks = container.get_demand_matrix(np.float64).weeks
+    origins = list(weeks[-n_origins - 4:-4])
+    print(f"🧪 {n_items} 项物料 × {len(origins)} 个起点，workers={n_workers}")
+
+    engine = RollingOriginBacktester.from_container(container, n_workers=n_workers)
+    t0 = time.perf_counter()
+    result = engine.run(origins)
+    t_batch = time.perf_counter() - t0
+    print(f"⏱️ 批量回测: {t_batch:.2f}s，{len(result)} 行（{len(result) / t_batch:,.0f} 行/s）")
+    print(RollingOriginBacktester.summarize(result).tail(5))
+
+    # 抽样对比逐项 ForecastEvaluator
+    sample_keys = [(item.itemnum, item.warehouse) for item in container.items[:: max(1, n_items // 100)]]
+    sample_origins = origins[:: max(1, len(origins) // 4)]
+    t0 = time.perf_counter()
+    ref = run_reference(container, sample_keys, sample_origins)
+    t_ref = time.perf_counter() - t0
+    per_row = t_ref / max(len(ref), 1)
+    print(f"⏱️ 逐项 ForecastEvaluator: {len(ref)} 行 {t_ref:.2f}s，"
+          f"全量估算 {per_row * len(result):.1f}s（加速约 {per_row * len(result) / t_batch:.1f}x）")
+
+    merged = ref.merge(result, on=["ITEMNUM", "Warehouse", "EvalEnd"], suffixes=("_ref", ""))
+    assert len(merged) == len(ref), "❌ 批量结果缺少部分 (item, origin)"
+    for field in COMPARE_FIELDS:
+        a = merged[f"{field}_ref"].astype(float).to_numpy()
+        b = merged[field].astype(float).to_numpy()
+        assert np.allclose(a, b, rtol=1e-9, atol=1e-6, equal_nan=True), f"❌ {field} 不一致"
+    assert (merged["Covered_ref"].astype(bool) == merged["Covered"].astype(bool)).all()
+    assert (merged["DemandType_ref"] == merged["DemandType"]).all()
+    print(f"✅ {len(merged)} 行与 ForecastEvaluator 一致")
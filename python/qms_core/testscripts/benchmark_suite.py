@@ -0,0 +1,405 @@
+"""
+计划链路基准套件：在合成 ERP 库（synthetic_erp）上逐阶段测量
+ItemDataPreloader / 分类 / 预测 / 安全库存 / MRP / ETA / 交期分析 Pipeline / SmartTableWriter，
+输出每阶段的耗时、峰值内存与吞吐（行/s）JSON，可与历史结果对比以发现性能回退。
+
+- 每个阶段在独立子进程（spawn）中、基于合成库的独立副本运行，互不影响且峰值内存可单独统计
+- setup（加载上游结果、准备输入）不计时；只计时阶段本身（含写库）
+- peak_rss_mb 为子进程常驻内存高水位；peak_rss_delta_mb 为阶段运行期间高水位的增量（依赖 resource，Windows 下为空）
+
+用法：python -m qms_core.testscripts.benchmark_suite [--items 5000] [--stages mrp,eta] [--repeat 3]
+      [--db 已生成的合成库] [--out result.json] [--compare baseline.json] [--tolerance 0.1] [--fail-on-regression]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing as mp
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from qms_core.infrastructure.config import MRPConfig
+from qms_core.infrastructure.uow.unit_of_work import UnitOfWork
+from qms_core.testscripts.synthetic_erp import build_synthetic_erp
+
+SUITE_VERSION = 1
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _table_rows(config: MRPConfig, table: str) -> int:
+    with config.engine.connect() as conn:
+        return int(pd.read_sql(f"SELECT COUNT(*) AS n FROM {table}", conn)["n"].iloc[0])
+
+
+# ---------- 阶段定义 ----------
+@dataclass
+class Stage:
+    name: str
+    description: str
+    setup: Callable[[MRPConfig], dict]   # 不计时，返回阶段状态
+    run: Callable[[MRPConfig, dict], int]  # 计时，返回处理行数
+
+
+def _setup_items(config: MRPConfig) -> dict:
+    from qms_core.core.item.item_manager import ItemManager
+    return {"items": ItemManager.from_demand_history(config).items}
+
+
+def _run_preloader(config: MRPConfig, state: dict) -> int:
+    from qms_core.core.forecast.common.item_data_preloader import ItemDataPreloader
+    from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+
+    preloader = ItemDataPreloader(config, state["items"])
+    container = MRPDataContainer.from_preloader(preloader, state["items"])
+    return len(container.demand_df)
+
+
+def _setup_chain(upto: str) -> Callable[[MRPConfig], dict]:
+    """
+    按 SharedMemoryPipeline 的顺序准备链路：加载主数据后，先完成 upto 之前的步骤（写库，不计时）
+    """
+    order = ["classify", "forecast", "safety", "mrp", "dynamic_mrp"]
+
+    def setup(config: MRPConfig) -> dict:
+        from qms_core.pipelines.forecast.item_mrp_pipeline import SharedMemoryPipeline
+
+        pipeline = SharedMemoryPipeline(config)
+        pipeline.prepare_global_items()
+        pipeline.load_global_data()
+        state = {"container": pipeline.data_container}
+        for step in order[:order.index(upto)]:
+            _CHAIN_STEPS[step](config, state)
+        return state
+
+    return setup
+
+
+def _run_chain_job(job_factory: Callable, result_dict: Optional[str] = None) -> Callable[[MRPConfig, dict], int]:
+    def run(config: MRPConfig, state: dict) -> int:
+        container = state["container"]
+        with UnitOfWork(config) as uow:
+            result = job_factory(config, container).run(dry_run=False, session=uow.session, return_output=True)
+        if result_dict:
+            getattr(container, result_dict).update(result.get("core") or {})
+        # 以处理的 item 数计吞吐（输出行数随业务逻辑变化，不宜跨版本比较）
+        return len(result.get("items") or container.items)
+
+    return run
+
+
+def _classify_job(config, container):
+    from qms_core.pipelines.forecast.demand.demand_classification_job import DemandClassificationJob
+    return DemandClassificationJob(config=config, data_container=container)
+
+
+def _forecast_job(config, container):
+    from qms_core.pipelines.forecast.demand.demand_forecast_job import ForecastGenerationJob
+    return ForecastGenerationJob(config=config, data_container=container)
+
+
+def _safety_job(config, container):
+    from qms_core.pipelines.forecast.safetystock.safety_stock_job import SafetyStockGenerationJob
+    return SafetyStockGenerationJob(config=config, data_container=container)
+
+
+def _mrp_job(config, container):
+    from qms_core.pipelines.forecast.MRP.MRP_job import MRPJob
+    return MRPJob(config=config, use_vectorized=True, data_container=container)
+
+
+def _dynamic_mrp_job(config, container):
+    from qms_core.pipelines.forecast.MRP.MRP_job import MRPJob
+    from qms_core.core.forecast.MRP.dynamic_MRP_calculator import DynamicMRPCalculator
+    from qms_core.core.common.params.loader_params import LoaderParams
+
+    loader_param = LoaderParams(exclude_fields=["CalcDate"], write_params={"delete_before_insert": False, "upsert": False})
+    calculator = DynamicMRPCalculator(data_container=container, use_vectorized=True)
+    return MRPJob(config=config, use_vectorized=True, calculator=calculator, load_params=loader_param)
+
+
+_CHAIN_STEPS = {
+    "classify": _run_chain_job(_classify_job, "demand_type_dict"),
+    "forecast": _run_chain_job(_forecast_job, "forecast_dict"),
+    "safety": _run_chain_job(_safety_job, "safety_stock_dict"),
+    "mrp": _run_chain_job(_mrp_job),
+    "dynamic_mrp": _run_chain_job(_dynamic_mrp_job),
+}
+
+
+def _setup_eta(config: MRPConfig) -> dict:
+    return {"rows": _table_rows(config, "PO_INTRANSIT_RAW")}
+
+
+def _run_eta(config: MRPConfig, state: dict) -> int:
+    from qms_core.pipelines.forecast.ETA.ETA_forecast_job import ETAForecastJob
+
+    with UnitOfWork(config) as uow:
+        ETAForecastJob(config, lead_metric="Q60").run(dry_run=False, session=uow.session)
+    return state["rows"]
+
+
+def _setup_leadtime(config: MRPConfig) -> dict:
+    return {"rows": _table_rows(config, "PO_DELIVERY_HISTORY_RAW") + _table_rows(config, "PO_INTRANSIT_RAW")}
+
+
+def _run_leadtime(config: MRPConfig, state: dict) -> int:
+    from qms_core.pipelines.analysis.leadtime_pipeline import LeadtimeAnalysisPipeline
+
+    LeadtimeAnalysisPipeline(config).run_all(dry_run=False, skip_jobs=["freight_charge"])
+    return state["rows"]
+
+
+def _setup_smart_writer(config: MRPConfig) -> dict:
+    """
+    模拟一次 ERP 主数据同步：5% 的 IWI 交期变化、2% 的 MOQ 变化，触发增量比较 + 变更日志
+    """
+    from qms_core.infrastructure.db.models import IWI
+    from qms_core.infrastructure.db.reader import fetch_orm_data
+
+    rng = np.random.default_rng(0)
+    df = fetch_orm_data(config, IWI)
+    lead_changed = rng.random(len(df)) < 0.05
+    df.loc[lead_changed, "WLEAD"] = df.loc[lead_changed, "WLEAD"] + 7
+    moq_changed = rng.random(len(df)) < 0.02
+    df.loc[moq_changed, "MOQ"] = df.loc[moq_changed, "MOQ"] * 2
+    return {"df": df}
+
+
+def _run_smart_writer(config: MRPConfig, state: dict) -> int:
+    from qms_core.core.common.base_loader import BaseLoader
+    from qms_core.infrastructure.db.models import IWI
+
+    with UnitOfWork(config) as uow:
+        BaseLoader(config, IWI, IWI.__default_loader_params__).write(state["df"], dry_run=False, session=uow.session)
+    return len(state["df"])
+
+
+STAGES: dict[str, Stage] = {
+    stage.name: stage for stage in [
+        Stage("preloader", "ItemDataPreloader 全量加载", _setup_items, _run_preloader),
+        Stage("classify", "DemandClassificationJob", _setup_chain("classify"), _CHAIN_STEPS["classify"]),
+        Stage("forecast", "ForecastGenerationJob", _setup_chain("forecast"), _CHAIN_STEPS["forecast"]),
+        Stage("safety", "SafetyStockGenerationJob", _setup_chain("safety"), _CHAIN_STEPS["safety"]),
+        Stage("mrp", "MRPJob（静态，向量化）", _setup_chain("mrp"), _CHAIN_STEPS["mrp"]),
+        Stage("dynamic_mrp", "MRPJob（动态，向量化）", _setup_chain("dynamic_mrp"), _CHAIN_STEPS["dynamic_mrp"]),
+        Stage("eta", "ETAForecastJob", _setup_eta, _run_eta),
+        Stage("leadtime_pipeline", "LeadtimeAnalysisPipeline（不含运费）", _setup_leadtime, _run_leadtime),
+        Stage("smart_writer", "SmartTableWriter IWI 增量同步", _setup_smart_writer, _run_smart_writer),
+    ]
+}
+
+
+# ---------- 子进程执行 ----------
+def _stage_worker(name: str, db_path: str, work_dir: str, verbose: bool, queue):
+    result = {"stage": name, "status": "ok", "error": None}
+    log = io.StringIO()
+    try:
+        # 每个阶段使用独立副本，写库不影响后续阶段
+        scratch = Path(work_dir) / f"{name}.db"
+        shutil.copyfile(db_path, scratch)
+        config = MRPConfig(scratch)
+        stage = STAGES[name]
+
+        with contextlib.redirect_stdout(sys.stdout if verbose else log):
+            t0 = time.perf_counter()
+            state = stage.setup(config)
+            result["setup_s"] = round(time.perf_counter() - t0, 4)
+
+            gc.collect()
+            rss_before = _peak_rss_mb()
+            t0 = time.perf_counter()
+            rows = stage.run(config, state)
+            wall = time.perf_counter() - t0
+
+        rss_after = _peak_rss_mb()
+        result.update({
+            "wall_s": round(wall, 4),
+            "rows": int(rows),
+            "rows_per_s": round(rows / wall, 2) if wall > 0 else None,
+            "peak_rss_mb": round(rss_after, 1) if rss_after is not None else None,
+            "peak_rss_delta_mb": round(rss_after - rss_before, 1) if rss_after is not None else None,
+        })
+        config.engine.dispose()
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["log_tail"] = (log.getvalue()[-2000:] + traceback.format_exc()[-2000:])
+    queue.put(result)
+
+
+def run_stage(name: str, db_path: Path, work_dir: Path, verbose: bool = False, timeout: Optional[float] = None) -> dict:
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_stage_worker, args=(name, str(db_path), str(work_dir), verbose, queue))
+    proc.start()
+    try:
+        result = queue.get(timeout=timeout)
+    except Exception:
+        proc.terminate()
+        result = {"stage": name, "status": "error", "error": "timeout or worker crashed"}
+    proc.join()
+    (work_dir / f"{name}.db").unlink(missing_ok=True)
+    return result
+
+
+def _aggregate(name: str, runs: list[dict]) -> dict:
+    """
+    多次重复时取 wall_s 中位数，峰值内存取最大值
+    """
+    ok = [r for r in runs if r["status"] == "ok"]
+    if not ok:
+        return runs[-1]
+    walls = [r["wall_s"] for r in ok]
+    median = statistics.median(walls)
+    base = min(ok, key=lambda r: abs(r["wall_s"] - median)).copy()
+    base.update({
+        "wall_s": round(median, 4),
+        "wall_min_s": round(min(walls), 4),
+        "wall_max_s": round(max(walls), 4),
+        "repeat": len(ok),
+        "rows_per_s": round(base["rows"] / median, 2) if median > 0 else None,
+    })
+    peaks = [r["peak_rss_mb"] for r in ok if r.get("peak_rss_mb") is not None]
+    if peaks:
+        base["peak_rss_mb"] = max(peaks)
+    return base
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=Path(__file__).parent, timeout=10)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(stages: list[str], n_items: int = 5000, seed: int = 0, db_path: Optional[Path] = None,
+              repeat: int = 1, verbose: bool = False, timeout: Optional[float] = None) -> dict:
+    with tempfile.TemporaryDirectory(prefix="qms_bench_") as tmp:
+        work_dir = Path(tmp)
+        t0 = time.perf_counter()
+        if db_path is None or not Path(db_path).exists():
+            db_path = Path(db_path) if db_path else work_dir / "synthetic_erp.db"
+            with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+                build_synthetic_erp(db_path, n_items=n_items, seed=seed).engine.dispose()
+        generate_s = time.perf_counter() - t0
+        print(f"🧪 合成库就绪：{db_path}（{generate_s:.1f}s）")
+
+        results = []
+        for name in stages:
+            runs = [run_stage(name, db_path, work_dir, verbose, timeout) for _ in range(repeat)]
+            result = _aggregate(name, runs)
+            results.append(result)
+            if result["status"] == "ok":
+                print(f"⏱️ {name:<18} {result['wall_s']:>9.3f}s | {result['rows']:>9} 行 | "
+                      f"{result['rows_per_s'] or 0:>12,.0f} 行/s | 峰值 {result['peak_rss_mb']} MB")
+            else:
+                print(f"❌ {name:<18} {result['error']}")
+
+    return {
+        "suite": "qms_core.benchmark_suite",
+        "suite_version": SUITE_VERSION,
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "n_items": n_items,
+            "seed": seed,
+            "repeat": repeat,
+            "generate_s": round(generate_s, 2),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+        },
+        "stages": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.1) -> list[str]:
+    """
+    与基线结果逐阶段对比，返回耗时增加超过 tolerance 的阶段名
+    """
+    base = {r["stage"]: r for r in baseline.get("stages", [])}
+    regressions = []
+    print(f"\n📊 对比基线（{baseline.get('meta', {}).get('git_revision')} → {current['meta'].get('git_revision')}）")
+    print(f"{'stage':<18} {'wall_old':>9} {'wall_new':>9} {'ratio':>7} {'mem_old':>8} {'mem_new':>8}")
+    for r in current["stages"]:
+        old = base.get(r["stage"])
+        if old is None or old.get("status") != "ok" or r.get("status") != "ok":
+            print(f"{r['stage']:<18} {'-':>9} {'-':>9} {'n/a':>7}")
+            continue
+        ratio = r["wall_s"] / old["wall_s"] if old["wall_s"] else float("nan")
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(r["stage"])
+            flag = " ⚠️ 回退"
+        print(f"{r['stage']:<18} {old['wall_s']:>9.3f} {r['wall_s']:>9.3f} {ratio:>6.2f}x "
+              f"{old.get('peak_rss_mb') or 0:>8.1f} {r.get('peak_rss_mb') or 0:>8.1f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QMS 计划链路基准套件")
+    parser.add_argument("--items", type=int, default=5000, help="合成料号数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", type=Path, default=None, help="合成库路径；已存在则直接复用，否则生成到此处")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"逗号分隔，可选：{','.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=1, help="每阶段重复次数（取耗时中位数）")
+    parser.add_argument("--timeout", type=float, default=None, help="单阶段超时秒数")
+    parser.add_argument("--out", type=Path, default=None, help="结果 JSON 输出路径")
+    parser.add_argument("--compare", type=Path, default=None, help="基线结果 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="判定回退的耗时增幅")
+    parser.add_argument("--fail-on-regression", action="store_true", help="存在回退或失败阶段时返回非零退出码")
+    parser.add_argument("--verbose", action="store_true", help="显示各阶段自身日志")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"未知阶段: {unknown}")
+
+    result = run_suite(stages, n_items=args.items, seed=args.seed, db_path=args.db,
+                       repeat=args.repeat, verbose=args.verbose, timeout=args.timeout)
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 结果已写入 {args.out}")
+
+    failed = [r["stage"] for r in result["stages"] if r["status"] != "ok"]
+    regressions = []
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+    if args.fail_on_regression and (failed or regressions):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
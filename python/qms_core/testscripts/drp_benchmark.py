@@ -0,0 +1,102 @@
+"""
+多仓 DRP 基准：n_items × n_warehouses 上的 DRPCalculator 耗时，并校验调拨结果
+（调出 ≤ 富余、调入 ≤ 缺口、分配后同一 lane 上不再同时存在富余与缺口、与逐物料贪心参考实现一致）。
+
+用法：python -m qms_core.testscripts.drp_benchmark [n_items] [n_warehouses]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.item.item import Item
+from qms_core.core.common.params.DRPParams import DRPParamsSchema
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.core.forecast.MRP.MRP_calculator import MRPCalculator
+from qms_core.core.forecast.DRP.network import WarehouseNetwork
+from qms_core.core.forecast.DRP.calculator import DRPCalculator
+
+
+def make_inputs(n_items: int, n_warehouses: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    warehouses = [str(w + 1) for w in range(n_warehouses)]
+    warehouse_df = pd.DataFrame({
+        "Warehouse": warehouses,
+        "COUNTRYCODE": ["JP" if w < max(2, n_warehouses - 1) else "KR" for w in range(n_warehouses)],
+    })
+    lane_stats = pd.DataFrame({
+        "VendorCode": ["1", "2"], "Warehouse": ["2", "1"],
+        "SmoothedTransportLeadTime": [1.0, np.nan], "Q60TransportLeadTime": [2.0, 4.0],
+    })
+
+    items, forecast_dict, inventory_dict, master_dict, safety_stock_dict = [], {}, {}, {}, {}
+    for i in range(n_items):
+        for wh in warehouses:
+            if rng.random() < 0.2:
+                continue
+            item = Item(itemnum=f"I{i}", warehouse=wh)
+            key = (item.itemnum, item.warehouse)
+            items.append(item)
+            forecast_dict[key] = {"ForecastSeries": pd.Series(rng.gamma(1.5, 3, 12).round(2))}
+            inventory_dict[key] = {"AvailableStock": float(rng.integers(0, 120)), "IntransitStock": float(rng.integers(0, 10))}
+            master_dict[key] = {"moq": int(rng.integers(1, 20)), "lot_size": 1, "lead_time": int(rng.integers(7, 70))}
+            safety_stock_dict[key] = {"DynamicSafetyStock": 5.0, "FinalSafetyStock": float(rng.integers(0, 15))}
+    container = MRPDataContainer(items, pd.DataFrame(), forecast_dict, inventory_dict, master_dict, {}, safety_stock_dict, {})
+    return container, WarehouseNetwork.from_frames(warehouse_df, lane_stats)
+
+
+def reference_transfers(calc: DRPCalculator) -> pd.DataFrame:
+    """
+    逐物料贪心参考实现
+    """
+    positions = calc.mrp_calculator.prepare_batch()
+    net = positions["Forecast_within_LT"] + positions["FinalSafetyStock"] - positions["AvailableStock"] - positions["IntransitStock"]
+    lanes = {(r.FromWarehouse, r.ToWarehouse): r.LeadTimeDays for r in calc.network.lanes.itertuples()}
+    rows = []
+    for itemnum, group in positions.assign(Net=net).groupby("ITEMNUM", sort=True):
+        short = {wh: np.ceil(max(n, 0) - 1e-9) for wh, n in zip(group["Warehouse"], group["Net"])}
+        surplus = {wh: np.floor(min(max(-n, 0), max(a, 0)) + 1e-9)
+                   for wh, n, a in zip(group["Warehouse"], group["Net"], group["AvailableStock"])}
+        cands = sorted(
+            ((lanes[(s, d)], -surplus[s], s, d) for s in surplus for d in short
+             if surplus[s] > 0 and short[d] > 0 and (s, d) in lanes)
+        )
+        for _, _, s, d in cands:
+            move = min(surplus[s], short[d])
+            if move >= calc.params.min_transfer_qty:
+                rows.append((itemnum, s, d, move))
+                surplus[s] -= move
+                short[d] -= move
+    return pd.DataFrame(rows, columns=["ITEMNUM", "FromWarehouse", "ToWarehouse", "TransferQty"])
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_warehouses = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    container, network = make_inputs(n_items, n_warehouses)
+    print(f"🧪 {n_items} 项物料 × {n_warehouses} 仓（{len(container.items)} 个 item×仓），{len(network)} 条 lane")
+
+    calc = DRPCalculator(container, network, params=DRPParamsSchema())
+    t0 = time.perf_counter()
+    transfers, orders = calc.run()
+    elapsed = time.perf_counter() - t0
+    static = MRPCalculator(data_container=container).run_batch()
+    print(f"⏱️ DRP: {elapsed:.2f}s，调拨 {len(transfers):,} 条 / {transfers['TransferQty'].sum():,.0f} 件；"
+          f"供应商订单 {static['RecommendedQty'].sum():,} → {orders['RecommendedQty'].sum():,} 件")
+
+    out = transfers.groupby(["ITEMNUM", "FromWarehouse"])["TransferQty"].sum()
+    src_cap = transfers.groupby(["ITEMNUM", "FromWarehouse"])["SourceSurplus"].first()
+    assert (out <= src_cap + 1e-9).all(), "❌ 调出量超过富余"
+    inbound = transfers.groupby(["ITEMNUM", "ToWarehouse"])["TransferQty"].sum()
+    dst_cap = transfers.groupby(["ITEMNUM", "ToWarehouse"])["DestinationShortage"].first()
+    assert (inbound <= dst_cap + 1e-9).all(), "❌ 调入量超过缺口"
+    assert (orders["RecommendedQty"].sum() <= static["RecommendedQty"].sum()), "❌ DRP 后供应商订单反而增加"
+
+    sample = sorted(set(transfers["ITEMNUM"]))[:500]
+    ref = reference_transfers(calc)
+    ref = ref[ref["ITEMNUM"].isin(sample)].sort_values(["ITEMNUM", "FromWarehouse", "ToWarehouse"]).reset_index(drop=True)
+    got = transfers[transfers["ITEMNUM"].isin(sample)][ref.columns].sort_values(["ITEMNUM", "FromWarehouse", "ToWarehouse"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(ref, got, check_dtype=False)
+    print(f"✅ 调拨约束成立，抽样 {len(sample)} 项物料与逐物料贪心参考一致")
@@ -0,0 +1,133 @@
+"""
+ETA 模拟基准：ETATransformer（尾批 / 分批逐行 iterrows，尾批自举逐行扫描 df_full）
+vs ColumnarETATransformer（列式），在 n_lines 条在手 PO 行上分别比较尾批 / 分批模拟与完整 transform 的耗时，
+并校验 PO_ETA_Recommendation 输出完全一致。
+数据覆盖：已确认 / 已发货 / 部分到货（行为统计、自举、默认参数）/ 预计分批（含尾批占比）/ 一次交货，
+以及上次发货缺失、批次数为 0、参数为空值（逐行实现中被跳过的行）等情况。
+
+用法：python -m qms_core.testscripts.eta_simulation_benchmark [n_lines]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.forecast.ETA.calculator import ETATransformer, ColumnarETATransformer
+from qms_core.testscripts.transport_lookup_benchmark import make_inputs as make_transport_tables
+
+KEYS = ["ITEMNUM", "Warehouse", "VendorCode", "TransportMode"]
+
+
+def make_inputs(n_lines: int, seed: int = 0) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    _, vendor_lt, vendor_master = make_transport_tables(10, n_vendors=max(50, n_lines // 40), seed=seed)
+    vendor_master = vendor_master.drop_duplicates(["VendorCode", "TransportMode"]).reset_index(drop=True)
+    vendors = vendor_lt["VendorCode"].unique()
+    modes = np.array(["Air", "Vessel", "Courier", "Truck", None], dtype=object)
+
+    # 每张 PO 若干行，部分行带已发货子行（1-1 / 1-2），用于自举
+    n_po = max(1, n_lines // 4)
+    po_of_line = rng.integers(0, n_po, n_lines)
+    line_no = np.array([str(x) for x in rng.choice([1, 2, 3, 10, 11], n_lines)], dtype=object)
+    sub = rng.random(n_lines)
+    poline = np.where(sub < 0.25, line_no + "-" + pd.Series(rng.integers(1, 4, n_lines)).astype(str).to_numpy(), line_no)
+    n_items = max(1, n_lines // 6)
+    item_of_po = rng.integers(0, n_items, n_po)
+
+    ordered = rng.integers(1, 400, n_lines).astype(float)
+    remaining = np.where(rng.random(n_lines) < 0.45, ordered, np.floor(ordered * rng.uniform(0, 1, n_lines)))
+    entry = pd.Timestamp("2025-03-01") + pd.to_timedelta(rng.integers(0, 300, n_lines), unit="D")
+    invoice = pd.Series(entry + pd.to_timedelta(rng.integers(5, 90, n_lines), unit="D"))
+    invoice[rng.random(n_lines) < 0.5] = pd.NaT
+    comment = np.where(rng.random(n_lines) < 0.05, "Delivery date confirmed", None)
+
+    intransit = pd.DataFrame({
+        "PONUM": [f"P{p:07d}" for p in po_of_line],
+        "POLINE": poline,
+        "ITEMNUM": [f"I{i:06d}" for i in item_of_po[po_of_line]],
+        "Warehouse": np.array(["1", "2", "5"], dtype=object)[po_of_line % 3],
+        "VendorCode": vendors[po_of_line % len(vendors)],
+        "OrderedQty": ordered,
+        "RemainingQty": remaining,
+        "InTransitQty": np.where(rng.random(n_lines) < 0.1, rng.integers(1, 50, n_lines), 0).astype(float),
+        "POEntryDate": entry,
+        "InvoiceDate": invoice,
+        "TransportMode": modes[rng.integers(0, len(modes), n_lines)],
+        "Comment": comment,
+    })
+    intransit.loc[rng.random(n_lines) < 0.01, "POEntryDate"] = pd.NaT
+
+    keys = intransit[KEYS].drop_duplicates()
+    keys = keys[keys["TransportMode"].notna()].reset_index(drop=True)
+    n_keys = len(keys)
+
+    smart = keys.sample(frac=0.8, random_state=seed).assign(Q60LeadTime=lambda d: rng.integers(10, 120, len(d)).astype(float))
+    iwi = intransit[["ITEMNUM", "Warehouse"]].drop_duplicates().assign(WLEAD=lambda d: rng.integers(20, 90, len(d)).astype(float))
+
+    batch_profile = keys.assign(
+        IsBatchProne=np.where(rng.random(n_keys) < 0.4, "Y", "N"),
+        PredictedBatchCount=rng.choice([0, 1, 2, 3, 4, np.nan], n_keys, p=[0.05, 0.2, 0.3, 0.2, 0.15, 0.1]),
+        PredictedBatchQty=rng.uniform(5, 50, n_keys),
+        PredictedBatchIntervalDays=np.where(rng.random(n_keys) < 0.05, np.nan, rng.uniform(3, 30, n_keys).round(1)),
+        PredictedTailQtyRate=np.where(rng.random(n_keys) < 0.3, np.nan, rng.choice([0.0, 0.15, 0.25, 0.5], n_keys)),
+    )
+    behavior = keys.sample(frac=0.5, random_state=seed + 1).assign(
+        MaxSingleBatchQty=lambda d: np.where(rng.random(len(d)) < 0.05, np.nan, rng.integers(0, 60, len(d)).astype(float)),
+        AvgTailQtyRate=lambda d: rng.uniform(0, 1, len(d)),
+    )
+
+    shipped = intransit[intransit["InvoiceDate"].notna()]
+    delivery = shipped[["PONUM", "POLINE", "InvoiceDate"]].sample(frac=0.6, random_state=seed).reset_index(drop=True)
+
+    return {
+        "intransit": intransit,
+        "smart_leadtime": smart,
+        "batch_profile": batch_profile,
+        "iwi": iwi,
+        "delivery": delivery,
+        "vendor_transport_stat": vendor_lt,
+        "vendor_master": vendor_master,
+        "delivery_behavior": behavior,
+    }
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def assert_same(ref: pd.DataFrame, got: pd.DataFrame, label: str):
+    ref = ETATransformer().enforce_column_types(ref.reset_index(drop=True))
+    got = ETATransformer().enforce_column_types(got.reset_index(drop=True))
+    pd.testing.assert_frame_equal(ref, got, check_dtype=False, check_exact=True, obj=label)
+
+
+if __name__ == "__main__":
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    data = make_inputs(n_lines)
+    legacy, columnar = ETATransformer(), ColumnarETATransformer()
+    df_full, cases, last_delivery = legacy.prepare_and_route_intransit(data)
+    print(f"🧪 {n_lines:,} 条在手 PO 行：" + "，".join(f"{k} {len(v):,}" for k, v in cases.items()))
+
+    tail_args = dict(df_tail=cases["SplitInProgress"], df_behavior=data["delivery_behavior"], last_delivery_dict=last_delivery,
+                     df_full=df_full, df_vendor_lt=data["vendor_transport_stat"], df_vendor_master=data["vendor_master"])
+    batch_args = dict(df=cases["LikelySplit"], df_vendor_lt=data["vendor_transport_stat"], df_vendor_master=data["vendor_master"])
+
+    ref_tail, t_ref_tail = timed(legacy.simulate_tail_eta, **tail_args)
+    got_tail, t_tail = timed(columnar.simulate_tail_eta, **tail_args)
+    print(f"⏱️ 尾批模拟 逐行: {t_ref_tail:.2f}s | 列式: {t_tail:.3f}s，输出 {len(got_tail):,} 行")
+    assert_same(ref_tail, got_tail, "simulate_tail_eta")
+
+    ref_batch, t_ref_batch = timed(legacy.simulate_batch_eta, **batch_args)
+    got_batch, t_batch = timed(columnar.simulate_batch_eta, **batch_args)
+    print(f"⏱️ 分批模拟 逐行: {t_ref_batch:.2f}s | 列式: {t_batch:.3f}s，输出 {len(got_batch):,} 行")
+    assert_same(ref_batch, got_batch, "simulate_batch_eta")
+
+    ref, t_ref = timed(ETATransformer().transform, data)
+    got, t_new = timed(ColumnarETATransformer().transform, data)
+    print(f"⏱️ 完整 transform 逐行: {t_ref:.2f}s | 列式: {t_new:.2f}s | 加速 {t_ref / t_new:.1f}x，输出 {len(got):,} 行")
+    assert_same(ref, got, "transform")
+    print("✅ 尾批 / 分批 / 完整 PO_ETA_Recommendation 输出完全一致")
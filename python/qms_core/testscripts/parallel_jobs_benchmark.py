@@ -0,0 +1,104 @@
+"""
+BaseItemJob 进程池并行基准：分类（逐项路径）/ 预测 / 安全库存在 1..N 个 worker 下的耗时，
+并校验并行结果与串行完全一致。
+
+用法：python -m qms_core.testscripts.parallel_jobs_benchmark [n_items] [max_workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from qms_core.infrastructure.config import MRPConfig
+from qms_core.core.item.item import Item
+from qms_core.core.forecast.common.mrp_datacontainer import MRPDataContainer
+from qms_core.pipelines.forecast.demand.demand_classification_job import DemandClassificationJob
+from qms_core.pipelines.forecast.demand.demand_forecast_job import ForecastGenerationJob
+from qms_core.pipelines.forecast.safetystock.safety_stock_job import SafetyStockGenerationJob
+
+
+def make_demand_df(n_items: int, n_weeks: int = 104, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    mondays = pd.date_range(end=pd.Timestamp.today().normalize(), periods=n_weeks, freq="W-MON")
+    yearweeks = np.array([f"{d.isocalendar().year}-W{d.isocalendar().week:02d}" for d in mondays])
+
+    # 稳定 / 间歇 / 爆发三类混合
+    kind = np.arange(n_items) % 3
+    rate = np.where(kind == 0, 0.9, np.where(kind == 1, 0.2, 0.5))
+    mask = rng.random((n_items, n_weeks)) < rate[:, None]
+    rows, cols = np.nonzero(mask)
+    qty = rng.poisson(np.where(kind[rows] == 2, 1, 8)).astype(float) + 1
+    burst = (kind[rows] == 2) & (rng.random(len(rows)) < 0.05)
+    qty[burst] *= 30
+
+    return pd.DataFrame({
+        "ITEMNUM": np.char.add("I", rows.astype(str)),
+        "Warehouse": "1",
+        "YearWeek": yearweeks[cols],
+        "TotalDemand": qty,
+    })
+
+
+def make_container(demand_df: pd.DataFrame, n_items: int) -> MRPDataContainer:
+    items = [Item(itemnum=f"I{i}", warehouse="1") for i in range(n_items)]
+    master_dict = {
+        (item.itemnum, item.warehouse): {"cost": 10.0 + i % 50, "lead_time": 14 + 7 * (i % 8), "safety_stock": 0}
+        for i, item in enumerate(items)
+    }
+    container = MRPDataContainer(items, demand_df, {}, {}, master_dict, {}, {}, {})
+    for item in items:
+        container.load_item_demand(item)
+        item.master.load_from_dict(master_dict[(item.itemnum, item.warehouse)])
+    return container
+
+
+def timed_run(job, items) -> float:
+    t0 = time.perf_counter()
+    job.run_items(items)
+    return time.perf_counter() - t0
+
+
+def snapshot(items) -> list:
+    return [
+        (item.demand_type.to_dict().get("DemandType"), item.demand_type.metrics.get("CV"),
+         item.forecast.forecast_series_json, item.safetystock.final_safety_stock)
+        for item in items
+    ]
+
+
+def run_benchmark(n_items: int, max_workers: int):
+    demand_df = make_demand_df(n_items)
+    config = MRPConfig()
+    worker_counts = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w < max_workers], max_workers})
+
+    baseline = None
+    print(f"🧪 {n_items} 项物料, workers = {worker_counts}")
+    for n_workers in worker_counts:
+        container = make_container(demand_df, n_items)
+        items = container.items
+
+        classify_job = DemandClassificationJob(config, data_container=container, n_workers=n_workers)
+        t_cls = timed_run(classify_job, items)
+
+        forecast_job = ForecastGenerationJob(config, data_container=container, n_workers=n_workers)
+        t_fc = timed_run(forecast_job, items)
+
+        safety_job = SafetyStockGenerationJob(config, data_container=container, n_workers=n_workers)
+        t_ss = timed_run(safety_job, items)
+
+        total = t_cls + t_fc + t_ss
+        if baseline is None:
+            baseline = (total, snapshot(items))
+        else:
+            assert snapshot(items) == baseline[1], f"❌ {n_workers} workers 结果与串行不一致"
+        print(f"⏱️ workers={n_workers:<3} classify {t_cls:7.2f}s | forecast {t_fc:7.2f}s | "
+              f"safety {t_ss:7.2f}s | total {total:7.2f}s | speedup {baseline[0] / total:5.2f}x")
+    print("✅ 并行结果与串行一致")
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    run_benchmark(n_items, max_workers)
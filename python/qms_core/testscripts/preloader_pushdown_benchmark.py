@@ -0,0 +1,152 @@
+"""
+ItemDataPreloader SQL 下推基准：
+在临时目录生成合成 SQLite 库（IIM / IWI / DPS / STKOH_AVAIL / DEMANDHISTORY_WEEKLY），
+对比“全表读取 + isin”与按 (ITEMNUM, Warehouse) 下推过滤的耗时，并校验结果一致。
+
+用法：python -m qms_core.testscripts.preloader_pushdown_benchmark [n_items] [n_selected]
+"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from qms_core.infrastructure.config import MRPConfig
+from qms_core.infrastructure.db.models import Base
+from qms_core.core.item.item import Item
+from qms_core.core.forecast.common.item_data_preloader import ItemDataPreloader
+
+WAREHOUSES = ["1", "5", "6"]
+
+
+def build_synthetic_db(db_path: Path, n_items: int = 20000, n_weeks: int = 104, seed: int = 0) -> MRPConfig:
+    rng = np.random.default_rng(seed)
+    db_path.touch()
+    config = MRPConfig(db_path)
+    Base.metadata.create_all(config.engine)
+
+    itemnums = np.array([f"{i:010d}" for i in range(n_items)])
+    keys = pd.DataFrame({
+        "ITEMNUM": np.repeat(itemnums, len(WAREHOUSES)),
+        "Warehouse": np.tile(WAREHOUSES, n_items),
+    })
+
+    iim = pd.DataFrame({
+        "ITEMNUM": itemnums,
+        "IITYP": "A",
+        "IDESC": "SYNTH",
+        "IVEND": rng.integers(1000, 1100, n_items).astype(str),
+        "VNDNAM": "VENDOR",
+        "ISCST": rng.uniform(1, 500, n_items).round(2),
+        "CXPPLC": "P",
+        "PGC": "PG",
+        "GAC": "GA",
+        "RPFLAG": "N",
+    })
+    iwi = keys.assign(
+        WLOTS=rng.integers(1, 20, len(keys)),
+        WLEAD=rng.integers(5, 60, len(keys)),
+        WSAFE=0,
+        WLOC="L1",
+        MOQ=rng.integers(1, 50, len(keys)),
+    )
+    stk = keys.assign(
+        ITEMDESC="SYNTH",
+        AVAIL=rng.integers(0, 200, len(keys)).astype(float),
+        IONOD=rng.integers(0, 50, len(keys)).astype(float),
+    )
+    # 10% 的料号存在替代关系（父项 -> 子项）
+    n_dps = n_items // 10
+    parents = rng.choice(itemnums, n_dps, replace=False)
+    children = rng.choice(itemnums, n_dps, replace=False)
+    dps = pd.DataFrame({
+        "ITEMNUM_PARENT": parents,
+        "ITEMNUM_CHILD": children,
+        "TYPE": "1",
+        "PSCQTY": 1.0,
+        "USING_EXISTING": rng.choice(["Y", "N"], n_dps),
+    }).drop_duplicates(["ITEMNUM_PARENT", "ITEMNUM_CHILD"])
+
+    mondays = pd.date_range(end=pd.Timestamp.today().normalize(), periods=n_weeks, freq="W-MON")
+    yearweeks = [f"{d.isocalendar().year}-W{d.isocalendar().week:02d}" for d in mondays]
+    # 每个 key 约 20% 的周有需求
+    mask = rng.random((len(keys), n_weeks)) < 0.2
+    rows, cols = np.nonzero(mask)
+    dhw = pd.DataFrame({
+        "ITEMNUM": keys["ITEMNUM"].values[rows],
+        "Warehouse": keys["Warehouse"].values[rows],
+        "YearWeek": np.array(yearweeks)[cols],
+        "TotalDemand": rng.poisson(5, len(rows)).astype(float) + 1,
+    })
+
+    with config.engine.begin() as conn:
+        iim.to_sql("IIM", conn, if_exists="append", index=False)
+        iwi.to_sql("IWI", conn, if_exists="append", index=False)
+        stk.to_sql("STKOH_IWI_AVAIL", conn, if_exists="append", index=False)
+        dps.to_sql("DPS", conn, if_exists="append", index=False)
+        dhw.to_sql("DEMANDHISTORY_WEEKLY", conn, if_exists="append", index=False)
+
+    print(f"🧪 合成库: {n_items} 料号 × {len(WAREHOUSES)} 仓, 需求记录 {len(dhw)} 行")
+    return config
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def run_benchmark(config: MRPConfig, n_selected: int = 500, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    with config.engine.connect() as conn:
+        all_items = pd.read_sql("SELECT ITEMNUM, Warehouse FROM IWI", conn)
+    picked = all_items.sample(n=min(n_selected, len(all_items)), random_state=int(rng.integers(1 << 31)))
+
+    def make_items():
+        return [Item(itemnum=r.ITEMNUM, warehouse=r.Warehouse) for r in picked.itertuples()]
+
+    loaders = ["load_demand_history", "load_inventory_info", "load_item_master_info"]
+    for mode in [None, "in", "temp_table"]:
+        preloader, t_init = _timed(ItemDataPreloader, config, make_items(), key_filter=mode)
+        line = [f"{str(mode):<10}", f"init {t_init:.3f}s"]
+        results = {}
+        for name in loaders:
+            results[name], t = _timed(getattr(preloader, name))
+            line.append(f"{name} {t:.3f}s")
+        print("⏱️ " + " | ".join(line))
+
+        if mode is None:
+            baseline = results
+        else:
+            item_keys = set(zip(picked["ITEMNUM"], picked["Warehouse"]))
+            for name in loaders:
+                _assert_same(baseline[name], results[name], name, item_keys)
+    print("✅ 下推结果与全表读取一致")
+
+
+def _assert_same(expected, actual, name, item_keys):
+    if isinstance(expected, pd.DataFrame):
+        # 原有 isin 过滤是 ITEMNUM × Warehouse 的笛卡尔积，只比较实际选中的 key
+        def _restrict(df):
+            return df[[k in item_keys for k in zip(df["ITEMNUM"], df["Warehouse"])]]
+        expected, actual = _restrict(expected), _restrict(actual)
+        sort_cols = list(expected.columns)
+        pd.testing.assert_frame_equal(
+            expected.sort_values(sort_cols).reset_index(drop=True),
+            actual[sort_cols].sort_values(sort_cols).reset_index(drop=True),
+            check_dtype=False,
+            obj=name,
+        )
+    else:
+        assert expected == actual, f"❌ {name} 结果不一致"
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_selected = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        config = build_synthetic_db(Path(tmp) / "bench.db", n_items=n_items)
+        run_benchmark(config, n_selected=n_selected)
+        config.engine.dispose()
@@ -0,0 +1,94 @@
+"""
+安全库存批量计算基准：SafetyStockCalculator / DynamicSafetyStockCalculator 的逐项 calculate_for_item
+vs calculate_batch，并校验两者结果完全一致。
+
+用法：python -m qms_core.testscripts.safety_stock_batch_benchmark [n_items]
+"""
+import sys
+import time
+
+import numpy as np
+
+from qms_core.infrastructure.config import MRPConfig
+from qms_core.core.common.params.enums import DemandType
+from qms_core.core.forecast.safety_stock import SafetyStockCalculator
+from qms_core.core.forecast.safety_stock.dynamic_calculator import DynamicSafetyStockCalculator
+from qms_core.pipelines.forecast.demand.demand_classification_job import DemandClassificationJob
+from qms_core.pipelines.forecast.demand.demand_forecast_job import ForecastGenerationJob
+from qms_core.testscripts.parallel_jobs_benchmark import make_demand_df, make_container
+
+
+def prepare_items(n_items: int):
+    container = make_container(make_demand_df(n_items), n_items)
+    items = container.items
+    config = MRPConfig()
+    DemandClassificationJob(config, data_container=container).process_items(items)
+    ForecastGenerationJob(config, data_container=container).process_items(items)
+
+    # 覆盖：各需求类型、部分手工服务水平 / 安全库存、部分智能交期缺失
+    forced = {11: DemandType.TRENDED, 13: DemandType.BURST, 17: DemandType.SEASONAL, 19: DemandType.SINGLE}
+    for i, item in enumerate(items):
+        for step, demand_type in forced.items():
+            if i % step == 0:
+                item.demand_type.demand_type = demand_type
+        if i % 7 == 0:
+            item.master.service_level = 0.95
+        if i % 5 == 0:
+            item.master.safety_stock = float(i % 40)
+        if i % 4:
+            item.smart_leadtime.load_from_dict({"Q60LeadTime": 10 + 9 * (i % 11)})
+    return container, items
+
+
+def run_reference(calculator, container, items) -> float:
+    params = calculator.params
+    t0 = time.perf_counter()
+    for item in items:
+        croston = None
+        if item.demand_type.demand_type == DemandType.INTERMITTENT:
+            croston = container.get_croston_result(
+                (item.itemnum, item.warehouse), alpha=params.intermittent_alpha, winsor_upper=params.winsor_upper
+            )
+        calculator.calculate_for_item(item, croston=croston)
+    return time.perf_counter() - t0
+
+
+def snapshot(items) -> list:
+    return [
+        (item.safetystock.recommended_service_level, item.safetystock.dynamic_safety_stock,
+         item.safetystock.final_safety_stock)
+        for item in items
+    ]
+
+
+def assert_same(ref: list, batch: list, label: str):
+    for (key, a), b in zip(ref, batch):
+        for x, y in zip(a, b):
+            if x is None or y is None:
+                assert x is None and y is None, f"❌ {label} {key}: {a} vs {b}"
+            else:
+                assert np.isclose(x, y, rtol=0, atol=1e-9, equal_nan=True), f"❌ {label} {key}: {a} vs {b}"
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    container, items = prepare_items(n_items)
+    types = {}
+    for item in items:
+        types[str(item.demand_type.demand_type)] = types.get(str(item.demand_type.demand_type), 0) + 1
+    print(f"🧪 {n_items} 项物料，需求类型分布: {types}")
+
+    for calculator in (SafetyStockCalculator(), DynamicSafetyStockCalculator()):
+        label = type(calculator).__name__
+        t_ref = run_reference(calculator, container, items)
+        ref = [((item.itemnum, item.warehouse), row) for item, row in zip(items, snapshot(items))]
+
+        for item in items:
+            item.safetystock.set_values({})
+        t0 = time.perf_counter()
+        fallback = calculator.calculate_batch(items, container)
+        t_batch = time.perf_counter() - t0
+        assert not fallback, f"❌ {label}: {len(fallback)} 项回落到逐项路径"
+
+        assert_same(ref, snapshot(items), label)
+        print(f"⏱️ {label}: 逐项 {t_ref:.2f}s | 批量 {t_batch:.2f}s | 加速 {t_ref / t_batch:.1f}x ✅ 结果一致")
@@ -0,0 +1,111 @@
+"""
+参数场景基准：ScenarioEngine 一次准备、批量评估 N 组 MRP / 服务水平参数，
+对比逐场景重跑 SafetyStockCalculator.calculate_batch + MRPCalculator.run_batch 的耗时，
+并校验基准场景与常规流程的订单 / 安全库存一致。
+
+用法：python -m qms_core.testscripts.scenario_benchmark [n_items] [n_workers]
+"""
+import sys
+import time
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.common.params.ParasCenter import ParasCenter
+from qms_core.core.forecast.MRP.MRP_calculator import MRPCalculator
+from qms_core.core.forecast.safety_stock import SafetyStockCalculator
+from qms_core.core.forecast.scenario import Scenario, ScenarioEngine
+from qms_core.testscripts.safety_stock_batch_benchmark import prepare_items
+
+
+def fill_container(container, items, seed: int = 0):
+    """
+    将分类 / 预测结果与测试覆盖写回容器各 dict（与 pipeline 导出一致）
+    """
+    rng = np.random.default_rng(seed)
+    for item in items:
+        key = (item.itemnum, item.warehouse)
+        container.forecast_dict[key] = {"ForecastSeries": item.forecast.forecast_series}
+        container.demand_type_dict[key] = {
+            "DemandType": item.demand_type.demand_type,
+            "ActivityLevel": item.demand_type.activity_level,
+            **item.demand_type.metrics,
+        }
+        container.master_dict[key].update({
+            "safety_stock": item.master.safety_stock,
+            "moq": int(rng.integers(1, 20)),
+            "lot_size": int(rng.integers(1, 6)),
+        })
+        container.inventory_dict[key] = {
+            "AvailableStock": float(rng.integers(0, 60)), "IntransitStock": float(rng.integers(0, 10))
+        }
+        if item.smart_leadtime._loaded:
+            container.smart_lead_time_dict[key] = {"Q60LeadTime": item.smart_leadtime.total_days}
+
+
+def make_scenarios(base_service_level) -> list[Scenario]:
+    scenarios = []
+    for min_moq, use_wlot, round_up, (sl_min, sl_max) in product(
+        [1, 10], [False, True], [False, True], [(0.85, 0.95), (0.9, 0.98), (0.8, 0.9)]
+    ):
+        if round_up and not use_wlot:
+            continue
+        scenarios.append(Scenario.from_overrides(
+            f"moq{min_moq}-wlot{int(use_wlot)}{int(round_up)}-sl{sl_min}-{sl_max}",
+            mrp={"min_moq": min_moq, "use_wlot": use_wlot, "round_up_to_wlots": round_up},
+            service_level={"min_servicelevel": sl_min, "max_servicelevel": sl_max},
+            base_service_level=base_service_level,
+        ))
+    return scenarios
+
+
+def run_naive(container, items, scenario: Scenario) -> pd.DataFrame:
+    """
+    逐场景重跑：安全库存批量计算 → 写回容器 → MRP run_batch
+    """
+    params = ParasCenter().safety_params.model_copy(update={"service_level": scenario.service_level_params})
+    calculator = SafetyStockCalculator(params)
+    for item in calculator.calculate_batch(items, container):
+        calculator.calculate_for_item(item)
+    safety_stock_dict = dict(container.safety_stock_dict)
+    for item in items:
+        safety_stock_dict[(item.itemnum, item.warehouse)] = item.safetystock.to_dict()
+    original, container.safety_stock_dict = container.safety_stock_dict, safety_stock_dict
+    try:
+        return MRPCalculator(data_container=container, params=scenario.mrp_params).run_batch()
+    finally:
+        container.safety_stock_dict = original
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    container, items = prepare_items(n_items)
+    fill_container(container, items)
+    engine = ScenarioEngine(container, n_workers=n_workers)
+    scenarios = make_scenarios(engine.safety_calculator.params.service_level)
+
+    t0 = time.perf_counter()
+    engine.prepare()
+    t_prepare = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    comparison = engine.run(scenarios)
+    t_run = time.perf_counter() - t0
+    print(f"⏱️ {n_items} 项 × {len(scenarios)} 个场景：prepare {t_prepare:.2f}s + 评估 {t_run:.2f}s"
+          f"（n_workers={n_workers}）")
+    print(comparison.to_string(index=False))
+
+    t0 = time.perf_counter()
+    naive = {scenario.name: run_naive(container, items, scenario) for scenario in scenarios[:3]}
+    t_naive = (time.perf_counter() - t0) / 3
+    print(f"⏱️ 逐场景重跑: {t_naive:.2f}s / 场景（估算 {len(scenarios)} 个场景 {t_naive * len(scenarios):.1f}s）")
+
+    columns = ["ITEMNUM", "Warehouse", "FinalSafetyStock", "RecommendedQty"]
+    for name, ref in naive.items():
+        got = engine.results[name]["orders"]
+        ref = ref[columns].sort_values(["ITEMNUM", "Warehouse"]).reset_index(drop=True)
+        got = got[columns].sort_values(["ITEMNUM", "Warehouse"]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(ref, got, check_dtype=False)
+    print(f"✅ {len(naive)} 个场景与逐场景重跑的订单 / 安全库存一致")
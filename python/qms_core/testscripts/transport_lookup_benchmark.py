@@ -0,0 +1,80 @@
+"""
+运输交期查找基准：n 条在手 PO 行上 ETATransformer.estimate_transport_days（逐行过滤交期表）
+与 TransportLeadTimeIndex 整批分级查找的耗时对比；逐行路径在抽样行上运行并估算全量，校验结果完全一致。
+PO 行覆盖：统计命中 / 统计值为空落到 VendorMaster / 两级均未命中落到运输方式默认值 /
+运输方式为空、NaN、'DEFAULT'、未知取值，以及交期表中的重复 key。
+
+用法：python -m qms_core.testscripts.transport_lookup_benchmark [n_lines] [n_sample]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.forecast.ETA.calculator import ETATransformer
+
+
+MODES = np.array(["Air", "Vessel", "Courier", "Truck", "Train", "International Train", "Default"], dtype=object)
+WAREHOUSES = np.array(["1", "2", "5"], dtype=object)
+
+
+def make_inputs(n_lines: int, n_vendors: int = 3000, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    vendors = np.array([f"V{i:05d}" for i in range(n_vendors)], dtype=object)
+
+    n_stat = n_vendors * 4
+    vendor_lt = pd.DataFrame({
+        "VendorCode": vendors[rng.integers(0, n_vendors, n_stat)],
+        "TransportMode": MODES[rng.integers(0, len(MODES), n_stat)],
+        "Warehouse": WAREHOUSES[rng.integers(0, 3, n_stat)],
+        "Q60TransportLeadTime": rng.gamma(2.0, 8.0, n_stat).round(1),
+    })
+    vendor_lt.loc[rng.random(n_stat) < 0.1, "Q60TransportLeadTime"] = np.nan
+
+    n_master = n_vendors * 2
+    vendor_master = pd.DataFrame({
+        "VendorCode": vendors[rng.integers(0, n_vendors, n_master)],
+        "TransportMode": MODES[rng.integers(0, len(MODES), n_master)],
+        "TransportLeadTimeDays": rng.integers(1, 60, n_master).astype(float),
+    })
+    vendor_master.loc[rng.random(n_master) < 0.1, "TransportLeadTimeDays"] = np.nan
+
+    modes = np.concatenate([MODES, np.array([None, np.nan, "", "DEFAULT", "Drone"], dtype=object)])
+    lines = pd.DataFrame({
+        "ITEMNUM": [f"I{i:06d}" for i in rng.integers(0, n_lines // 4 + 1, n_lines)],
+        "Warehouse": WAREHOUSES[rng.integers(0, 3, n_lines)],
+        "PONUM": [f"P{i:07d}" for i in range(n_lines)],
+        "POLINE": "1",
+        "VendorCode": np.r_[vendors, [f"X{i}" for i in range(100)]][rng.integers(0, n_vendors + 100, n_lines)],
+        "TransportMode": modes[rng.choice(len(modes), n_lines, p=np.r_[[0.13] * len(MODES), [0.09 / 5] * 5])],
+    })
+    lines.loc[rng.random(n_lines) < 0.001, "VendorCode"] = None
+    return lines, vendor_lt, vendor_master
+
+
+if __name__ == "__main__":
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_sample = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    lines, vendor_lt, vendor_master = make_inputs(n_lines)
+    transformer = ETATransformer(lead_metric="Q60")
+    print(f"🧪 {n_lines:,} 条 PO 行，VendorTransportStats {len(vendor_lt):,} 行，VendorMaster {len(vendor_master):,} 行")
+
+    t0 = time.perf_counter()
+    got = transformer.estimate_transport_days_batch(lines, vendor_lt, vendor_master)
+    t_new = time.perf_counter() - t0
+
+    sample = lines.iloc[:: max(1, n_lines // n_sample)]
+    t0 = time.perf_counter()
+    ref = np.array([
+        transformer.estimate_transport_days(row, vendor_lt, vendor_master, lead_metric="Q60")
+        for _, row in sample.iterrows()
+    ], dtype=np.int64)
+    t_ref = time.perf_counter() - t0
+
+    print(f"⏱️ 整批查找: {t_new:.3f}s | 逐行过滤（抽样 {len(sample):,} 行）: {t_ref:.2f}s，"
+          f"估算全量 {t_ref * n_lines / len(sample):.0f}s")
+    mismatch = np.flatnonzero(ref != got[:: max(1, n_lines // n_sample)][: len(sample)])
+    assert len(mismatch) == 0, f"❌ {len(mismatch)} 行不一致，如 {sample.iloc[mismatch[:3]].to_dict('records')}"
+    print(f"✅ 抽样 {len(sample):,} 行结果与 estimate_transport_days 完全一致")
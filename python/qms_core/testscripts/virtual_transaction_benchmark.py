@@ -0,0 +1,66 @@
+"""
+虚拟库存流水基准：VirtualTransactionTransformer（逐周循环）vs ColumnarVirtualTransactionTransformer（列式），
+n_items × n_weeks 的预测序列 + ETA 在途，校验两者输出完全一致。
+
+用法：python -m qms_core.testscripts.virtual_transaction_benchmark [n_items] [n_weeks]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.forecast.common.forecast_utils import get_next_n_yearweeks
+from qms_core.core.forecast.transaction.virtual_transaction_transformer import (
+    VirtualTransactionTransformer, ColumnarVirtualTransactionTransformer
+)
+
+
+def make_inputs(n_items: int, n_weeks: int, seed: int = 0) -> dict:
+    """
+    与 VirtualTransactionExtractor.fetch 相同的结构：eta（YearWeek 为 Int64）+ forecast（按 YearWeek 索引的 Series）
+    """
+    rng = np.random.default_rng(seed)
+    yearweeks = get_next_n_yearweeks(pd.Timestamp("2025-12-01"), n_weeks)
+    warehouses = np.array(["1", "2", "5"], dtype=object)
+
+    forecast = {}
+    values = rng.gamma(1.2, 3.0, (n_items, n_weeks)).round(2)
+    values[rng.random(n_items) < 0.1] = 0.0
+    values[rng.random((n_items, n_weeks)) < 0.001] = np.nan
+    for i in range(n_items):
+        length = n_weeks if i % 9 else int(rng.integers(0, n_weeks))
+        forecast[(f"I{i:06d}", warehouses[i % 3])] = pd.Series(values[i, :length], index=yearweeks[:length], dtype=float)
+
+    n_eta = n_items // 2
+    rows = rng.integers(0, n_items, n_eta)
+    eta_yearweek = pd.array(np.array(yearweeks)[rng.integers(0, n_weeks, n_eta)], dtype="Int64")
+    eta_yearweek[rng.random(n_eta) < 0.01] = pd.NA
+    eta = pd.DataFrame({
+        "PONUM": [f"P{j}" for j in range(n_eta)],
+        "ITEMNUM": [f"I{r:06d}" for r in rows],
+        "Warehouse": warehouses[rows % 3],
+        "InTransitQty": rng.integers(1, 80, n_eta).astype(float),
+        "YearWeek": eta_yearweek,
+    })
+    return {"eta": eta, "forecast": forecast}
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_weeks = int(sys.argv[2]) if len(sys.argv) > 2 else 26
+
+    data = make_inputs(n_items, n_weeks)
+    print(f"🧪 {n_items:,} 项物料 × {n_weeks} 周预测，ETA {len(data['eta']):,} 行")
+
+    t0 = time.perf_counter()
+    ref = VirtualTransactionTransformer().transform({"eta": data["eta"].copy(), "forecast": data["forecast"]})
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    got = ColumnarVirtualTransactionTransformer().transform({"eta": data["eta"].copy(), "forecast": data["forecast"]})
+    t_new = time.perf_counter() - t0
+
+    print(f"⏱️ 逐周循环: {t_ref:.2f}s | 列式: {t_new:.2f}s | 加速 {t_ref / t_new:.1f}x，输出 {len(got):,} 行")
+    pd.testing.assert_frame_equal(ref, got, check_exact=True)
+    print("✅ 输出完全一致（行、顺序、字段类型）")
@@ -0,0 +1,52 @@
+"""
+周维表基准：n 个随机日期（含缺失、53 周年份、周末跨年）上 .apply(to_yearweek) / to_yearweek_int 逐行转换
+与周维表数组查找的耗时对比，并校验结果完全一致。
+
+用法：python -m qms_core.testscripts.week_calendar_benchmark [n_dates]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from qms_core.core.common.week_calendar import (
+    dates_to_yearweek, dates_to_yearweek_str, yearweek_add, yearweek_range, get_week_calendar
+)
+from qms_core.core.forecast.common.forecast_utils import to_yearweek, to_yearweek_int
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    rng = np.random.default_rng(0)
+    dates = pd.Series(pd.Timestamp("2015-01-01")
+                      + pd.to_timedelta(rng.integers(0, 365 * 15, n), unit="D")
+                      + pd.to_timedelta(rng.integers(0, 86400, n), unit="s"))
+    dates[rng.random(n) < 0.01] = pd.NaT
+
+    t0 = time.perf_counter()
+    ref_str = dates.apply(to_yearweek).to_numpy(dtype=object)
+    ref_int = np.array([to_yearweek_int(d) if pd.notna(d) else np.nan for d in dates], dtype=np.float64)
+    t_ref = time.perf_counter() - t0
+
+    get_week_calendar()
+    t0 = time.perf_counter()
+    got_str = dates_to_yearweek_str(dates)
+    got_int = dates_to_yearweek(dates)
+    t_new = time.perf_counter() - t0
+
+    print(f"⏱️ {n:,} 个日期 逐行: {t_ref:.2f}s | 周维表: {t_new:.3f}s | 加速 {t_ref / t_new:.0f}x")
+    # 缺失值：.apply 在 pandas 3 字符串列中为 NaN，周维表为 None，只比较缺失位置
+    assert (pd.isna(ref_str) == pd.isna(got_str)).all(), "❌ 缺失位置不一致"
+    assert (ref_str[~pd.isna(ref_str)] == got_str[~pd.isna(got_str)]).all(), "❌ 'YYYY-XXW' 结果不一致"
+    assert np.array_equal(ref_int, got_int, equal_nan=True), "❌ 整数 YearWeek 不一致"
+
+    # 周加减 / 区间与逐周推算对比
+    shift = rng.integers(-120, 120, n)
+    expected = dates + pd.to_timedelta(shift * 7, unit="D")
+    expected = np.array([to_yearweek_int(d) if pd.notna(d) else np.nan for d in expected], dtype=np.float64)
+    assert np.array_equal(yearweek_add(got_int, shift), expected, equal_nan=True), "❌ yearweek_add 不一致"
+    span = yearweek_range(202050, 10).tolist()
+    assert span == [202050, 202051, 202052, 202053, 202101, 202102, 202103, 202104, 202105, 202106], span
+    print("✅ 转换 / 周加减 / 区间结果完全一致")